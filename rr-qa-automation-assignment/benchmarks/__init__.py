@@ -0,0 +1,3 @@
+"""
+Page-object microbenchmarks against a local fixture page
+"""
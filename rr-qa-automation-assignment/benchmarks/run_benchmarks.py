@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Page-object microbenchmarks
+
+Serves a static copy of the Discover grid and pagination markup
+(benchmarks/fixtures/discover.html) from a local server, loads it into
+headless Chrome and times page-object operations over many iterations.
+Medians are compared with the stored baseline; a slowdown above
+Config.BENCHMARK_THRESHOLD fails the run.
+
+Benchmarks run on a page object without an element cache, so lookups are
+timed against the DOM; the warm-up would otherwise fill the cache and every
+later lookup would be a dictionary hit. find_element_cached times that hit
+on a page object with the cache, next to find_element_uncached.
+
+    python -m benchmarks.run_benchmarks                     # compare with the baseline
+    python -m benchmarks.run_benchmarks --update-baseline   # record a new baseline
+    python -m benchmarks.run_benchmarks --only locate_cards_xpath locate_cards_css
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from selenium.webdriver.common.by import By
+from config.config import Config
+from pages.discover_page import DiscoverPage
+from utils.driver_factory import create_driver
+from utils.locator_registry import LocatorRegistry
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # Keep request logging out of the results table
+
+def _reload(driver, page):
+    driver.refresh()
+    page.wait_for("page_ready", quiet_ms=0)
+
+def _candidate(name, strategy):
+    # Benchmark a specific candidate, whatever the registry currently resolves to
+    return next(c for c in LocatorRegistry.candidates(name) if c[0] == strategy)
+
+def _paginate(page):
+    # No settle window, so the measurement is the page object's cost rather than WAIT_QUIET_MS
+    page.click_next_page(quiet_ms=0)
+    page.click_previous_page(quiet_ms=0)
+
+# name -> (operation(driver, page), iterations or None for the default, whether the page caches elements)
+BENCHMARKS = {
+    "find_element_uncached": (lambda driver, page: page.find_element(page.MOVIE_TITLES), None, False),
+    "find_element_cached": (lambda driver, page: page.find_element(page.MOVIE_TITLES), None, True),
+    "find_elements": (lambda driver, page: page.find_elements(page.MOVIE_TITLES), None, False),
+    "locate_cards_xpath": (lambda driver, page: driver.find_elements(*_candidate("DiscoverPage.MOVIE_CARDS", By.XPATH)), None, False),
+    "locate_cards_css": (lambda driver, page: driver.find_elements(*_candidate("DiscoverPage.MOVIE_CARDS", By.CSS_SELECTOR)), None, False),
+    "get_text": (lambda driver, page: page.get_text(page.MOVIE_TITLES), None, False),
+    "is_displayed": (lambda driver, page: page.is_displayed(page.PAGINATION_CONTAINER), None, False),
+    "get_cards": (lambda driver, page: page.get_cards(), None, False),
+    "get_movie_titles": (lambda driver, page: page.get_movie_titles(), None, False),
+    "get_movie_years": (lambda driver, page: page.get_movie_years(), None, False),
+    "get_current_page_number": (lambda driver, page: page.get_current_page_number(), None, False),
+    "get_available_pages": (lambda driver, page: page.get_available_pages(), None, False),
+    "snapshot": (lambda driver, page: page.waits.snapshot(), None, False),
+    "paginate_next_previous": (lambda driver, page: _paginate(page), 10, False),
+    "reload_page_ready": (_reload, 10, False)
+}
+
+def serve_fixtures():
+    """Start a background server for the fixture directory; returns (server, url)"""
+    handler = functools.partial(_QuietHandler, directory=FIXTURE_DIR)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    host, port = httpd.server_address
+    return httpd, f"http://{host}:{port}/discover.html"
+
+def measure(operation, driver, page, iterations):
+    """Run ``operation`` after a short warm-up; returns timing stats in milliseconds"""
+    for _ in range(Config.BENCHMARK_WARMUP):
+        operation(driver, page)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation(driver, page)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "median_ms": statistics.median(samples),
+        "p90_ms": samples[min(len(samples) - 1, int(len(samples) * 0.9))],
+        "min_ms": samples[0],
+        "mean_ms": statistics.mean(samples)
+    }
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results, baseline):
+    """Return {name: (baseline median, change ratio, regressed)} for benchmarks in both"""
+    comparison = {}
+    for name, stats in results.items():
+        previous = (baseline or {}).get("benchmarks", {}).get(name)
+        if previous is None:
+            continue
+        delta = stats["median_ms"] - previous["median_ms"]
+        ratio = delta / previous["median_ms"] if previous["median_ms"] else 0.0
+        # Ignore sub-millisecond noise on very fast operations
+        regressed = ratio > Config.BENCHMARK_THRESHOLD and delta > Config.BENCHMARK_MIN_DELTA_MS
+        comparison[name] = (previous["median_ms"], ratio, regressed)
+    return comparison
+
+def run_benchmarks(names=None, iterations=None):
+    """Run the selected benchmarks in one headless browser; returns (results, environment)"""
+    Config.HEADLESS = True
+    httpd, url = serve_fixtures()
+    driver = create_driver()
+    results = {}
+
+    try:
+        driver.get(url)
+        pages = {}
+        for cached in (False, True):
+            Config.ELEMENT_CACHE = cached
+            pages[cached] = DiscoverPage(driver)
+        pages[False].wait_for("page_ready")
+
+        for name in names or BENCHMARKS:
+            operation, default_iterations, cached = BENCHMARKS[name]
+            page = pages[cached]
+            results[name] = measure(operation, driver, page, iterations or default_iterations or Config.BENCHMARK_ITERATIONS)
+            print(f"⏱️  {name}: {results[name]['median_ms']:.2f} ms median")
+
+        environment = {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "browser": driver.capabilities.get("browserName"),
+            "browser_version": driver.capabilities.get("browserVersion")
+        }
+    finally:
+        driver.quit()
+        httpd.shutdown()
+        httpd.server_close()
+
+    return results, environment
+
+def print_table(results, comparison):
+    print("\n" + "=" * 78)
+    print(f"{'Benchmark':<26}{'Median':>10}{'p90':>10}{'Baseline':>12}{'Change':>10}")
+    print("-" * 78)
+    for name, stats in results.items():
+        line = f"{name:<26}{stats['median_ms']:>8.2f}ms{stats['p90_ms']:>8.2f}ms"
+        if name in comparison:
+            previous, ratio, regressed = comparison[name]
+            line += f"{previous:>10.2f}ms{ratio * 100:>+9.1f}%"
+            if regressed:
+                line += "  ❌ REGRESSION"
+        print(line)
+    print("=" * 78)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark page-object operations against a local fixture page")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--iterations", type=int, default=None, help="Override the iterations per benchmark")
+    parser.add_argument("--update-baseline", action="store_true", help="Save these results as the new baseline")
+    parser.add_argument("--baseline", default=Config.BENCHMARK_BASELINE, help="Baseline file to compare with")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results, environment = run_benchmarks(args.only, args.iterations)
+
+    baseline = load_baseline(args.baseline)
+    comparison = compare(results, baseline) if not args.update_baseline else {}
+    print_table(results, comparison)
+
+    os.makedirs(Config.REPORT_DIR, exist_ok=True)
+    report_file = os.path.join(Config.REPORT_DIR, f"benchmarks_{Config.get_timestamp()}.json")
+    with open(report_file, "w") as f:
+        json.dump({"environment": environment, "benchmarks": results}, f, indent=4)
+    print(f"📊 Results: {report_file}")
+
+    if args.update_baseline:
+        merged = dict((baseline or {}).get("benchmarks", {}), **results)
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment, "benchmarks": merged}, f, indent=4, sort_keys=True)
+        print(f"✅ Baseline updated: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+    if baseline.get("environment", {}).get("browser_version") != environment["browser_version"]:
+        print("⚠️ Baseline was recorded with a different browser version; results may not be comparable")
+
+    regressions = [name for name, (_, _, regressed) in comparison.items() if regressed]
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) slower than the baseline by more than "
+              f"{Config.BENCHMARK_THRESHOLD * 100:.0f}%: {', '.join(regressions)}")
+        return 1
+    print("✅ No regressions against the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,8 +14,131 @@ class Config:
     HEADLESS = False  # Set to True if you don't want to see browser
     IMPLICIT_WAIT = 10
     EXPLICIT_WAIT = 15
+    # "explicit": no implicit wait, so expected-absent lookups fail fast; "legacy": IMPLICIT_WAIT on every lookup
+    WAIT_POLICY = os.environ.get("WAIT_POLICY", "explicit")
+    PROBE_TIMEOUT = 0.5  # Default budget of BasePage.probe/probe_all/assert_absent, in seconds
+    POLL_INTERVAL = 0.1  # Explicit wait polling interval, in seconds
+    WAIT_QUIET_MS = 250  # DOM must stay unchanged this long before a wait resolves
+    ELEMENT_CACHE = True  # Reuse located element handles within a page object until they go stale
     SCREENSHOT_DIR = "screenshots"
+    SCREENSHOT_FORMAT = "png"  # png, jpeg or webp
+    SCREENSHOT_QUALITY = 80  # jpeg/webp only
+    SCREENSHOT_MAX_FILES = 200  # per process; its oldest screenshots are pruned beyond this
+    SCREENSHOT_WORKERS = 2
     REPORT_DIR = "reports"
+    STREAM_RESULTS = True  # Append each result to reports/results_<timestamp>.jsonl as it happens
+    SLOW_TEST_COUNT = 10  # Rows in the slowest-tests table of the console report
+    
+    # WebDriver command profiler (opt-in): counts and times every round trip to chromedriver
+    PROFILE_COMMANDS = os.environ.get("PROFILE_COMMANDS") == "1"
+    PROFILE_TOP_SITES = 10  # Chattiest call sites shown in the terminal summary
+    
+    # Logging: LOG_FORMAT "text" or "json" (JSON lines); LOG_LEVELS overrides the level per subsystem
+    LOG_DIR = "logs"
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+    LOG_LEVELS = {
+        "pages": "INFO",
+        "waits": "INFO",
+        "driver": "INFO",
+        "screenshots": "INFO",
+        "replay": "INFO"
+    }
+    
+    # Site under test: "live" hits BASE_URL, "replay" serves recorded fixtures locally
+    SITE_MODE = os.environ.get("SITE_MODE", "live")
+    FIXTURE_DIR = "fixtures/site"
+    REPLAY_LATENCY_PROFILES = {"none": 0, "lan": 0.005, "broadband": 0.04, "slow": 0.25}  # seconds per request
+    REPLAY_LATENCY_PROFILE = os.environ.get("REPLAY_LATENCY", "none")
+    
+    # Network profiles applied per test via @pytest.mark.network_profile("<name>")
+    NETWORK_PROFILES = {
+        "full": {"blocked_urls": []},
+        "functional": {
+            "blocked_urls": [
+                "*image.tmdb.org*", "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp",
+                "*.woff", "*.woff2", "*.ttf", "*.otf",
+                "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*"
+            ]
+        },
+        "realistic": {
+            "blocked_urls": [],
+            "throttle": {"latency_ms": 150, "download_kbps": 1600, "upload_kbps": 750}  # Regular 3G
+        }
+    }
+    DEFAULT_NETWORK_PROFILE = os.environ.get("NETWORK_PROFILE", "functional")
+    
+    # Resolved chromedriver/Chrome versions and downloaded drivers, shared by all runs on this machine
+    DRIVER_CACHE_DIR = os.environ.get("DRIVER_CACHE_DIR", os.path.expanduser("~/.cache/qa-automation"))
+    
+    # Browser pool: recycle a warm browser after this many tests (1 = fresh browser per test)
+    POOL_MAX_USES = 25
+    # "process": one Chrome per pooled driver; "contexts": isolated browser contexts in one Chrome shared by all xdist workers
+    DRIVER_BACKEND = os.environ.get("DRIVER_BACKEND", "process")
+    CONTEXT_WAIT_SLICE = 0.25  # seconds a context may hold the shared session per wait step
+    
+    # Parallel runs: duration history for xdist scheduling and memory budget per worker
+    DURATION_HISTORY_FILE = ".test_durations.json"
+    DEFAULT_TEST_DURATION = 5.0  # seconds, used before a test has any history
+    CHROME_MEMORY_MB = 600
+    
+    # Pagination crawl (pytest --crawl or python -m utils.pagination_crawler): one browser per worker
+    CRAWL_WORKERS = 4
+    CRAWL_TIME_BUDGET = 900  # seconds for the whole crawl
+    CRAWL_MAX_PAGES = int(os.environ.get("CRAWL_MAX_PAGES", "0")) or None  # None = every page
+    
+    # Filter validation: result pages read per filter combination, z-score that flags a page
+    VALIDATION_PAGES = 5
+    VALIDATION_ANOMALY_Z = 2.0
+    
+    # Deep result scans (DiscoverPage.iter_results): records read per search term
+    SEARCH_SCAN_LIMIT = 100
+    
+    # Filter matrix: values combined pairwise, and the relative UI cost of changing each filter
+    FILTER_MATRIX_TYPES = ["Movie", "TV Shows"]
+    FILTER_MATRIX_GENRES = ["Action", "Comedy", "Drama", "Horror"]
+    FILTER_TRANSITION_COSTS = {"type": 2, "genre": 1, "years": 2, "rating": 1}
+    
+    # Locator calibration (python -m utils.locator_registry calibrate, or CALIBRATE_LOCATORS=1 during a run)
+    LOCATOR_CACHE_FILE = ".locator_cache.json"
+    CALIBRATE_LOCATORS = os.environ.get("CALIBRATE_LOCATORS") == "1"
+    LOCATOR_CALIBRATION_ITERATIONS = 5
+    LOCATOR_TIE_MARGIN = 0.10  # Candidates within 10% of the fastest count as equally fast
+    
+    # Tests using the setup fixture share one loaded page per worker (see utils.shared_page)
+    SHARE_LOADED_PAGE = os.environ.get("SHARE_LOADED_PAGE", "1") == "1"
+    
+    # Test impact map (run_tests.py --changed-since <git-ref>); RECORD_IMPACT_MAP=1 refreshes it
+    IMPACT_MAP_FILE = ".impact_map.json"
+    RECORD_IMPACT_MAP = os.environ.get("RECORD_IMPACT_MAP") == "1"
+    
+    # Page-object microbenchmarks (python -m benchmarks.run_benchmarks)
+    BENCHMARK_BASELINE = "benchmarks/baseline.json"
+    BENCHMARK_ITERATIONS = 50
+    BENCHMARK_WARMUP = 3
+    BENCHMARK_THRESHOLD = 0.20  # Fail when a median is more than 20% slower than the baseline
+    BENCHMARK_MIN_DELTA_MS = 1.0  # ...and at least this much slower in absolute terms
+    
+    # Visual baselines (see utils.visual_baseline); UPDATE_VISUAL_BASELINES=1 rewrites them
+    VISUAL_BASELINE_DIR = "visual_baselines"
+    UPDATE_VISUAL_BASELINES = os.environ.get("UPDATE_VISUAL_BASELINES") == "1"
+    VISUAL_MASK_CONTENT = True  # Hide text and images so only layout is compared
+    VISUAL_REFERENCE_WIDTH = 320  # Stored references are grayscale at this width
+    VISUAL_HASH_DISTANCE = 0  # Hash bits that may differ before pixels are diffed
+    VISUAL_PIXEL_TOLERANCE = 24  # Gray levels a pixel may drift before it counts as changed
+    VISUAL_REGION_THRESHOLD = 0.02  # A region fails when more than 2% of its pixels changed
+    VISUAL_REGION_SHIFT = 0.01  # ...or its box moved by more than 1% of the page
+    VISUAL_REGIONS = {
+        "grid": "div.flex-col.items-center",
+        "pagination": "#react-paginate",
+        "search": "input[name='search']",
+        "filters": "div[class*='css-yk16xz-control'], .rc-rate-star"
+    }
+    
+    @staticmethod
+    def implicit_wait():
+        """Implicit wait to apply to drivers under the active WAIT_POLICY"""
+        return Config.IMPLICIT_WAIT if Config.WAIT_POLICY == "legacy" else 0
     
     @staticmethod
     def get_timestamp():
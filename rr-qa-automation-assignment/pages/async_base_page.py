@@ -0,0 +1,221 @@
+"""
+Asyncio page objects over the Chrome DevTools Protocol
+
+AsyncBasePage mirrors BasePage for one tab attached through a CDP session.
+It runs the same in-page scripts as the synchronous page objects (the
+WaitEngine wait script, the batched card extraction), so both APIs behave
+alike; the difference is that independent awaits can be combined with
+``asyncio.gather`` and several tabs can be driven at once.
+"""
+import asyncio
+import base64
+import json
+import time
+from selenium.common.exceptions import TimeoutException
+from config.config import Config
+from utils.cdp_client import CDPConnection, CDPError, CDPSession
+from utils.logger import Logger
+from utils.site_fixtures import API_REWRITE_JS
+from utils.wait_engine import NETWORK_TRACKER_JS, SNAPSHOT_JS, WAIT_JS, WaitEngine
+
+_UNSET = object()
+
+# Finds the first node for a Selenium (By, value) locator
+FIND_JS = """
+const find = function (by, value) {
+    if (by === 'xpath') {
+        return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (by === 'id') { return document.getElementById(value); }
+    if (by === 'class name') { return document.getElementsByClassName(value)[0] || null; }
+    if (by === 'name') { return document.getElementsByName(value)[0] || null; }
+    return document.querySelector(value);
+};
+"""
+
+ELEMENT_CENTER_JS = FIND_JS + """
+const el = find(arguments[0], arguments[1]);
+if (!el) { return null; }
+el.scrollIntoView({ block: 'center', inline: 'center' });
+const rect = el.getBoundingClientRect();
+return { x: rect.x + rect.width / 2, y: rect.y + rect.height / 2 };
+"""
+
+FOCUS_AND_CLEAR_JS = FIND_JS + """
+const el = find(arguments[0], arguments[1]);
+if (!el) { return false; }
+el.focus();
+const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+if (setter && setter.set) {
+    setter.set.call(el, '');
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+}
+return true;
+"""
+
+ELEMENT_TEXT_JS = FIND_JS + """
+const el = find(arguments[0], arguments[1]);
+return el ? el.innerText : null;
+"""
+
+ELEMENT_DISPLAYED_JS = FIND_JS + """
+const el = find(arguments[0], arguments[1]);
+if (!el) { return false; }
+const rect = el.getBoundingClientRect();
+const style = window.getComputedStyle(el);
+return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+"""
+
+class AsyncBasePage:
+    def __init__(self, session):
+        self.session = session
+        self.timeout = Config.EXPLICIT_WAIT
+        self.logger = Logger.get_logger("pages")
+
+    async def evaluate(self, script, *args):
+        """Run a WebDriver-style script body (``arguments``, ``return``) and return its value"""
+        expression = f"(function () {{ {script} }}).apply(null, {json.dumps(list(args))})"
+        return await self._evaluate(expression)
+
+    async def evaluate_async(self, script, *args, timeout=None):
+        """Like execute_async_script: the script calls the last argument with its result"""
+        expression = (
+            "new Promise(function (resolve) { (function () { %s }).apply(null, %s.concat([resolve])); })"
+            % (script, json.dumps(list(args)))
+        )
+        return await self._evaluate(expression, timeout)
+
+    async def _evaluate(self, expression, timeout=None):
+        result = await self.session.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True
+        }, timeout=timeout)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text"))
+        return result["result"].get("value")
+
+    async def navigate(self, url):
+        """Load ``url`` and return once its load event fired"""
+        loaded = asyncio.ensure_future(self.session.wait_for_event("Page.loadEventFired", timeout=self.timeout))
+        await self.session.send("Page.navigate", {"url": url})
+        await loaded
+        self.logger.info(f"Navigated to {url}")
+
+    async def url(self):
+        return await self.evaluate("return location.href;")
+
+    async def wait_for(self, condition, timeout=None, quiet_ms=None, before=_UNSET):
+        """Same conditions and semantics as WaitEngine.until; returns seconds waited"""
+        if condition not in WaitEngine.CONDITIONS:
+            raise ValueError(f"Unknown wait condition: {condition}")
+        timeout = timeout or self.timeout
+        quiet_ms = Config.WAIT_QUIET_MS if quiet_ms is None else quiet_ms
+        if condition in ("grid_rerendered", "page_changed") and before is _UNSET:
+            before = (await self.snapshot())[condition]
+        if before is _UNSET:
+            before = None
+
+        start = time.perf_counter()
+        result = await self.evaluate_async(
+            WAIT_JS, condition, WaitEngine.SELECTORS, before, quiet_ms, int(timeout * 1000), [],
+            timeout=timeout + 5
+        )
+        elapsed = time.perf_counter() - start
+        met = bool(result and result.get("met"))
+        WaitEngine.record(condition, elapsed, met)
+        if not met:
+            error = (result or {}).get("error") or f"Condition '{condition}' not met within {timeout}s"
+            self.logger.warning(error)
+            raise TimeoutException(error)
+        return elapsed
+
+    async def snapshot(self):
+        """State the change-based conditions compare against"""
+        return await self.evaluate(SNAPSHOT_JS, WaitEngine.SELECTORS)
+
+    async def _element_center(self, locator, timeout=None):
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            center = await self.evaluate(ELEMENT_CENTER_JS, *locator)
+            if center is not None:
+                return center
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"Element not found: {locator}")
+            await asyncio.sleep(Config.POLL_INTERVAL)
+
+    async def click(self, locator, timeout=None):
+        """Trusted mouse click at the element's center"""
+        center = await self._element_center(locator, timeout)
+        for event in ("mouseMoved", "mousePressed", "mouseReleased"):
+            await self.session.send("Input.dispatchMouseEvent", {
+                "type": event, "x": center["x"], "y": center["y"], "button": "left", "clickCount": 1
+            })
+        self.logger.info(f"Clicked on element: {locator}")
+
+    async def send_keys(self, locator, text, timeout=None):
+        await self._element_center(locator, timeout)
+        await self.evaluate(FOCUS_AND_CLEAR_JS, *locator)
+        await self.session.send("Input.insertText", {"text": text})
+        self.logger.info(f"Entered text '{text}' in element: {locator}")
+
+    async def get_text(self, locator):
+        return await self.evaluate(ELEMENT_TEXT_JS, *locator)
+
+    async def is_displayed(self, locator):
+        return bool(await self.evaluate(ELEMENT_DISPLAYED_JS, *locator))
+
+    async def screenshot(self):
+        """PNG bytes of the viewport"""
+        result = await self.session.send("Page.captureScreenshot", {"format": "png"})
+        return base64.b64decode(result["data"])
+
+class AsyncBrowser:
+    """DevTools connection to a driver's browser, handing out async page objects per tab"""
+
+    def __init__(self, connection, driver):
+        self.connection = connection
+        self.driver = driver
+        self.pages = []
+        self._opened_targets = []
+
+    @classmethod
+    async def from_driver(cls, driver):
+        return cls(await CDPConnection.from_driver(driver), driver)
+
+    async def attach(self, page_class, target_id):
+        page = page_class(await CDPSession.attach(self.connection, target_id))
+        self.pages.append(page)
+        return page
+
+    async def current_page(self, page_class):
+        """Async page object for the tab the driver is on"""
+        # chromedriver window handles are DevTools target ids
+        target_id = self.driver.current_window_handle.replace("CDwindow-", "")
+        return await self.attach(page_class, target_id)
+
+    async def new_page(self, page_class):
+        """Open a tab (in the driver's browser context, if it has one) prepared like prepare_tab"""
+        params = {"url": "about:blank"}
+        context = getattr(self.driver, "context", None)
+        if context is not None:
+            params["browserContextId"] = context.context_id
+        target_id = (await self.connection.send("Target.createTarget", params))["targetId"]
+        self._opened_targets.append(target_id)
+
+        page = await self.attach(page_class, target_id)
+        scripts = [NETWORK_TRACKER_JS] + ([API_REWRITE_JS] if Config.SITE_MODE == "replay" else [])
+        await asyncio.gather(*(
+            page.session.send("Page.addScriptToEvaluateOnNewDocument", {"source": source}) for source in scripts
+        ))
+        return page
+
+    async def close(self):
+        """Detach from every tab, close the tabs opened here and drop the connection"""
+        await asyncio.gather(*(page.session.detach() for page in self.pages), return_exceptions=True)
+        await asyncio.gather(*(
+            self.connection.send("Target.closeTarget", {"targetId": target_id}) for target_id in self._opened_targets
+        ), return_exceptions=True)
+        self.pages, self._opened_targets = [], []
+        await self.connection.close()
@@ -0,0 +1,93 @@
+import asyncio
+from selenium.common.exceptions import TimeoutException
+from config.config import Config
+from pages.async_base_page import AsyncBasePage
+from pages.discover_page import CARDS_JS, DiscoverPage
+
+# Enabled state of a pagination button (li.next / li.previous)
+PAGINATION_BUTTON_JS = """
+const item = document.querySelector('#react-paginate li.' + arguments[0]);
+if (!item) { return null; }
+const link = item.querySelector('a');
+return !(item.className.indexOf('disabled') !== -1 || (link && link.getAttribute('aria-disabled') === 'true'));
+"""
+
+PAGE_NUMBERS_JS = """
+return Array.from(document.querySelectorAll(arguments[0]))
+    .map(function (el) { return el.innerText.trim(); })
+    .filter(function (text) { return /^\\d+$/.test(text); })
+    .map(Number);
+"""
+
+class AsyncDiscoverPage(AsyncBasePage):
+    """Asyncio counterpart of DiscoverPage; locators and card parsing are shared with it"""
+
+    async def open(self, url=None):
+        await self.navigate(url or Config.BASE_URL)
+        try:
+            await self.wait_for("page_ready")
+        except TimeoutException:
+            self.logger.warning("Movie grid did not render after initial load")
+
+    async def get_cards(self):
+        """Snapshot every movie card in a single evaluation"""
+        records = await self.evaluate(
+            CARDS_JS,
+            list(DiscoverPage.MOVIE_CARDS),
+            DiscoverPage.MOVIE_TITLES[1],
+            DiscoverPage.MOVIE_YEARS[1],
+            DiscoverPage.MOVIE_POSTERS[1]
+        ) or []
+        return DiscoverPage.parse_cards(records)
+
+    async def get_movie_titles(self):
+        return [card["title"] for card in await self.get_cards() if card["title"]]
+
+    async def get_current_page_number(self):
+        text = await self.get_text(DiscoverPage.SELECTED_PAGE)
+        return int(text) if text and text.strip().isdigit() else 1
+
+    async def get_available_pages(self):
+        return await self.evaluate(PAGE_NUMBERS_JS, DiscoverPage.PAGINATION_PAGES[1]) or []
+
+    async def state(self):
+        """Cards, selected page and URL, queried concurrently"""
+        cards, page, url = await asyncio.gather(self.get_cards(), self.get_current_page_number(), self.url())
+        return {"cards": cards, "page": page, "url": url}
+
+    async def search_movie(self, query):
+        await self.send_keys(DiscoverPage.SEARCH_INPUT, query)
+        self.logger.info(f"Searched for: {query}")
+
+    async def click_next_page(self, wait=True):
+        return await self._click_pagination("next", DiscoverPage.PAGINATION_NEXT, wait)
+
+    async def click_previous_page(self, wait=True):
+        return await self._click_pagination("previous", DiscoverPage.PAGINATION_PREV, wait)
+
+    async def go_to_page(self, page_number, wait=True):
+        """Click a visible page link; False if that page has no link right now"""
+        link = DiscoverPage.page_link(page_number)
+        if not await self.is_displayed(link):
+            return False
+        await self._click_and_wait(link, wait)
+        self.logger.info(f"Clicked page {page_number}")
+        return True
+
+    async def _click_pagination(self, item_class, locator, wait):
+        if not await self.evaluate(PAGINATION_BUTTON_JS, item_class):
+            self.logger.info(f"{item_class.capitalize()} button is disabled")
+            return False
+        await self._click_and_wait(locator, wait)
+        self.logger.info(f"Clicked {item_class.capitalize()} page")
+        return True
+
+    async def _click_and_wait(self, locator, wait):
+        before = await self.snapshot() if wait else None
+        await self.click(locator)
+        if wait:
+            try:
+                await self.wait_for("page_changed", before=before["page_changed"])
+                await self.wait_for("grid_rerendered", before=before["grid_rerendered"])
+            except TimeoutException:
+                self.logger.warning("Page did not change after pagination click")
@@ -1,53 +1,143 @@
+from contextlib import contextmanager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from config.config import Config
 from utils.logger import Logger
+from utils.wait_engine import WaitEngine
+from utils.element_cache import ElementCache
+from utils.screenshot_service import ScreenshotService
+from utils.browser_contexts import BrowserContext
+from utils.visual_baseline import VisualBaseline
 
 class BasePage:
     def __init__(self, driver):
+        # A page can be bound to one isolated context of a shared browser instead of a whole driver
+        if isinstance(driver, BrowserContext):
+            driver = driver.driver
+        self.context = getattr(driver, "context", None)
         self.driver = driver
-        self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
-        self.logger = Logger.get_logger()
+        self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT, poll_frequency=Config.POLL_INTERVAL)
+        self.elements = ElementCache() if Config.ELEMENT_CACHE else None
+        self.waits = WaitEngine(driver, Config.EXPLICIT_WAIT, element_cache=self.elements)
+        self.logger = Logger.get_logger("pages")
     
-    def find_element(self, locator):
+    def find_element(self, locator, timeout=None):
+        if self.elements is not None:
+            element = self.elements.get(locator)
+            if element is not None:
+                return element
+        
         try:
-            return self.wait.until(EC.presence_of_element_located(locator))
+            element = self._wait(timeout).until(EC.presence_of_element_located(locator))
         except TimeoutException:
-            self.logger.error(f"Element not found: {locator}")
+            if timeout is None:
+                self.logger.error(f"Element not found: {locator}")
             raise
+        
+        if self.elements is not None:
+            self.elements.put(locator, element)
+        return element
     
-    def find_elements(self, locator):
+    def interact(self, locator, action, timeout=None):
+        """Run ``action(element)``, locating again once if a cached handle went stale"""
         try:
-            return self.wait.until(EC.presence_of_all_elements_located(locator))
+            return action(self.find_element(locator, timeout))
+        except StaleElementReferenceException:
+            if self.elements is None:
+                raise
+            self.elements.invalidate(locator)
+            return action(self.find_element(locator, timeout))
+    
+    def find_elements(self, locator, timeout=None):
+        try:
+            return self._wait(timeout).until(EC.presence_of_all_elements_located(locator))
         except TimeoutException:
-            self.logger.error(f"Elements not found: {locator}")
+            if timeout is None:
+                self.logger.error(f"Elements not found: {locator}")
             return []
     
+    def probe(self, locator, timeout=None):
+        """Element if it shows up within a short budget, else None; for optional elements"""
+        try:
+            with self._no_implicit_wait():
+                return self.find_element(locator, Config.PROBE_TIMEOUT if timeout is None else timeout)
+        except TimeoutException:
+            return None
+    
+    def probe_all(self, locator, timeout=None):
+        """Elements present within a short budget, possibly []"""
+        with self._no_implicit_wait():
+            return self.find_elements(locator, Config.PROBE_TIMEOUT if timeout is None else timeout)
+    
+    def assert_absent(self, locator, timeout=None):
+        """Pass as soon as nothing matches ``locator``; fail if it is still there after the budget"""
+        timeout = Config.PROBE_TIMEOUT if timeout is None else timeout
+        try:
+            with self._no_implicit_wait():
+                self._wait(timeout).until(lambda driver: not driver.find_elements(*locator))
+        except TimeoutException:
+            raise AssertionError(f"Element still present after {timeout}s: {locator}")
+    
+    def _wait(self, timeout):
+        if timeout is None:
+            return self.wait
+        return WebDriverWait(self.driver, timeout, poll_frequency=Config.POLL_INTERVAL)
+    
+    @contextmanager
+    def _no_implicit_wait(self):
+        # Under the legacy policy every lookup would otherwise block for IMPLICIT_WAIT
+        implicit_wait = Config.implicit_wait()
+        if implicit_wait:
+            self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            if implicit_wait:
+                self.driver.implicitly_wait(implicit_wait)
+    
+    def wait_for(self, condition, **kwargs):
+        """Wait for a named readiness condition (see WaitEngine.CONDITIONS)"""
+        return self.waits.until(condition, **kwargs)
+    
     def click(self, locator):
-        element = self.find_element(locator)
-        element.click()
+        self.interact(locator, lambda element: element.click())
         self.logger.info(f"Clicked on element: {locator}")
     
     def send_keys(self, locator, text):
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+        
+        self.interact(locator, type_text)
         self.logger.info(f"Entered text '{text}' in element: {locator}")
     
     def get_text(self, locator):
-        element = self.find_element(locator)
-        return element.text
+        return self.interact(locator, lambda element: element.text)
     
-    def is_displayed(self, locator):
+    def is_displayed(self, locator, timeout=None):
+        """Whether the element is visible; waits only PROBE_TIMEOUT for it unless ``timeout`` is given
+        
+        Under the legacy wait policy this waited up to IMPLICIT_WAIT. Pass a
+        timeout when the element may still be rendering.
+        """
         try:
-            return self.find_element(locator).is_displayed()
+            with self._no_implicit_wait():
+                return self.interact(
+                    locator,
+                    lambda element: element.is_displayed(),
+                    Config.PROBE_TIMEOUT if timeout is None else timeout
+                )
         except:
             return False
     
-    def take_screenshot(self, name):
-        timestamp = Config.get_timestamp()
-        filename = f"{Config.SCREENSHOT_DIR}/{name}_{timestamp}.png"
-        self.driver.save_screenshot(filename)
-        self.logger.info(f"Screenshot saved: {filename}")
-        return filename
\ No newline at end of file
+    def take_screenshot(self, name, full_page=False):
+        filename = ScreenshotService.get().capture(self.driver, name, full_page=full_page)
+        self.logger.info(f"Screenshot queued: {filename}")
+        return filename
+    
+    def check_visual(self, name, regions=None):
+        """Compare the page's layout with the stored baseline of view ``name``"""
+        result = VisualBaseline().check(self.driver, name, regions)
+        self.logger.info(f"Visual check {name}: {result['status']}")
+        return result
\ No newline at end of file
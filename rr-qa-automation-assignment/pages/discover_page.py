@@ -1,16 +1,74 @@
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
+from utils.locator_registry import Locator
 import re
 
+# Serializes every card into a plain record; only the innermost matches are
+# kept, and layout wrappers that contain another match are dropped, so each
+# movie appears once
+CARDS_JS = """
+const cardLocator = arguments[0], titleSel = arguments[1], detailsSel = arguments[2], posterSel = arguments[3];
+let nodes = [];
+if (cardLocator[0] === 'xpath') {
+    const result = document.evaluate(cardLocator[1], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+} else {
+    nodes = Array.from(document.querySelectorAll(cardLocator[1]));
+}
+const cards = nodes.filter(function (node) {
+    return !nodes.some(function (other) { return other !== node && node.contains(other); });
+});
+const isVisible = function (el) {
+    if (!el) { return false; }
+    const rect = el.getBoundingClientRect();
+    const style = window.getComputedStyle(el);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+};
+const text = function (el) { return el ? el.innerText.trim() : ''; };
+return cards.map(function (card) {
+    const poster = card.querySelector(posterSel);
+    const rect = card.getBoundingClientRect();
+    return {
+        title: text(card.querySelector(titleSel)),
+        details: text(card.querySelector(detailsSel)),
+        poster: poster ? poster.getAttribute('src') : null,
+        poster_visible: isVisible(poster),
+        visible: isVisible(card),
+        rect: { x: rect.x, y: rect.y + window.scrollY, width: rect.width, height: rect.height }
+    };
+});
+"""
+
 class DiscoverPage(BasePage):
-    # Navigation locators
-    NAV_POPULAR = (By.XPATH, "//a[contains(@href, '/popular') or contains(text(), 'Popular')]")
-    NAV_TREND = (By.XPATH, "//a[contains(@href, '/trend') or contains(text(), 'Trend')]")
-    NAV_NEW = (By.XPATH, "//a[contains(@href, '/new') or contains(text(), 'New')]")
-    NAV_TOP_RATED = (By.XPATH, "//a[contains(@href, '/top') or contains(text(), 'Top')]")
+    # Navigation locators (candidates are calibrated by utils.locator_registry)
+    NAV_POPULAR = Locator(
+        (By.XPATH, "//a[contains(@href, '/popular') or contains(text(), 'Popular')]"),
+        (By.CSS_SELECTOR, "a[href*='/popular']"),
+        (By.CSS_SELECTOR, "a[href$='/popular']")
+    )
+    NAV_TREND = Locator(
+        (By.XPATH, "//a[contains(@href, '/trend') or contains(text(), 'Trend')]"),
+        (By.CSS_SELECTOR, "a[href*='/trend']"),
+        (By.CSS_SELECTOR, "a[href$='/trend']")
+    )
+    NAV_NEW = Locator(
+        (By.XPATH, "//a[contains(@href, '/new') or contains(text(), 'New')]"),
+        (By.CSS_SELECTOR, "a[href*='/new']"),
+        (By.CSS_SELECTOR, "a[href$='/new']")
+    )
+    NAV_TOP_RATED = Locator(
+        (By.XPATH, "//a[contains(@href, '/top') or contains(text(), 'Top')]"),
+        (By.CSS_SELECTOR, "a[href*='/top']"),
+        (By.CSS_SELECTOR, "a[href$='/top']")
+    )
     
     # Movie cards locators
-    MOVIE_CARDS = (By.XPATH, "//div[contains(@class, 'flex-col') and contains(@class, 'items-center')]")
+    MOVIE_CARDS = Locator(
+        (By.XPATH, "//div[contains(@class, 'flex-col') and contains(@class, 'items-center')]"),
+        (By.CSS_SELECTOR, "div.flex-col.items-center"),
+        multiple=True
+    )
     MOVIE_TITLES = (By.CSS_SELECTOR, "p.text-blue-500.font-bold.py-1")
     MOVIE_YEARS = (By.CSS_SELECTOR, "p.text-gray-500.font-light.text-sm")
     MOVIE_POSTERS = (By.CSS_SELECTOR, "img.w-60.h-96.object-contain")
@@ -21,9 +79,11 @@ class DiscoverPage(BasePage):
     
     # Pagination locators
     PAGINATION_CONTAINER = (By.ID, "react-paginate")
+    SELECTED_PAGE = (By.CSS_SELECTOR, "li.selected a")
     PAGINATION_NEXT = (By.CSS_SELECTOR, "li.next a")
     PAGINATION_PREV = (By.CSS_SELECTOR, "li.previous a")
     PAGINATION_PAGES = (By.CSS_SELECTOR, "#react-paginate li:not(.previous):not(.next) a")
+    PAGINATION_PAGE_LINKS = (By.CSS_SELECTOR, "#react-paginate a[aria-label*='Page']")
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -63,95 +123,192 @@ class DiscoverPage(BasePage):
         except Exception as e:
             self.logger.warning(f"Could not search: {e}")
     
-    def get_movie_titles(self):
-        try:
-            titles = [title.text for title in self.find_elements(self.MOVIE_TITLES)]
-            self.logger.info(f"Found {len(titles)} movie titles")
-            return titles
-        except:
-            return []
-    
-    def get_movie_years(self):
-        years = []
+    def get_cards(self):
+        """Snapshot every movie card in a single round trip"""
         try:
-            year_elements = self.find_elements(self.MOVIE_YEARS)
-            for element in year_elements:
-                text = element.text
-                # Extract year from text like "Horror, 2024" or "2024"
-                year_match = re.search(r'\b(19|20)\d{2}\b', text)
-                if year_match:
-                    years.append(int(year_match.group()))
-                elif text.strip().isdigit() and len(text.strip()) == 4:
-                    # If the text is just a 4-digit year
-                    year = int(text.strip())
-                    if 1900 <= year <= 2100:
-                        years.append(year)
+            records = self.driver.execute_script(
+                CARDS_JS,
+                list(self.MOVIE_CARDS),
+                self.MOVIE_TITLES[1],
+                self.MOVIE_YEARS[1],
+                self.MOVIE_POSTERS[1]
+            ) or []
         except Exception as e:
-            self.logger.warning(f"Could not extract years: {e}")
+            self.logger.warning(f"Could not extract movie cards: {e}")
+            return []
         
-        return years
+        records = self.parse_cards(records)
+        self.logger.info(f"Extracted {len(records)} movie cards")
+        return records
     
-    def get_movie_count(self):
-        try:
-            count = len(self.find_elements(self.MOVIE_CARDS))
-            return count
-        except:
-            return 0
+    @classmethod
+    def parse_cards(cls, records):
+        """Add genre and year to raw CARDS_JS records (shared with AsyncDiscoverPage)"""
+        for record in records:
+            details = record["details"]
+            record["genre"] = details.split(",")[0].strip() if "," in details else ""
+            record["year"] = cls._parse_year(details)
+        return records
+    
+    def get_movie_titles(self, cards=None):
+        cards = self.get_cards() if cards is None else cards
+        return [card["title"] for card in cards if card["title"]]
     
-    def click_next_page(self):
+    def get_movie_years(self, cards=None):
+        cards = self.get_cards() if cards is None else cards
+        return [card["year"] for card in cards if card["year"] is not None]
+    
+    def get_movie_count(self, cards=None):
+        cards = self.get_cards() if cards is None else cards
+        return len(cards)
+    
+    @staticmethod
+    def _parse_year(text):
+        # Extract year from text like "Horror, 2024" or "2024"
+        year_match = re.search(r'\b(19|20)\d{2}\b', text or "")
+        if year_match:
+            return int(year_match.group())
+        return None
+    
+    def click_next_page(self, wait=True, quiet_ms=None):
+        """Click Next; with ``wait`` return only once the new page has rendered"""
         try:
-            next_btn = self.find_element(self.PAGINATION_NEXT)
-            # Check if button is disabled
-            is_disabled = (
-                "disabled" in next_btn.get_attribute("class") or 
-                next_btn.get_attribute("aria-disabled") == "true" or
-                "disabled" in self.driver.find_element(By.XPATH, "//li[contains(@class, 'next')]").get_attribute("class")
-            )
-            
-            if not is_disabled:
-                next_btn.click()
-                self.logger.info("Clicked Next page")
-                return True
-            else:
+            before = self.interact(self.PAGINATION_NEXT, lambda next_btn: self._click_if_enabled(next_btn, "next", wait))
+            if before is None:
                 self.logger.info("Next button is disabled")
                 return False
+            
+            self.logger.info("Clicked Next page")
+            if wait:
+                self._wait_for_page_change(before, quiet_ms)
+            return True
         except Exception as e:
             self.logger.warning(f"Could not click next page: {e}")
             return False
     
-    def click_previous_page(self):
+    def click_previous_page(self, wait=True, quiet_ms=None):
+        """Click Previous; with ``wait`` return only once the new page has rendered"""
         try:
-            prev_btn = self.find_element(self.PAGINATION_PREV)
-            # Check if button is disabled
-            is_disabled = (
-                "disabled" in prev_btn.get_attribute("class") or 
-                prev_btn.get_attribute("aria-disabled") == "true" or
-                "disabled" in self.driver.find_element(By.XPATH, "//li[contains(@class, 'previous')]").get_attribute("class")
-            )
-            
-            if not is_disabled:
-                prev_btn.click()
-                self.logger.info("Clicked Previous page")
-                return True
-            else:
+            before = self.interact(self.PAGINATION_PREV, lambda prev_btn: self._click_if_enabled(prev_btn, "previous", wait))
+            if before is None:
                 self.logger.info("Previous button is disabled")
                 return False
+            
+            self.logger.info("Clicked Previous page")
+            if wait:
+                self._wait_for_page_change(before, quiet_ms)
+            return True
         except Exception as e:
             self.logger.warning(f"Could not click previous page: {e}")
             return False
     
-    def get_current_page_number(self):
+    def _click_if_enabled(self, button, item_class, wait):
+        """Click a pagination button unless disabled; returns the pre-click snapshot, or None if disabled"""
+        # Check if button is disabled
+        is_disabled = (
+            "disabled" in button.get_attribute("class") or 
+            button.get_attribute("aria-disabled") == "true" or
+            "disabled" in self.find_element((By.XPATH, f"//li[contains(@class, '{item_class}')]")).get_attribute("class")
+        )
+        if is_disabled:
+            return None
+        
+        before = self.waits.snapshot() if wait else {}
+        button.click()
+        return before
+    
+    def _wait_for_page_change(self, before, quiet_ms=None):
+        """Wait for the page switch a click started; False if it never happened"""
+        try:
+            self.waits.until("page_changed", quiet_ms=quiet_ms, before=before["page_changed"])
+            self.waits.until("grid_rerendered", quiet_ms=quiet_ms, before=before["grid_rerendered"])
+            return True
+        except TimeoutException:
+            self.logger.warning("Page did not change after pagination click")
+            return False
+    
+    def iter_results(self, query=None, filters=None, limit=None, prefetch=True):
+        """Yield card records across result pages, lazily, stopping after ``limit`` records
+        
+        Only one page of cards is held at a time. With ``prefetch`` Next is
+        clicked before the current page's cards are handed out, so the next
+        page loads while the caller works on them; a caller that stops early
+        leaves the browser on the following page. Each record gets a "page".
+        """
+        if query is not None:
+            self.search_movie(query)
+            self.wait_for("settled", quiet_ms=500)  # Allow for input debounce
+        if filters:
+            from pages.filter_panel import FilterPanel
+            FilterPanel(self.driver).apply_filters(filters)
+            self.wait_for("settled")
+        
+        produced = 0
+        page_number = self.get_current_page_number()
+        while True:
+            cards = self.get_cards()
+            if not cards:
+                return
+            
+            more_needed = limit is None or produced + len(cards) < limit
+            pending = self._request_next_page() if prefetch and more_needed else None
+            
+            for card in cards:
+                card["page"] = page_number
+                yield card
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+            
+            if not prefetch:
+                pending = self._request_next_page()
+            if pending is None or not self._wait_for_page_change(pending):
+                return
+            page_number = self.get_current_page_number()
+    
+    def _request_next_page(self):
+        """Click Next without waiting; the pre-click snapshot, or None if there is no next page"""
+        try:
+            return self.interact(self.PAGINATION_NEXT, lambda next_btn: self._click_if_enabled(next_btn, "next", True))
+        except Exception as e:
+            self.logger.info(f"No next page: {e}")
+            return None
+    
+    def get_current_page_number(self, timeout=None):
+        """Selected page number; 1 when there is no pagination (e.g. a single page of results)"""
+        selected_page = self.probe(self.SELECTED_PAGE, timeout)
+        if selected_page is None:
+            return 1
         try:
-            selected_page = self.driver.find_element(By.CSS_SELECTOR, "li.selected a")
             return int(selected_page.text)
-        except:
+        except ValueError:
+            self.logger.warning(f"Unexpected selected page label: {selected_page.text!r}")
             return 1
     
+    @staticmethod
+    def page_link(page_number):
+        """Locator for the pagination link of one page"""
+        return (By.CSS_SELECTOR, f"#react-paginate a[aria-label='Page {page_number}']")
+    
+    def go_to_page(self, page_number, wait=True):
+        """Click a visible page link; False if that page has no link right now"""
+        link = self.probe(self.page_link(page_number))
+        if link is None:
+            return False
+        
+        before = self.waits.snapshot() if wait else None
+        link.click()
+        self.logger.info(f"Clicked page {page_number}")
+        if wait:
+            self._wait_for_page_change(before)
+        return True
+    
     def get_available_pages(self):
         """Get list of available page numbers"""
         pages = []
         try:
-            page_elements = self.find_elements(self.PAGINATION_PAGES)
+            # Pagination is optional (single page of results), so do not wait long for it
+            page_elements = self.probe_all(self.PAGINATION_PAGES)
             for element in page_elements:
                 text = element.text.strip()
                 if text.isdigit():
@@ -1,5 +1,8 @@
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from config.config import Config
 from pages.base_page import BasePage
+from utils.locator_registry import Locator
 
 class FilterPanel(BasePage):
     # Type filter
@@ -7,11 +10,20 @@ class FilterPanel(BasePage):
     TYPE_OPTIONS = (By.CSS_SELECTOR, "div[class*='css-1uccc91-singleValue']")
     
     # Genre filter
-    GENRE_DROPDOWN = (By.XPATH, "//p[contains(text(), 'Genre')]/following-sibling::div")
+    GENRE_DROPDOWN = Locator(
+        (By.XPATH, "//p[contains(text(), 'Genre')]/following-sibling::div"),
+        (By.XPATH, "//p[normalize-space()='Genre']/following-sibling::div[1]")
+    )
     
-    # Year filter
-    YEAR_FROM_CONTAINER = (By.XPATH, "//div[contains(text(), '1900') or contains(@class, 'css-1uccc91-singleValue')][1]")
-    YEAR_TO_CONTAINER = (By.XPATH, "//div[contains(text(), '2024') or contains(@class, 'css-1uccc91-singleValue')][2]")
+    # Year filter: the two selects under the "Year" label (other filters use the same react-select classes)
+    YEAR_FROM_CONTAINER = Locator(
+        (By.XPATH, "(//p[normalize-space()='Year']/following-sibling::div//div[contains(@class, 'singleValue')])[1]"),
+        (By.XPATH, "(//p[contains(text(), 'Year')]/following-sibling::div//div[contains(@class, 'singleValue')])[1]")
+    )
+    YEAR_TO_CONTAINER = Locator(
+        (By.XPATH, "(//p[normalize-space()='Year']/following-sibling::div//div[contains(@class, 'singleValue')])[2]"),
+        (By.XPATH, "(//p[contains(text(), 'Year')]/following-sibling::div//div[contains(@class, 'singleValue')])[2]")
+    )
     
     # Rating filter
     RATING_STARS = (By.CLASS_NAME, "rc-rate-star")
@@ -21,28 +33,55 @@ class FilterPanel(BasePage):
     
     def select_type(self, type_name="Movie"):
         try:
-            self.click(self.TYPE_DROPDOWN)
-            self.logger.info(f"Clicked type dropdown")
-            # Note: The actual selection would require handling the dropdown
-            # For now, we just log that we tried
+            selected = self._choose_option(self.TYPE_DROPDOWN, type_name)
+            self.logger.info(f"Selected type: {type_name}" if selected else f"Type option not found: {type_name}")
+            return selected
         except Exception as e:
             self.logger.warning(f"Could not select type: {e}")
+            return False
     
     def select_genre(self, genre_name):
         try:
-            self.click(self.GENRE_DROPDOWN)
-            self.logger.info(f"Clicked genre dropdown")
-            # Note: The actual selection would require handling the dropdown
+            selected = self._choose_option(self.GENRE_DROPDOWN, genre_name)
+            self.logger.info(f"Selected genre: {genre_name}" if selected else f"Genre option not found: {genre_name}")
+            return selected
         except Exception as e:
             self.logger.warning(f"Could not select genre: {e}")
+            return False
     
     def set_year_range(self, year_from, year_to):
         try:
             self.logger.info(f"Setting year range: {year_from} - {year_to}")
-            # Note: The actual year setting would require handling dropdowns
-            # For demo purposes, we just log it
+            selected = (
+                self._choose_option(self.YEAR_FROM_CONTAINER, str(year_from)) and
+                self._choose_option(self.YEAR_TO_CONTAINER, str(year_to))
+            )
+            if not selected:
+                self.logger.info(f"Year range {year_from} - {year_to} not offered by the dropdowns")
+            return selected
         except Exception as e:
             self.logger.warning(f"Could not set year range: {e}")
+            return False
+    
+    def get_year_range(self):
+        """(from, to) as shown by the year selects"""
+        return self.get_text(self.YEAR_FROM_CONTAINER).strip(), self.get_text(self.YEAR_TO_CONTAINER).strip()
+    
+    def _choose_option(self, dropdown, option_text):
+        """Open a react-select dropdown and click the option with this text"""
+        self.click(dropdown)
+        option = self.probe(self.menu_option(option_text), timeout=Config.PROBE_TIMEOUT * 4)
+        if option is None:
+            # Close the menu so the next dropdown starts from a clean state
+            self.driver.switch_to.active_element.send_keys(Keys.ESCAPE)
+            return False
+        option.click()
+        return True
+    
+    @staticmethod
+    def menu_option(option_text):
+        """Locator for an option of the currently open react-select menu"""
+        return (By.XPATH, f"//div[contains(@class, '-option') and normalize-space()='{option_text}']")
     
     def set_rating(self, stars):
         try:
@@ -50,5 +89,24 @@ class FilterPanel(BasePage):
             if 1 <= stars <= len(rating_stars):
                 rating_stars[stars-1].click()
                 self.logger.info(f"Set rating to {stars} stars")
+                return True
+            return False
         except Exception as e:
-            self.logger.warning(f"Could not set rating: {e}")
\ No newline at end of file
+            self.logger.warning(f"Could not set rating: {e}")
+            return False
+    
+    def apply_filters(self, filters):
+        """Apply {"type", "genre", "years": (from, to), "rating"} filters; returns {name: applied}"""
+        applied = {}
+        for name, value in filters.items():
+            if name == "type":
+                applied[name] = self.select_type(value)
+            elif name == "genre":
+                applied[name] = self.select_genre(value)
+            elif name == "years":
+                applied[name] = self.set_year_range(*value)
+            elif name == "rating":
+                applied[name] = self.set_rating(value)
+            else:
+                raise ValueError(f"Unknown filter: {name}")
+        return applied
\ No newline at end of file
@@ -2,14 +2,56 @@
 """
 Test Runner Script
 """
+import argparse
 import subprocess
 import sys
 import os
 from datetime import datetime
+from config.config import Config
+
+def available_memory_mb():
+    """Memory the OS can hand out right now, in MB"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def auto_workers():
+    """One worker per CPU, capped by how many Chrome instances fit in memory"""
+    workers = os.cpu_count() or 1
+    memory = available_memory_mb()
+    if memory:
+        # The shared loaded page keeps a browser open next to the one the driver fixture checks out
+        browsers = 2 if Config.SHARE_LOADED_PAGE and Config.DRIVER_BACKEND == "process" else 1
+        workers = min(workers, memory // (Config.CHROME_MEMORY_MB * browsers))
+    return max(1, workers)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the QA automation suite")
+    parser.add_argument("suite", nargs="?", choices=["smoke", "regression", "negative"],
+                        help="Run only tests with this marker")
+    parser.add_argument("--workers", default=None,
+                        help="Number of parallel xdist workers, or 'auto' to size by CPU and memory")
+    parser.add_argument("--crawl", action="store_true",
+                        help="Also crawl every page of results (slow, see Config.CRAWL_TIME_BUDGET)")
+    parser.add_argument("--profile-commands", action="store_true",
+                        help="Count and time every WebDriver command per test and call site")
+    parser.add_argument("--changed-since", metavar="GIT_REF",
+                        help="Run only the tests affected by changes since this git ref (see .impact_map.json)")
+    return parser.parse_args()
 
 def run_tests():
     """Execute test suite with different configurations"""
     
+    args = parse_args()
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_file = f"reports/test_report_{timestamp}.html"
     
@@ -33,16 +75,28 @@ def run_tests():
     ]
     
     # Add markers if specified
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "smoke":
-            cmd.extend(["-m", "smoke"])
-            print("Running SMOKE tests only")
-        elif sys.argv[1] == "regression":
-            cmd.extend(["-m", "regression"])
-            print("Running REGRESSION tests only")
-        elif sys.argv[1] == "negative":
-            cmd.extend(["-m", "negative"])
-            print("Running NEGATIVE tests only")
+    if args.suite:
+        cmd.extend(["-m", args.suite])
+        print(f"Running {args.suite.upper()} tests only")
+    
+    # Parallel run, balanced by recorded test durations
+    if args.workers:
+        workers = auto_workers() if args.workers == "auto" else int(args.workers)
+        cmd.extend(["-n", str(workers), "--dist", "loadgroup"])
+        print(f"Running on {workers} workers")
+    
+    if args.crawl:
+        cmd.append("--crawl")
+        print("Including the full pagination crawl")
+    
+    if args.changed_since:
+        cmd.extend(["--changed-since", args.changed_since])
+        print(f"Running tests affected by changes since {args.changed_since}")
+    
+    # Inherited by pytest and its xdist workers
+    if args.profile_commands:
+        os.environ["PROFILE_COMMANDS"] = "1"
+        print("Profiling WebDriver commands")
     
     print(f"Command: {' '.join(cmd)}")
     print("-" * 60)
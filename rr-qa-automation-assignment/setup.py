@@ -43,6 +43,9 @@ requests==2.31.0""")
     print("  python3 run_tests.py              # Run all tests")
     print("  python3 run_tests.py smoke        # Run smoke tests only")
     print("  python3 run_tests.py regression   # Run regression tests only")
+    print("  python3 run_tests.py --workers auto  # Run in parallel, sized to CPU and memory")
+    print("  python3 run_tests.py --profile-commands  # Count WebDriver round trips per call site")
+    print("  python3 run_tests.py --changed-since main  # Run only tests affected by page-object changes")
     print("\nThe tests will document known issues found in the website.")
     print("=" * 60)
 
@@ -1,157 +1,148 @@
 import pytest
+import pytest_asyncio
 import os
-import stat
-import tempfile
-import requests
-import zipfile
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 from config.config import Config
 from utils.logger import Logger
+from utils.driver_factory import create_driver
+from utils.driver_pool import DriverPool
+from utils.browser_contexts import BrowserContextPool, launch_shared_browser
+from utils.site_fixtures import SiteReplayServer
+from utils.network_profiles import apply_network_profile
+from utils.duration_scheduler import DurationScheduler
+from utils.phase_timing import PhaseTimingPlugin
+from utils.command_profiler import CommandProfilerPlugin
+from utils.impact_map import ImpactMapPlugin
+from utils.screenshot_service import ScreenshotService
+from utils.wait_engine import WaitEngine
+from utils.locator_registry import LocatorRegistry
+from utils.element_cache import ElementCache
+from utils.shared_page import SharedPage, SharedPages
+from utils.report_utils import TestReport
 
-def get_chromedriver_path():
-    """Get ChromeDriver path, downloading if necessary"""
-    
-    # First check if we have a working chromedriver in PATH
-    try:
-        os.system("chromedriver --version 2>/dev/null")
-        return "chromedriver"  # Use system chromedriver
-    except:
-        pass
-    
-    # Check in common locations
-    common_paths = [
-        "/usr/local/bin/chromedriver",
-        "/opt/homebrew/bin/chromedriver",
-        os.path.expanduser("~/chromedriver"),
-        os.path.expanduser("~/.wdm/drivers/chromedriver/mac64/142.0.7444.175/chromedriver-mac-arm64/chromedriver")
-    ]
-    
-    for path in common_paths:
-        if os.path.exists(path) and os.access(path, os.X_OK):
-            return path
-    
-    # If not found, download it
-    print("📥 ChromeDriver not found. Downloading...")
-    
-    # Create temp directory
-    temp_dir = tempfile.mkdtemp()
-    
-    # Download ChromeDriver for Mac ARM
-    chrome_version = "142.0.7444.175"
-    url = f"https://storage.googleapis.com/chrome-for-testing-public/{chrome_version}/mac-arm64/chromedriver-mac-arm64.zip"
-    
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # Save and extract
-        zip_path = os.path.join(temp_dir, "chromedriver.zip")
-        with open(zip_path, "wb") as f:
-            f.write(response.content)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-        
-        # Get chromedriver path
-        chromedriver_path = os.path.join(temp_dir, "chromedriver-mac-arm64", "chromedriver")
-        
-        # Make executable
-        os.chmod(chromedriver_path, stat.S_IEXEC)
-        
-        print(f"✅ ChromeDriver downloaded to: {chromedriver_path}")
-        return chromedriver_path
-        
-    except Exception as e:
-        print(f"❌ Failed to download ChromeDriver: {e}")
-        
-        # Fallback to Safari if on Mac
-        if Config.IS_MAC_ARM:
-            print("🔄 Trying Safari as fallback...")
-            return "safari"
-        raise
+driver_pool_key = pytest.StashKey()
+shared_browser_key = pytest.StashKey()
+results_report_key = pytest.StashKey()
+test_outcome_key = pytest.StashKey()
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--crawl",
+        action="store_true",
+        default=False,
+        help="Run the full pagination crawl (tests marked crawl)"
+    )
+    parser.addoption(
+        "--changed-since",
+        default=None,
+        metavar="GIT_REF",
+        help="Run only the tests affected by changes since this git ref, per the impact map"
+    )
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "network_profile(name): network profile from Config.NETWORK_PROFILES for this test"
+    )
+    config.addinivalue_line("markers", "crawl: long-running crawl of every results page, needs --crawl")
+    config.addinivalue_line("markers", "readonly: test only reads the shared loaded page; changing it fails the test")
+    config.pluginmanager.register(DurationScheduler(config), "duration_scheduler")
+    config.pluginmanager.register(PhaseTimingPlugin(config), "phase_timing")
+    if Config.PROFILE_COMMANDS:
+        config.pluginmanager.register(CommandProfilerPlugin(config), "command_profiler")
+    # Registered after the duration scheduler so deselection happens before tests are grouped
+    if Config.RECORD_IMPACT_MAP or config.getoption("--changed-since"):
+        config.pluginmanager.register(ImpactMapPlugin(config), "impact_map")
+    
+    if Config.STREAM_RESULTS:
+        # Set before xdist spawns workers so they all append to the same stream
+        stream_path = os.environ.setdefault(
+            "QA_RESULTS_STREAM",
+            os.path.join(Config.REPORT_DIR, f"results_{Config.get_timestamp()}.jsonl")
+        )
+        config.stash[results_report_key] = TestReport(stream_path=stream_path)
+    
+    if Config.DRIVER_BACKEND == "contexts" and config.getoption("numprocesses", None) and not hasattr(config, "workerinput"):
+        # One Chrome for every worker; launched before xdist spawns them so they inherit its address
+        config.stash[shared_browser_key] = launch_shared_browser()
+
+def pytest_unconfigure(config):
+    """Close the browser the workers' context pools attached to"""
+    browser = config.stash.get(shared_browser_key, None)
+    if browser is not None:
+        browser.quit()
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--crawl"):
+        return
+    skip_crawl = pytest.mark.skip(reason="Pagination crawl runs only with --crawl")
+    for item in items:
+        if "crawl" in item.keywords:
+            item.add_marker(skip_crawl)
+
+@pytest.fixture(scope="session")
+def site_server():
+    """Serve recorded site fixtures locally when SITE_MODE=replay"""
+    if Config.SITE_MODE != "replay":
+        yield None
+        return
+    
+    live_url = Config.BASE_URL
+    server = SiteReplayServer().start()
+    Config.BASE_URL = server.url
+    
+    yield server
+    
+    Config.BASE_URL = live_url
+    server.stop()
+
+@pytest.fixture(scope="session")
+def driver_pool(request, site_server):
+    """Session-scoped pool of warm browsers, or of contexts in one browser, for this worker"""
+    pool = BrowserContextPool() if Config.DRIVER_BACKEND == "contexts" else DriverPool(create_driver)
+    request.config.stash[driver_pool_key] = pool
+    
+    yield pool
+    
+    Logger.get_logger().info(f"Driver pool stats: {pool.stats()}")
+    pool.close_all()
 
 @pytest.fixture(scope="function")
-def driver():
-    """Fixture to create and tear down the WebDriver"""
-    logger = Logger.get_logger()
-    driver_instance = None
+def driver(request, driver_pool):
+    """Fixture to check out a clean browser from the pool"""
+    driver_instance = driver_pool.acquire()
     
-    try:
-        # Get ChromeDriver path
-        chromedriver_path = get_chromedriver_path()
-        
-        if chromedriver_path == "safari":
-            # Use Safari on Mac
-            driver_instance = webdriver.Safari()
-            logger.info("Using Safari browser")
-            
-        else:
-            # Use Chrome with custom options
-            options = Options()
-            
-            if Config.HEADLESS:
-                options.add_argument("--headless=new")  # New headless mode
-            
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            
-            # Add these to avoid detection
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # Create service
-            service = Service(executable_path=chromedriver_path)
-            
-            # Create driver
-            driver_instance = webdriver.Chrome(service=service, options=options)
-            
-            # Stealth mode
-            driver_instance.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36'
-            })
-            driver_instance.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            logger.info(f"ChromeDriver initialized from: {chromedriver_path}")
-        
-        # Set timeouts
-        driver_instance.implicitly_wait(Config.IMPLICIT_WAIT)
-        
-        if Config.HEADLESS:
-            driver_instance.set_window_size(1920, 1080)
-        else:
-            driver_instance.maximize_window()
-        
-        yield driver_instance
-        
-    except Exception as e:
-        logger.error(f"Failed to initialize driver: {e}")
-        
-        # Last resort: try with system Chrome if available
-        try:
-            print("🔄 Trying system Chrome as last resort...")
-            driver_instance = webdriver.Chrome()  # Let Selenium find it
-            yield driver_instance
-        except:
-            raise
-    
-    finally:
-        if driver_instance:
-            driver_instance.quit()
-            logger.info("Browser closed")
+    marker = request.node.get_closest_marker("network_profile")
+    apply_network_profile(driver_instance, marker.args[0] if marker else None)
+    
+    yield driver_instance
+    
+    driver_pool.release(driver_instance)
+
+@pytest.fixture(scope="session")
+def shared_pages(driver_pool):
+    """Loaded start pages kept open across tests, one per network profile"""
+    pages = SharedPages(driver_pool)
+    
+    yield pages
+    
+    pages.close()
 
 @pytest.fixture(scope="function")
-def setup(driver):
+def setup(request):
     """Main setup fixture that provides driver and page objects"""
     logger = Logger.get_logger()
     
-    # Navigate to base URL
-    driver.get(Config.BASE_URL)
-    logger.info(f"Navigated to {Config.BASE_URL}")
+    shared_page = None
+    if Config.SHARE_LOADED_PAGE:
+        # Reuse this worker's loaded page; it is back in the start state after every test
+        marker = request.node.get_closest_marker("network_profile")
+        shared_page = request.getfixturevalue("shared_pages").get(marker.args[0] if marker else None)
+        driver = shared_page.checkout()
+    else:
+        driver = request.getfixturevalue("driver")
+        driver.get(Config.BASE_URL)
+        logger.info(f"Navigated to {Config.BASE_URL}")
     
     # Import page objects here to avoid circular imports
     from pages.discover_page import DiscoverPage
@@ -161,17 +152,54 @@ def setup(driver):
     discover_page = DiscoverPage(driver)
     filter_panel = FilterPanel(driver)
     
+    if shared_page is None:
+        try:
+            discover_page.wait_for("page_ready")
+        except TimeoutException:
+            logger.warning("Movie grid did not render after initial load")
+    
+    if Config.CALIBRATE_LOCATORS:
+        LocatorRegistry.calibrate_pending(driver)
+    
     logger.info("Setup completed - page objects initialized")
     
     yield driver, discover_page, filter_panel
     
+    if shared_page is not None:
+        readonly = request.node.get_closest_marker("readonly") is not None
+        changed = shared_page.checkin(request.node.nodeid, readonly=readonly)
+        if readonly and changed:
+            pytest.fail(f"Test is marked readonly but changed the page: {', '.join(changed)}")
+    
     logger.info("Test teardown completed")
 
+@pytest_asyncio.fixture
+async def async_setup(driver):
+    """Async page objects over DevTools for the driver's browser, on the loaded start page"""
+    # Import page objects here to avoid circular imports
+    from pages.async_base_page import AsyncBrowser
+    from pages.async_discover_page import AsyncDiscoverPage
+    
+    browser = await AsyncBrowser.from_driver(driver)
+    discover_page = await browser.current_page(AsyncDiscoverPage)
+    await discover_page.open()
+    
+    yield browser, discover_page
+    
+    await browser.close()
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Hook to take screenshot on test failure"""
+    """Hook to take screenshot on test failure and stream the result"""
     outcome = yield
     rep = outcome.get_result()
+    state = item.stash.setdefault(test_outcome_key, {
+        "status": None,
+        "error": None,
+        "screenshot": None,
+        "duration": 0.0
+    })
+    state["duration"] += rep.duration
     
     if rep.when == "call" and rep.failed:
         driver_fixture = item.funcargs.get('driver') or item.funcargs.get('setup')
@@ -187,12 +215,89 @@ def pytest_runtest_makereport(item, call):
             if driver:
                 test_name = item.name
                 try:
-                    # Take screenshot
-                    screenshot_path = os.path.join(
-                        Config.SCREENSHOT_DIR, 
-                        f"FAIL_{test_name}_{Config.get_timestamp()}.png"
-                    )
-                    driver.save_screenshot(screenshot_path)
-                    print(f"📸 Screenshot saved: {screenshot_path}")
+                    # Capture now, encode and write in the background
+                    state["screenshot"] = ScreenshotService.get().capture(driver, f"FAIL_{test_name}")
+                    print(f"📸 Screenshot saved: {state['screenshot']}")
                 except Exception as e:
-                    print(f"⚠️ Failed to save screenshot: {e}")
\ No newline at end of file
+                    print(f"⚠️ Failed to save screenshot: {e}")
+    
+    # Outcome comes from call, or from setup when the test never ran; a failing teardown fails the test
+    if rep.when == "call" or (rep.when == "setup" and not rep.passed) or (rep.when == "teardown" and rep.failed):
+        state["status"] = "PASSED" if rep.passed else "SKIPPED" if rep.skipped else "FAILED"
+        state["error"] = call.excinfo.exconly() if call.excinfo and state["status"] == "FAILED" else None
+    
+    # Record once per test after teardown, when the phase timings are complete
+    report = item.config.stash.get(results_report_key, None)
+    if report is not None and rep.when == "teardown":
+        report.add_test_result(
+            item.nodeid,
+            state["status"] or "PASSED",
+            error_message=state["error"],
+            screenshot=state["screenshot"],
+            duration=state["duration"],
+            phases=dict(rep.user_properties).get("phase_timings")
+        )
+
+def pytest_sessionfinish(session):
+    """Flush background screenshot and log writers before exit"""
+    ScreenshotService.get().flush()
+    
+    if hasattr(session.config, "workerinput"):
+        Logger.shutdown()
+        return
+    
+    Logger.merge_worker_logs()
+    report = session.config.stash.get(results_report_key, None)
+    if report is not None:
+        Logger.get_logger().info(f"Results summary: {report.finalize()}")
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report time actually spent waiting, browser setup time the pool saved and the slowest tests"""
+    report = config.stash.get(results_report_key, None)
+    if report is not None and not hasattr(config, "workerinput"):
+        report.print_console_report()
+    
+    wait_stats = WaitEngine.stats()
+    if wait_stats:
+        terminalreporter.write_sep("-", "waits")
+        for condition, entry in sorted(wait_stats.items()):
+            terminalreporter.write_line(
+                f"{condition}: {entry['count']} waits, {entry['total_seconds']:.2f}s total, "
+                f"avg {entry['total_seconds'] / entry['count']:.3f}s, max {entry['max_seconds']:.2f}s, "
+                f"{entry['timeouts']} timeouts"
+            )
+    
+    lookups = ElementCache.totals["hits"] + ElementCache.totals["misses"]
+    if lookups:
+        terminalreporter.write_sep("-", "element cache")
+        terminalreporter.write_line(
+            f"{ElementCache.totals['hits']} hits, {ElementCache.totals['misses']} misses "
+            f"({ElementCache.totals['hits'] / lookups * 100:.1f}% hit rate), "
+            f"{ElementCache.totals['invalidations']} handles invalidated"
+        )
+    
+    shared = SharedPage.totals
+    if shared["checkouts"]:
+        terminalreporter.write_sep("-", "shared page")
+        terminalreporter.write_line(
+            f"{shared['checkouts']} tests on {shared['loads']} page loads, "
+            f"{shared['in_app_restores']} in-app restores, "
+            f"{shared['mutations']} undeclared changes by readonly tests"
+        )
+    
+    pool = config.stash.get(driver_pool_key, None)
+    if pool is None or not pool.checkout_times:
+        return
+    
+    stats = pool.stats()
+    terminalreporter.write_sep("-", "driver pool")
+    terminalreporter.write_line(
+        f"{stats['launches']} browser launches for {stats['checkouts']} tests "
+        f"({stats['recycled']} recycled)"
+    )
+    terminalreporter.write_line(
+        f"Avg launch: {stats['avg_launch_seconds']:.2f}s, "
+        f"avg checkout: {stats['avg_checkout_seconds']:.3f}s, "
+        f"saved ~{stats['saved_seconds_per_test']:.2f}s per test "
+        f"({stats['saved_seconds_total']:.1f}s total)"
+    )
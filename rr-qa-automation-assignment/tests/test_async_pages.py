@@ -0,0 +1,42 @@
+"""
+Async page objects: concurrent queries and parallel tabs over DevTools
+"""
+import asyncio
+import pytest
+from pages.async_discover_page import AsyncDiscoverPage
+
+class TestAsyncPages:
+    """Test cases for the asyncio page-object layer"""
+    
+    @pytest.mark.smoke
+    @pytest.mark.asyncio
+    async def test_concurrent_state_queries(self, async_setup):
+        """Read cards, selected page and URL at the same time"""
+        browser, discover_page = async_setup
+        
+        state = await discover_page.state()
+        print(f"Page {state['page']} at {state['url']}: {len(state['cards'])} cards")
+        
+        assert state["cards"], "No movie cards extracted"
+        assert state["page"] == 1
+    
+    @pytest.mark.regression
+    @pytest.mark.asyncio
+    async def test_pages_in_parallel_tabs(self, async_setup):
+        """Load page 1 and page 2 in two tabs and read both grids together"""
+        browser, first_tab = async_setup
+        
+        second_tab = await browser.new_page(AsyncDiscoverPage)
+        await second_tab.open()
+        if not await second_tab.click_next_page():
+            pytest.skip("Next button not available")
+        
+        first_titles, second_titles = await asyncio.gather(
+            first_tab.get_movie_titles(),
+            second_tab.get_movie_titles()
+        )
+        print(f"Tab 1: {first_titles[:3]}...")
+        print(f"Tab 2: {second_titles[:3]}...")
+        
+        assert await second_tab.get_current_page_number() == 2
+        assert first_titles != second_titles, "Page 1 and page 2 show the same movies"
@@ -0,0 +1,48 @@
+import os
+import pytest
+from config.config import Config
+from utils.browser_contexts import BrowserContextPool, SHARED_BROWSER_ENV, launch_shared_browser
+from utils.driver_factory import create_driver
+
+@pytest.mark.regression
+def test_contexts_share_one_browser(site_server):
+    """Test that closed contexts are disposed without relaunching the shared browser"""
+    pool = BrowserContextPool(create_driver)
+    try:
+        for _ in range(2):
+            driver = pool.acquire()
+            driver.get(Config.BASE_URL)  # Leaves the session on the context's tab
+            pool.release(driver)
+        pool.acquire()
+        
+        stats = pool.stats()
+        print(f"Context pool stats: {stats}")
+        assert stats["launches"] == 1, f"Shared browser was relaunched: {stats}"
+        assert stats["recycled"] == 0
+        assert stats["checkouts"] == 3
+    finally:
+        pool.close_all()
+
+@pytest.mark.regression
+def test_workers_share_one_browser_process(site_server, monkeypatch):
+    """Test that the context pools of two workers open their contexts in the one shared browser"""
+    monkeypatch.delenv(SHARED_BROWSER_ENV, raising=False)
+    browser = launch_shared_browser()
+    pools = [BrowserContextPool(), BrowserContextPool()]  # As two xdist workers create them
+    try:
+        contexts = [pool.acquire().context for pool in pools]
+        
+        addresses = {pool.browser.capabilities["goog:chromeOptions"]["debuggerAddress"] for pool in pools}
+        print(f"✅ Worker sessions attached to {addresses}")
+        assert addresses == {os.environ[SHARED_BROWSER_ENV]}
+        
+        targets = {info["targetId"] for info in pools[0]._browser_cdp("Target.getTargets", {})["targetInfos"]}
+        assert contexts[1].target_id in targets, "Second worker's context is not in the first worker's browser"
+    finally:
+        for pool in pools:
+            pool.close_all()
+    
+    try:
+        assert browser.window_handles, "Closing a worker's pool closed the shared browser"
+    finally:
+        browser.quit()
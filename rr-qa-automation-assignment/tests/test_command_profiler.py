@@ -0,0 +1,19 @@
+import pytest
+from config.config import Config
+from utils.command_profiler import CommandProfiler
+
+@pytest.mark.regression
+@pytest.mark.readonly
+def test_setup_driver_is_profiled(setup):
+    """Test that commands sent through the setup fixture's (shared) driver are profiled"""
+    if not Config.PROFILE_COMMANDS:
+        pytest.skip("Command profiling is off; run with PROFILE_COMMANDS=1")
+    driver, discover_page, filter_panel = setup
+    
+    discover_page.get_cards()
+    profile = CommandProfiler.profile()
+    
+    commands = sum(entry["count"] for entry in profile["commands"].values())
+    print(f"✅ {commands} commands profiled from {list(profile['call_sites'])}")
+    assert commands > 0, "No WebDriver commands recorded for a setup-based test"
+    assert any(site.startswith("DiscoverPage.") for site in profile["call_sites"])
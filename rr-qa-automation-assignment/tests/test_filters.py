@@ -1,5 +1,11 @@
 import pytest
-import time
+from config.config import Config
+from utils.filter_matrix import FilterMatrixRunner
+from utils.filter_validator import FilterValidator
+from utils.helper import generate_test_data
+
+# Search terms that always have titles containing them
+TERMS_WITH_RESULTS = {"Planet"}
 
 class TestFiltering:
     """Test cases for filtering functionality"""
@@ -9,23 +15,20 @@ class TestFiltering:
         """Test navigation between different categories"""
         driver, discover_page, filter_panel = setup
         
-        # Wait for page to load
-        time.sleep(2)
-        
         # Test Popular category
         discover_page.navigate_to_popular()
-        time.sleep(2)
+        discover_page.wait_for("settled")
         count = discover_page.get_movie_count()
         print(f"Popular section: {count} movies")
         assert count > 0 or "popular" in driver.page_source.lower()
         
         # Navigate back to home
-        driver.get("https://tmdb-discover.surge.sh/")
-        time.sleep(2)
+        driver.get(Config.BASE_URL)
+        discover_page.wait_for("page_ready")
         
         # Test Trend category
         discover_page.navigate_to_trend()
-        time.sleep(2)
+        discover_page.wait_for("settled")
         count = discover_page.get_movie_count()
         print(f"Trend section: {count} movies")
         assert count > 0 or "trend" in driver.page_source.lower()
@@ -35,11 +38,9 @@ class TestFiltering:
         """Test search box functionality"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
-        
         # Search for a specific term
         discover_page.search_movie("Laberinto")
-        time.sleep(3)
+        discover_page.wait_for("settled", quiet_ms=500)  # Allow for input debounce
         
         titles = discover_page.get_movie_titles()
         print(f"Search results: {len(titles)} movies found")
@@ -60,16 +61,40 @@ class TestFiltering:
         # Just check we got some results
         assert len(titles) >= 0  # Even 0 results is valid
     
+    @pytest.mark.regression
+    def test_search_terms_deep_results(self, setup):
+        """Scan deep into the results of every search term"""
+        driver, discover_page, filter_panel = setup
+        
+        for term in generate_test_data()["search_terms"]:
+            scanned = 0
+            matches = 0
+            pages = []
+            for card in discover_page.iter_results(query=term, limit=Config.SEARCH_SCAN_LIMIT):
+                scanned += 1
+                if not pages or pages[-1] != card["page"]:
+                    pages.append(card["page"])
+                if term.lower() in f"{card['title']} {card['details']}".lower():
+                    matches += 1
+            
+            print(f"'{term}': {matches}/{scanned} results mention the term, pages {pages}")
+            if scanned and not matches:
+                print(f"⚠️ No result for '{term}' mentions it")
+            
+            if pages:
+                assert pages[0] == 1, f"Results for '{term}' did not start on page 1: {pages}"
+                assert all(a < b for a, b in zip(pages, pages[1:])), f"Pages for '{term}' not strictly increasing: {pages}"
+            if term in TERMS_WITH_RESULTS:
+                assert matches, f"No result for '{term}' mentions it ({scanned} scanned)"
+    
     @pytest.mark.regression
     def test_type_filter(self, setup):
         """Test filtering by type (Movie/TV Show)"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
-        
         # Select Movie type
         filter_panel.select_type("Movie")
-        time.sleep(3)
+        filter_panel.wait_for("settled")
         
         # Verify movies are displayed
         count = discover_page.get_movie_count()
@@ -85,19 +110,18 @@ class TestFiltering:
         """Test filtering by year range - handles known filter issues"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
-        
         # Get initial movie count
         initial_count = discover_page.get_movie_count()
         print(f"Initial movies: {initial_count}")
         
         # Set year range to 2020-2024
         filter_panel.set_year_range(2020, 2024)
-        time.sleep(3)
+        filter_panel.wait_for("settled")
         
         # Get filtered results
-        filtered_count = discover_page.get_movie_count()
-        years = discover_page.get_movie_years()
+        cards = discover_page.get_cards()
+        filtered_count = discover_page.get_movie_count(cards)
+        years = discover_page.get_movie_years(cards)
         
         print(f"After year filter: {filtered_count} movies")
         print(f"Years found: {years}")
@@ -122,19 +146,78 @@ class TestFiltering:
         # Don't fail the test - just document
         assert True
     
+    @pytest.mark.regression
+    def test_year_range_selection(self, setup):
+        """Test that both year selects take the chosen range"""
+        driver, discover_page, filter_panel = setup
+        
+        assert filter_panel.set_year_range(2000, 2010), "Year range 2000-2010 could not be selected"
+        filter_panel.wait_for("settled")
+        
+        shown = filter_panel.get_year_range()
+        print(f"✅ Year selects show {shown}")
+        assert shown == ("2000", "2010")
+    
+    @pytest.mark.regression
+    @pytest.mark.xfail(reason="Documented issue: Filter may not work correctly")
+    def test_year_filter_result_set(self, setup):
+        """Validate the year filter over several pages of every valid range"""
+        driver, discover_page, filter_panel = setup
+        
+        combinations = [
+            {"year_from": year_from, "year_to": year_to}
+            for year_from, year_to in generate_test_data()["years"]["valid"]
+        ]
+        validator = FilterValidator(discover_page, filter_panel).collect(combinations)
+        report = validator.report()
+        print(f"Report saved: {validator.save_report(report)}")
+        
+        for result in report["combinations"]:
+            combination = result["combination"]
+            print(f"{combination['year_from']}-{combination['year_to']}: {result['cards']} cards on "
+                  f"{result['pages']} pages, {result['out_of_range_rate'] * 100:.1f}% out of range, "
+                  f"years {result['year_min']}-{result['year_max']}")
+        
+        assert report["cards"] > 0, "No cards collected"
+        assert report["out_of_range"] == 0, (
+            f"{report['out_of_range']}/{report['cards']} cards outside the selected year range"
+        )
+    
+    @pytest.mark.regression
+    @pytest.mark.xfail(reason="Documented issue: Filter may not work correctly")
+    def test_filter_matrix(self, setup):
+        """Run the pairwise type/genre/year/rating matrix on one page load"""
+        driver, discover_page, filter_panel = setup
+        
+        runner = FilterMatrixRunner(discover_page, filter_panel)
+        report = runner.run()
+        print(f"Report saved: {runner.save_report(report)}")
+        print(f"{report['combinations']} combinations, {report['transitions']} filter changes, "
+              f"{report['page_loads']} page loads")
+        
+        for result in report["results"]:
+            print(f"{result['combination']}: {result['cards']} cards, "
+                  f"{result['out_of_range_rate'] * 100:.1f}% out of range, "
+                  f"{result['wrong_genre_rate'] * 100:.1f}% wrong genre")
+        
+        assert report["combinations"] > 0, "No filter combinations planned"
+        failed = [result["combination"] for result in report["results"]
+                  if result["out_of_range_rate"] or result["wrong_genre_rate"]]
+        assert not failed, f"Filters not honoured for {len(failed)} combinations: {failed[:3]}"
+        ineffective = [(result["combination"], result["ineffective"]) for result in report["results"] if result["ineffective"]]
+        assert not ineffective, f"Type/rating changes left the grid unchanged: {ineffective[:3]}"
+    
     @pytest.mark.negative
     def test_invalid_year_range(self, setup):
         """Test invalid year range (negative case)"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
-        
         initial_count = discover_page.get_movie_count()
         print(f"Initial count: {initial_count}")
         
         # Try to set invalid year range (from > to)
         filter_panel.set_year_range(2024, 2020)
-        time.sleep(3)
+        filter_panel.wait_for("settled")
         
         # Check if system handles invalid range gracefully
         current_count = discover_page.get_movie_count()
@@ -147,38 +230,38 @@ class TestFiltering:
 class TestContentValidation:
     """Test cases for content validation"""
     
+    @pytest.mark.readonly
+    @pytest.mark.network_profile("full")  # Posters must actually load
     def test_movie_card_elements(self, setup):
         """Verify all movie cards have required elements"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
+        # One snapshot serves every check below
+        cards = discover_page.get_cards()
         
         # Check if posters are displayed
-        posters = driver.find_elements(*discover_page.MOVIE_POSTERS)
+        posters = [card for card in cards if card["poster"]]
         print(f"Found {len(posters)} posters")
         
         # Check if titles are displayed
-        titles = discover_page.get_movie_titles()
+        titles = discover_page.get_movie_titles(cards)
         print(f"Found {len(titles)} titles")
         
         # Check if years/genres are displayed
-        year_elements = driver.find_elements(*discover_page.MOVIE_YEARS)
-        print(f"Found {len(year_elements)} year/description elements")
+        descriptions = [card["details"] for card in cards if card["details"]]
+        print(f"Found {len(descriptions)} year/description elements")
         
         # Basic validation
         if posters:
-            for i, poster in enumerate(posters[:3]):  # Check first 3
-                if poster.is_displayed():
+            for i, card in enumerate(posters[:3]):  # Check first 3
+                if card["poster_visible"]:
                     print(f"✅ Poster {i+1} displayed")
         
         if titles:
             print(f"✅ Found movie titles: {titles[:3]}...")  # Show first 3
         
-        if year_elements:
-            for i, element in enumerate(year_elements[:3]):
-                text = element.text.strip()
-                if text:
-                    print(f"✅ Movie {i+1} description: {text}")
+        for i, text in enumerate(descriptions[:3]):
+            print(f"✅ Movie {i+1} description: {text}")
         
         # Don't fail if no movies, just log
         if len(posters) == 0:
@@ -2,33 +2,35 @@
 Tests for known issues mentioned in the assignment
 """
 import pytest
-import time
-from selenium.webdriver.common.by import By
+from config.config import Config
+from pages.discover_page import DiscoverPage
+from utils.helper import wait_for_page_load
+from utils.wait_engine import WaitEngine
 
 @pytest.mark.xfail(reason="Documented issue: Direct URL access may not work")
 def test_direct_url_access_issue(driver):
     """Test accessing pages directly via URL - expected to fail"""
     # Try to access popular page directly
-    driver.get("https://tmdb-discover.surge.sh/popular")
-    time.sleep(2)
+    driver.get(f"{Config.BASE_URL}popular")
+    wait_for_page_load(driver)
     
     # This might fail or redirect
     assert "popular" in driver.page_source.lower() or "popular" in driver.current_url
 
+@pytest.mark.readonly
 @pytest.mark.xfail(reason="Documented issue: Filter may not work correctly")
 def test_year_filter_issue(setup):
     """Test year filter - may show out-of-range results"""
     driver, discover_page, filter_panel = setup
     
-    time.sleep(2)
-    
     # Get initial count
-    initial_count = discover_page.get_movie_count()
+    cards = discover_page.get_cards()
+    initial_count = discover_page.get_movie_count(cards)
     
     # Try to filter
     # Note: We can't actually set the filter without JavaScript
     # So we'll document the current state
-    years = discover_page.get_movie_years()
+    years = discover_page.get_movie_years(cards)
     
     if years:
         # Count how many are in a reasonable range
@@ -44,13 +46,14 @@ def test_year_filter_issue(setup):
 @pytest.mark.xfail(reason="Documented issue: Last pages may not function properly")
 def test_last_page_pagination_issue(driver):
     """Test last page navigation - expected to have issues"""
-    driver.get("https://tmdb-discover.surge.sh/")
-    time.sleep(2)
+    waits = WaitEngine(driver)
+    driver.get(Config.BASE_URL)
+    waits.until("page_ready")
     
     # Try to find and click last page
     try:
         # Look for high page numbers
-        page_elements = driver.find_elements(By.XPATH, "//a[contains(@aria-label, 'Page')]")
+        page_elements = driver.find_elements(*DiscoverPage.PAGINATION_PAGE_LINKS)
         
         if not page_elements:
             pytest.skip("No page elements found")
@@ -68,9 +71,9 @@ def test_last_page_pagination_issue(driver):
             # Try to click a high page number (not necessarily the last)
             high_page = min(max_page, 100)  # Don't try page 1504
             
-            page_link = driver.find_element(By.XPATH, f"//a[@aria-label='Page {high_page}']")
-            page_link.click()
-            time.sleep(3)
+            page_link = DiscoverPage(driver).find_element(DiscoverPage.page_link(high_page), timeout=Config.EXPLICIT_WAIT)
+            with waits.expect("page_changed"):
+                page_link.click()
             
             # Check if page loaded
             assert driver.title or driver.page_source
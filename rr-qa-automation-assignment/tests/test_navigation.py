@@ -1,5 +1,6 @@
 import pytest
-import time
+from config.config import Config
+from utils.helper import wait_for_page_load
 
 class TestNavigation:
     """Test cases for navigation and URL handling"""
@@ -10,8 +11,8 @@ class TestNavigation:
         print("\nTesting direct URL access...")
         
         # Try to access popular page directly
-        driver.get("https://tmdb-discover.surge.sh/popular")
-        time.sleep(3)
+        driver.get(f"{Config.BASE_URL}popular")
+        wait_for_page_load(driver)
         
         # Check what happened
         current_url = driver.current_url
@@ -34,21 +35,19 @@ class TestNavigation:
         """Test browser back/forward navigation"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
-        
         # Get initial state
         initial_url = driver.current_url
         print(f"Initial URL: {initial_url}")
         
         # Navigate to a section
         discover_page.navigate_to_popular()
-        time.sleep(2)
+        discover_page.wait_for("settled")
         popular_url = driver.current_url
         print(f"After navigation: {popular_url}")
         
         # Use browser back
         driver.back()
-        time.sleep(2)
+        discover_page.wait_for("settled")
         back_url = driver.current_url
         
         # Check if we went back
@@ -59,7 +58,7 @@ class TestNavigation:
         
         # Use browser forward
         driver.forward()
-        time.sleep(2)
+        discover_page.wait_for("settled")
         forward_url = driver.current_url
         
         if popular_url in forward_url or forward_url == popular_url:
@@ -1,6 +1,6 @@
 import pytest
-import time
 from selenium.webdriver.common.by import By
+from config.config import Config
 
 class TestPagination:
     """Test cases for pagination functionality"""
@@ -10,24 +10,18 @@ class TestPagination:
         """Test basic pagination navigation"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
-        
         # Get initial page data
         page1_titles = discover_page.get_movie_titles()
         print(f"Page 1: {len(page1_titles)} movies")
         
         # Check if pagination exists
-        try:
-            pagination = driver.find_element(*discover_page.PAGINATION_CONTAINER)
-            print("✅ Pagination container found")
-        except:
+        if discover_page.probe(discover_page.PAGINATION_CONTAINER) is None:
             print("⚠️ No pagination found - might be single page")
             return  # Skip if no pagination
+        print("✅ Pagination container found")
         
         # Try to navigate to page 2
         if discover_page.click_next_page():
-            time.sleep(3)
-            
             # Get page 2 data
             page2_titles = discover_page.get_movie_titles()
             print(f"Page 2: {len(page2_titles)} movies")
@@ -44,7 +38,6 @@ class TestPagination:
                 
                 # Try to go back to page 1
                 if discover_page.click_previous_page():
-                    time.sleep(3)
                     print("✅ Returned to page 1")
             else:
                 print("⚠️ No movies found on page 2")
@@ -52,23 +45,45 @@ class TestPagination:
             print("⚠️ Next button not available or disabled")
     
     @pytest.mark.regression
-    def test_pagination_state(self, setup):
-        """Test pagination button states"""
+    def test_results_across_pages(self, setup):
+        """Read three pages of results lazily and check they do not repeat"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
+        per_page = discover_page.get_movie_count()
+        if not per_page:
+            pytest.skip("No movies on the first page")
+        
+        seen = {}
+        pages = []
+        for card in discover_page.iter_results(limit=per_page * 3):
+            key = f"{card['title']}|{card['details']}"
+            seen.setdefault(key, []).append(card["page"])
+            if not pages or pages[-1] != card["page"]:
+                pages.append(card["page"])
+        print(f"Read {sum(len(found) for found in seen.values())} cards from pages {pages}")
+        
+        repeated = {key: found for key, found in seen.items() if len(found) > 1}
+        if repeated:
+            print(f"⚠️ {len(repeated)} movies repeated across pages: {list(repeated.items())[:3]}")
+        
+        assert pages == sorted(pages), f"Pages not visited in order: {pages}"
+        assert pages[0] == 1
+    
+    @pytest.mark.regression
+    @pytest.mark.readonly
+    def test_first_page_pagination_state(self, setup):
+        """Test pagination button states on the first page"""
+        driver, discover_page, filter_panel = setup
         
         # Check if pagination exists
-        try:
-            pagination = driver.find_element(*discover_page.PAGINATION_CONTAINER)
-            print("✅ Pagination exists")
-        except:
+        if discover_page.probe(discover_page.PAGINATION_CONTAINER) is None:
             print("⚠️ No pagination found")
             return
+        print("✅ Pagination exists")
         
         # Check previous button state
         try:
-            prev_buttons = driver.find_elements(By.CSS_SELECTOR, "li.previous")
+            prev_buttons = discover_page.probe_all((By.CSS_SELECTOR, "li.previous"))
             if prev_buttons:
                 prev_li = prev_buttons[0]
                 is_disabled = "disabled" in prev_li.get_attribute("class")
@@ -83,17 +98,26 @@ class TestPagination:
                 print("⚠️ Previous button not found")
         except Exception as e:
             print(f"⚠️ Could not check previous button: {e}")
+    
+    @pytest.mark.regression
+    def test_pagination_state(self, setup):
+        """Test pagination button states after navigating"""
+        driver, discover_page, filter_panel = setup
+        
+        # Check if pagination exists
+        if discover_page.probe(discover_page.PAGINATION_CONTAINER) is None:
+            print("⚠️ No pagination found")
+            return
         
         # Try to navigate through a few pages
         print("Testing page navigation...")
         for i in range(2):  # Try 2 pages
             if discover_page.click_next_page():
-                time.sleep(2)
                 print(f"✅ Navigated to page {i+2}")
                 
                 # Now previous should be enabled
                 try:
-                    prev_buttons = driver.find_elements(By.CSS_SELECTOR, "li.previous")
+                    prev_buttons = discover_page.probe_all((By.CSS_SELECTOR, "li.previous"))
                     if prev_buttons:
                         prev_li = prev_buttons[0]
                         is_disabled = "disabled" in prev_li.get_attribute("class")
@@ -106,10 +130,6 @@ class TestPagination:
             else:
                 print(f"⚠️ Could not navigate to page {i+2}")
                 break
-        
-        # Go back to first page
-        driver.get("https://tmdb-discover.surge.sh/")
-        time.sleep(2)
     
     @pytest.mark.negative
     @pytest.mark.xfail(reason="Known issue: Last pages may not work properly")
@@ -117,18 +137,14 @@ class TestPagination:
         """Test navigation to last page (known issue)"""
         driver, discover_page, filter_panel = setup
         
-        time.sleep(2)
-        
         # Check if pagination exists
-        try:
-            pagination = driver.find_element(*discover_page.PAGINATION_CONTAINER)
-        except:
+        if discover_page.probe(discover_page.PAGINATION_CONTAINER) is None:
             pytest.skip("No pagination found")
         
         # Try to find the last page button
         try:
             # Look for any page number
-            page_links = driver.find_elements(By.CSS_SELECTOR, "#react-paginate a")
+            page_links = discover_page.probe_all((By.CSS_SELECTOR, "#react-paginate a"))
             if not page_links:
                 pytest.skip("No page links found")
             
@@ -145,9 +161,9 @@ class TestPagination:
             
             # Try to click the last available page
             if max_page > 1:
-                last_page_link = driver.find_element(By.XPATH, f"//a[text()='{max_page}']")
-                last_page_link.click()
-                time.sleep(3)
+                last_page_link = discover_page.find_element((By.XPATH, f"//a[text()='{max_page}']"), timeout=Config.EXPLICIT_WAIT)
+                with discover_page.waits.expect("page_changed"):
+                    last_page_link.click()
                 
                 # Check if navigation happened
                 current_titles = discover_page.get_movie_titles()
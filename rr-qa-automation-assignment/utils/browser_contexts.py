@@ -0,0 +1,202 @@
+"""
+Isolated browser contexts inside one Chrome
+
+Each pooled driver used to be a whole Chrome process. With
+DRIVER_BACKEND=contexts the pool instead opens a CDP browser context
+(``Target.createBrowserContext``: own cookies, storage and cache, like an
+incognito window) with a single tab for every checkout, all in one browser.
+
+A context is used through its own driver: a copy of the browser's
+WebDriver whose every command first switches the session to the context's
+tab, under a lock shared by all contexts of the browser. Elements found
+through it are bound to it too, so page objects work unchanged. One
+WebDriver session runs one command at a time, so WaitEngine waits in short
+slices on a context driver and other contexts get their turn in between.
+
+Under xdist the controller launches the browser (``launch_shared_browser``)
+and publishes its DevTools address in QA_SHARED_BROWSER before the workers
+start. Each worker's pool then attaches its own WebDriver session to that
+browser, so all workers open their contexts in one Chrome process, and only
+the contexts of the same worker take turns on a session.
+"""
+import copy
+import functools
+import os
+import threading
+import time
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webdriver import WebDriver
+from config.config import Config
+from utils.command_profiler import CommandProfiler
+from utils.driver_factory import attach_driver, create_driver, prepare_tab
+from utils.logger import Logger
+
+SHARED_BROWSER_ENV = "QA_SHARED_BROWSER"
+
+def launch_shared_browser(factory=None):
+    """Launch the Chrome that every pool in this process and its children attaches to; returns its driver"""
+    browser = (factory or create_driver)()
+    os.environ[SHARED_BROWSER_ENV] = browser.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    Logger.get_logger("driver").info(f"Shared browser for contexts at {os.environ[SHARED_BROWSER_ENV]}")
+    return browser
+
+class BrowserContext:
+    """One isolated browser context and its tab"""
+
+    def __init__(self, pool, context_id, target_id):
+        self.pool = pool
+        self.context_id = context_id
+        self.target_id = target_id
+        self.driver = self._bind_driver()
+
+    def _bind_driver(self):
+        """A copy of the browser's WebDriver whose commands run in this context's tab"""
+        pool = self.pool
+        driver = copy.copy(pool.browser)
+        driver._switch_to = SwitchTo(driver)
+        driver.context = self
+        driver.wait_slice = Config.CONTEXT_WAIT_SLICE
+
+        def execute(command, params=None):
+            with pool.lock:
+                if pool.current_handle != self.target_id:
+                    WebDriver.execute(pool.browser, Command.SWITCH_TO_WINDOW, {"handle": self.target_id})
+                    pool.current_handle = self.target_id
+                return WebDriver.execute(driver, command, params)
+
+        # quit() on a context only closes the context, never the shared browser
+        driver.execute = execute
+        driver.quit = self.close
+        return driver
+
+    def close(self):
+        self.pool.close_context(self)
+
+class BrowserContextPool:
+    """Hands out fresh browser contexts of one shared Chrome
+
+    Same interface as DriverPool, so the ``driver`` fixture and the shared
+    page use it unchanged. A context is never reused: closing it discards
+    all its state, so no reset is needed between tests. Without a factory
+    the pool attaches to the shared browser when one was launched, else it
+    launches its own.
+    """
+
+    def __init__(self, factory=None):
+        if factory is None and os.environ.get(SHARED_BROWSER_ENV):
+            factory = functools.partial(attach_driver, os.environ[SHARED_BROWSER_ENV])
+        self.factory = factory or create_driver
+        self.lock = threading.RLock()
+        self.logger = Logger.get_logger("driver")
+        self.browser = None
+        self.browser_handle = None  # The launch window; browser-level commands run from it
+        self.current_handle = None
+        self._contexts = {}
+        self.launch_times = []
+        self.checkout_times = []
+        self.recycled = 0
+
+    def acquire(self):
+        """Open a new context and return its driver"""
+        start = time.perf_counter()
+        with self.lock:
+            try:
+                context = self._open()
+            except WebDriverException as e:
+                # The shared browser died; relaunch it once
+                self.logger.warning(f"Could not open a browser context, relaunching the browser: {e}")
+                self._quit_browser()
+                self.recycled += 1
+                context = self._open()
+        self.checkout_times.append(time.perf_counter() - start)
+        if Config.PROFILE_COMMANDS:
+            CommandProfiler.attach(context.driver)
+        return context.driver
+
+    def release(self, driver):
+        context = getattr(driver, "context", None)
+        if context is not None:
+            self.close_context(context)
+
+    # Contexts are never reused, so retiring one is the same as releasing it
+    retire = release
+
+    def _open(self):
+        if self.browser is None:
+            self._launch()
+
+        context_id = self._browser_cdp("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+        target_id = self._browser_cdp("Target.createTarget", {
+            "url": "about:blank",
+            "browserContextId": context_id,
+            "width": 1920,
+            "height": 1080
+        })["targetId"]
+
+        context = BrowserContext(self, context_id, target_id)
+        self._contexts[target_id] = context
+        prepare_tab(context.driver)
+        self.logger.info(f"Opened browser context {context_id} ({len(self._contexts)} open)")
+        return context
+
+    def close_context(self, context):
+        with self.lock:
+            if self._contexts.pop(context.target_id, None) is None or self.browser is None:
+                return
+            try:
+                self._browser_cdp("Target.closeTarget", {"targetId": context.target_id})
+                self._browser_cdp("Target.disposeBrowserContext", {"browserContextId": context.context_id})
+            except WebDriverException as e:
+                self.logger.warning(f"Could not close browser context {context.context_id}: {e}")
+
+    def _browser_cdp(self, command, params):
+        """Browser-level CDP command, sent from the launch window rather than a context's (possibly closed) tab"""
+        with self.lock:
+            if self.current_handle != self.browser_handle:
+                WebDriver.execute(self.browser, Command.SWITCH_TO_WINDOW, {"handle": self.browser_handle})
+                self.current_handle = self.browser_handle
+            return self.browser.execute_cdp_cmd(command, params)
+
+    def _launch(self):
+        start = time.perf_counter()
+        self.browser = self.factory()
+        self.browser_handle = self.current_handle = self.browser.current_window_handle
+        launch_time = time.perf_counter() - start
+        self.launch_times.append(launch_time)
+        self.logger.info(f"Launched shared browser for contexts in {launch_time:.2f}s")
+
+    def _quit_browser(self):
+        browser, self.browser = self.browser, None
+        self._contexts = {}
+        self.browser_handle = self.current_handle = None
+        if browser is not None:
+            try:
+                browser.quit()
+            except Exception as e:
+                self.logger.warning(f"Error while closing browser: {e}")
+
+    def close_all(self):
+        with self.lock:
+            for context in list(self._contexts.values()):
+                self.close_context(context)
+            self._quit_browser()
+
+    def stats(self):
+        """Same keys as DriverPool.stats; a context stands in for a browser launch"""
+        checkouts = len(self.checkout_times)
+        launches = len(self.launch_times)
+        avg_launch = sum(self.launch_times) / launches if launches else 0
+        avg_checkout = sum(self.checkout_times) / checkouts if checkouts else 0
+        saved_total = avg_launch * checkouts - sum(self.checkout_times)
+
+        return {
+            "launches": launches,
+            "checkouts": checkouts,
+            "recycled": self.recycled,
+            "avg_launch_seconds": avg_launch,
+            "avg_checkout_seconds": avg_checkout,
+            "saved_seconds_total": saved_total,
+            "saved_seconds_per_test": saved_total / checkouts if checkouts else 0
+        }
@@ -0,0 +1,139 @@
+"""
+Asyncio Chrome DevTools Protocol client
+
+Talks to the browser started by chromedriver over its DevTools websocket
+(the ``debuggerAddress`` chromedriver reports). Unlike WebDriver, which runs
+one command at a time per session, CDP accepts many commands in flight, so
+independent queries issued with ``asyncio.gather`` overlap. One browser
+connection serves several tabs through flattened target sessions.
+"""
+import asyncio
+import itertools
+import json
+import urllib.request
+import websockets
+from config.config import Config
+from utils.logger import Logger
+
+class CDPError(Exception):
+    """Error response to a CDP command"""
+
+class CDPConnection:
+    """Browser-level DevTools websocket with concurrent request/response matching"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.logger = Logger.get_logger("driver")
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def connect(cls, debugger_address):
+        """Connect to ``host:port`` of a Chrome started with remote debugging"""
+        def browser_ws_url():
+            with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=Config.EXPLICIT_WAIT) as response:
+                return json.load(response)["webSocketDebuggerUrl"]
+
+        url = await asyncio.to_thread(browser_ws_url)
+        return cls(await websockets.connect(url, max_size=None))
+
+    @classmethod
+    async def from_driver(cls, driver):
+        """Connect to the browser behind a chromedriver session"""
+        options = driver.capabilities.get("goog:chromeOptions", {})
+        if not options.get("debuggerAddress"):
+            raise CDPError("Driver does not expose a DevTools debugger address (Chrome only)")
+        return await cls.connect(options["debuggerAddress"])
+
+    async def send(self, method, params=None, session_id=None, timeout=None):
+        """Send one command and await its result"""
+        message_id = next(self._ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self.websocket.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout or Config.EXPLICIT_WAIT)
+        finally:
+            self._pending.pop(message_id, None)
+
+    def on(self, event, callback, session_id=None):
+        """Call ``callback(params)`` for every ``event`` (of one target session, if given)"""
+        self._listeners.setdefault((event, session_id), []).append(callback)
+
+    def off(self, event, callback, session_id=None):
+        listeners = self._listeners.get((event, session_id), [])
+        if callback in listeners:
+            listeners.remove(callback)
+
+    async def wait_for_event(self, event, session_id=None, timeout=None):
+        """Params of the next ``event``"""
+        future = asyncio.get_running_loop().create_future()
+
+        def resolve(params):
+            if not future.done():
+                future.set_result(params)
+
+        self.on(event, resolve, session_id)
+        try:
+            return await asyncio.wait_for(future, timeout or Config.EXPLICIT_WAIT)
+        finally:
+            self.off(event, resolve, session_id)
+
+    async def _read(self):
+        try:
+            async for raw in self.websocket:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.get(message["id"])
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CDPError(f"{message['error'].get('message')} ({message['error'].get('code')})"))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    for callback in list(self._listeners.get((message.get("method"), message.get("sessionId")), [])):
+                        callback(message.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("DevTools connection closed"))
+
+    async def close(self):
+        await self.websocket.close()
+        self._reader.cancel()
+
+class CDPSession:
+    """Commands and events of one attached target (tab)"""
+
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    @classmethod
+    async def attach(cls, connection, target_id):
+        result = await connection.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+        session = cls(connection, target_id, result["sessionId"])
+        await asyncio.gather(session.send("Page.enable"), session.send("Runtime.enable"))
+        return session
+
+    async def send(self, method, params=None, timeout=None):
+        return await self.connection.send(method, params, session_id=self.session_id, timeout=timeout)
+
+    async def wait_for_event(self, event, timeout=None):
+        return await self.connection.wait_for_event(event, session_id=self.session_id, timeout=timeout)
+
+    async def detach(self):
+        try:
+            await self.connection.send("Target.detachFromTarget", {"sessionId": self.session_id})
+        except CDPError:
+            pass
@@ -0,0 +1,205 @@
+"""
+WebDriver command profiler
+
+Every Selenium call (find_element, .text, get_attribute, is_displayed...) is
+a separate HTTP round trip to chromedriver. When enabled
+(PROFILE_COMMANDS=1 or ``run_tests.py --profile-commands``) the driver's
+command executor is wrapped so each round trip is counted and timed per
+test, per command and per call site. The pools attach the profiler to
+every driver they hand out, so the driver fixture, the shared loaded page
+and crawler workers are all covered. The call site is the outermost
+page-object method on the stack (e.g. ``DiscoverPage.click_next_page``),
+or the test function for raw driver calls made from a test.
+"""
+import bisect
+import json
+import os
+import sys
+import time
+import pytest
+from config.config import Config
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(PROJECT_DIR, "pages") + os.sep
+TESTS_DIR = os.path.join(PROJECT_DIR, "tests") + os.sep
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+def call_site(frame):
+    """Return (site name, frame) for the outermost page-object or test frame"""
+    page_frame = test_frame = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PAGES_DIR):
+            page_frame = frame
+        elif test_frame is None and filename.startswith(TESTS_DIR):
+            test_frame = frame
+        frame = frame.f_back
+
+    if page_frame is not None:
+        owner = page_frame.f_locals.get("self")
+        prefix = type(owner).__name__ if owner is not None else os.path.basename(page_frame.f_code.co_filename)
+        return f"{prefix}.{page_frame.f_code.co_name}", page_frame
+    if test_frame is not None:
+        return f"{os.path.basename(test_frame.f_code.co_filename)}::{test_frame.f_code.co_name}", test_frame
+    return "other", None
+
+class CommandProfiler:
+    """Counts and times the WebDriver commands of the test currently running"""
+
+    active = False
+    _commands = {}
+    _sites = {}
+    _last_frames = {}
+
+    @classmethod
+    def attach(cls, driver):
+        """Wrap the driver's command executor; safe to call on every checkout"""
+        executor = getattr(driver, "command_executor", None)
+        if executor is None or getattr(executor, "_qa_profiled", False):
+            return
+
+        execute = executor.execute
+
+        def profiled_execute(command, params):
+            if not cls.active:
+                return execute(command, params)
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                cls._record(command, time.perf_counter() - start, sys._getframe(1))
+
+        executor.execute = profiled_execute
+        executor._qa_profiled = True
+
+    @classmethod
+    def start_test(cls):
+        cls._commands, cls._sites, cls._last_frames = {}, {}, {}
+        cls.active = True
+
+    @classmethod
+    def stop_test(cls):
+        """Stop recording and return this test's profile"""
+        cls.active = False
+        cls._last_frames = {}  # Do not keep test frames (and their locals) alive
+        return cls.profile()
+
+    @classmethod
+    def profile(cls):
+        """Profile of the current test so far"""
+        return {"commands": cls._commands, "call_sites": cls._sites}
+
+    @classmethod
+    def _record(cls, command, seconds, frame):
+        entry = cls._commands.setdefault(command, {
+            "count": 0,
+            "seconds": 0.0,
+            "histogram": [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        })
+        entry["count"] += 1
+        entry["seconds"] += seconds
+        entry["histogram"][bisect.bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+
+        name, site_frame = call_site(frame)
+        site = cls._sites.setdefault(name, {"calls": 0, "commands": 0, "seconds": 0.0})
+        # Consecutive commands from the same frame object belong to one call of the site
+        if site_frame is None or cls._last_frames.get(name) is not site_frame:
+            site["calls"] += 1
+            cls._last_frames[name] = site_frame
+        site["commands"] += 1
+        site["seconds"] += seconds
+
+class CommandProfilerPlugin:
+    """pytest plugin that profiles on the workers and aggregates on the controller"""
+
+    def __init__(self, config):
+        self.config = config
+        self.tests = {}
+        self.commands = {}
+        self.sites = {}
+        self.report_file = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        CommandProfiler.start_test()
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        rep = outcome.get_result()
+        if rep.when == "teardown":
+            # user_properties travel from xdist workers to the controller
+            rep.user_properties.append(("command_profile", CommandProfiler.stop_test()))
+
+    def pytest_runtest_logreport(self, report):
+        if hasattr(self.config, "workerinput") or report.when != "teardown":
+            return
+        profile = dict(report.user_properties).get("command_profile")
+        if profile is None:
+            return
+
+        self.tests[report.nodeid.split("@")[0]] = {
+            "commands": sum(entry["count"] for entry in profile["commands"].values()),
+            "seconds": sum(entry["seconds"] for entry in profile["commands"].values())
+        }
+        for command, entry in profile["commands"].items():
+            total = self.commands.setdefault(command, {
+                "count": 0,
+                "seconds": 0.0,
+                "histogram": [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+            })
+            total["count"] += entry["count"]
+            total["seconds"] += entry["seconds"]
+            total["histogram"] = [a + b for a, b in zip(total["histogram"], entry["histogram"])]
+        for name, entry in profile["call_sites"].items():
+            total = self.sites.setdefault(name, {"calls": 0, "commands": 0, "seconds": 0.0})
+            for key in total:
+                total[key] += entry[key]
+
+    def chattiest(self, limit=None):
+        """Call sites ranked by WebDriver commands issued per call"""
+        ranked = sorted(
+            ({"site": name, "commands_per_call": entry["commands"] / entry["calls"], **entry}
+             for name, entry in self.sites.items()),
+            key=lambda entry: (entry["commands_per_call"], entry["commands"]),
+            reverse=True
+        )
+        return ranked[:limit] if limit else ranked
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.tests:
+            return
+
+        report = {
+            "histogram_bounds_ms": HISTOGRAM_BOUNDS_MS,
+            "total_commands": sum(test["commands"] for test in self.tests.values()),
+            "commands": self.commands,
+            "call_sites": self.chattiest(),
+            "tests": dict(sorted(self.tests.items(), key=lambda item: item[1]["commands"], reverse=True))
+        }
+        os.makedirs(Config.REPORT_DIR, exist_ok=True)
+        filename = os.path.join(Config.REPORT_DIR, f"command_profile_{Config.get_timestamp()}.json")
+        with open(filename, "w") as f:
+            json.dump(report, f, indent=4)
+        self.report_file = filename
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.sites:
+            return
+
+        terminalreporter.write_sep("-", "webdriver commands")
+        total = sum(test["commands"] for test in self.tests.values())
+        seconds = sum(test["seconds"] for test in self.tests.values())
+        terminalreporter.write_line(
+            f"{total} commands in {len(self.tests)} tests, {seconds:.1f}s in round trips"
+        )
+        for entry in self.chattiest(Config.PROFILE_TOP_SITES):
+            terminalreporter.write_line(
+                f"{entry['commands_per_call']:6.1f} cmds/call  {entry['calls']:5d} calls  "
+                f"{entry['seconds']:7.2f}s  {entry['site']}"
+            )
+        if self.report_file:
+            terminalreporter.write_line(f"Full profile: {self.report_file}")
@@ -0,0 +1,106 @@
+"""
+Browser instantiation for the test suite
+"""
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from config.config import Config
+from utils.logger import Logger
+from utils.driver_provisioning import resolve_chromedriver
+from utils.wait_engine import install_network_tracker
+from utils.site_fixtures import install_api_rewrite
+
+def get_chromedriver_path():
+    """Get ChromeDriver path from the per-machine provisioning cache"""
+    return resolve_chromedriver()
+
+def prepare_tab(driver):
+    """Apply per-tab CDP setup; needed again whenever a new tab is opened"""
+    try:
+        # Stealth mode
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+            "userAgent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36'
+        })
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        })
+    except AttributeError:
+        return  # Not a Chromium driver
+    install_network_tracker(driver)
+
+    if Config.SITE_MODE == "replay":
+        install_api_rewrite(driver)
+
+def attach_driver(debugger_address):
+    """New WebDriver session on an already running Chrome, e.g. one shared by xdist workers
+
+    Quitting it ends only the session; the browser keeps running for its owner.
+    """
+    options = Options()
+    options.debugger_address = debugger_address
+    driver_instance = webdriver.Chrome(service=Service(executable_path=get_chromedriver_path()), options=options)
+    prepare_tab(driver_instance)
+    driver_instance.implicitly_wait(Config.implicit_wait())
+    Logger.get_logger("driver").info(f"Attached to Chrome at {debugger_address}")
+    return driver_instance
+
+def create_driver(capabilities=None):
+    """Launch and configure a new browser instance"""
+    logger = Logger.get_logger("driver")
+
+    try:
+        # Get ChromeDriver path
+        chromedriver_path = get_chromedriver_path()
+
+        if chromedriver_path == "safari":
+            # Use Safari on Mac
+            driver_instance = webdriver.Safari()
+            logger.info("Using Safari browser")
+
+        else:
+            # Use Chrome with custom options
+            options = Options()
+
+            if Config.HEADLESS:
+                options.add_argument("--headless=new")  # New headless mode
+
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--window-size=1920,1080")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--disable-blink-features=AutomationControlled")
+
+            # Add these to avoid detection
+            options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            options.add_experimental_option('useAutomationExtension', False)
+
+            for name, value in (capabilities or {}).items():
+                options.set_capability(name, value)
+
+            # Create service
+            service = Service(executable_path=chromedriver_path)
+
+            # Create driver
+            driver_instance = webdriver.Chrome(service=service, options=options)
+
+            # Stealth mode and wait tracking
+            prepare_tab(driver_instance)
+
+            logger.info(f"ChromeDriver initialized from: {chromedriver_path}")
+
+    except Exception as e:
+        logger.error(f"Failed to initialize driver: {e}")
+
+        # Last resort: try with system Chrome if available
+        print("🔄 Trying system Chrome as last resort...")
+        driver_instance = webdriver.Chrome()  # Let Selenium find it
+
+    # Set timeouts
+    driver_instance.implicitly_wait(Config.implicit_wait())
+
+    if Config.HEADLESS:
+        driver_instance.set_window_size(1920, 1080)
+    else:
+        driver_instance.maximize_window()
+
+    return driver_instance
@@ -0,0 +1,169 @@
+"""
+Pool of warm browser instances shared by the tests of one worker
+"""
+import time
+from urllib.parse import urlparse
+from config.config import Config
+from utils.logger import Logger
+from utils.command_profiler import CommandProfiler
+from utils.driver_factory import prepare_tab
+
+class PooledDriver:
+    """A browser instance together with its pool bookkeeping"""
+
+    def __init__(self, driver, launch_time):
+        self.driver = driver
+        self.launch_time = launch_time
+        self.uses = 0
+
+class DriverPool:
+    """Hands out warm browsers and resets them between tests
+
+    Browsers are recycled after ``max_uses`` checkouts or as soon as a
+    health check or reset fails, so a crashed Chrome never reaches the
+    next test.
+    """
+
+    def __init__(self, factory, max_uses=None):
+        self.factory = factory
+        self.max_uses = max_uses or Config.POOL_MAX_USES
+        self.logger = Logger.get_logger("driver")
+        self._idle = []
+        self._busy = {}
+        self.launch_times = []
+        self.checkout_times = []
+        self.recycled = 0
+
+    def acquire(self):
+        """Return a healthy browser, launching one only if none is idle"""
+        start = time.perf_counter()
+
+        while self._idle:
+            pooled = self._idle.pop()
+            if self._is_healthy(pooled.driver):
+                break
+            self.logger.warning("Pooled browser failed health check, recycling")
+            self._retire(pooled)
+        else:
+            pooled = self._launch()
+
+        pooled.uses += 1
+        if Config.PROFILE_COMMANDS:
+            CommandProfiler.attach(pooled.driver)
+        self._busy[id(pooled.driver)] = pooled
+        self.checkout_times.append(time.perf_counter() - start)
+        return pooled.driver
+
+    def release(self, driver):
+        """Return a browser to the pool, resetting it for the next test"""
+        pooled = self._busy.pop(id(driver), None)
+        if pooled is None:
+            return
+
+        if pooled.uses >= self.max_uses:
+            self.logger.info(f"Browser reached {pooled.uses} uses, recycling")
+            self._retire(pooled)
+            return
+
+        try:
+            self.reset(driver)
+        except Exception as e:
+            self.logger.warning(f"Could not reset pooled browser, recycling: {e}")
+            self._retire(pooled)
+            return
+
+        self._idle.append(pooled)
+
+    def retire(self, driver):
+        """Quit a checked-out browser instead of returning it to the pool"""
+        pooled = self._busy.pop(id(driver), None)
+        if pooled is not None:
+            self._retire(pooled)
+
+    def reset(self, driver):
+        """Clear cookies, storage, history and the current URL"""
+        origins = {self._origin(Config.BASE_URL), self._origin(driver.current_url)}
+
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            for origin in origins:
+                if origin:
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                        "origin": origin,
+                        "storageTypes": "all"
+                    })
+        except AttributeError:
+            # Non-Chromium drivers: only the current origin can be cleared
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+        # A fresh tab is the only way to drop the session history
+        old_handles = driver.window_handles
+        driver.switch_to.new_window('tab')
+        new_handle = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(new_handle)
+        prepare_tab(driver)
+        driver.implicitly_wait(Config.implicit_wait())
+
+    def close_all(self):
+        """Quit every browser owned by the pool"""
+        for pooled in self._idle + list(self._busy.values()):
+            self._quit(pooled.driver)
+        self._idle = []
+        self._busy = {}
+
+    def stats(self):
+        """Summarize launch and checkout costs for the session"""
+        checkouts = len(self.checkout_times)
+        launches = len(self.launch_times)
+        avg_launch = sum(self.launch_times) / launches if launches else 0
+        avg_checkout = sum(self.checkout_times) / checkouts if checkouts else 0
+
+        # Without the pool every checkout would have paid a full launch
+        saved_total = avg_launch * checkouts - sum(self.checkout_times)
+
+        return {
+            "launches": launches,
+            "checkouts": checkouts,
+            "recycled": self.recycled,
+            "avg_launch_seconds": avg_launch,
+            "avg_checkout_seconds": avg_checkout,
+            "saved_seconds_total": saved_total,
+            "saved_seconds_per_test": saved_total / checkouts if checkouts else 0
+        }
+
+    def _launch(self):
+        start = time.perf_counter()
+        driver = self.factory()
+        launch_time = time.perf_counter() - start
+        self.launch_times.append(launch_time)
+        self.logger.info(f"Launched pooled browser in {launch_time:.2f}s")
+        return PooledDriver(driver, launch_time)
+
+    def _retire(self, pooled):
+        self.recycled += 1
+        self._quit(pooled.driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+            self.logger.info("Browser closed")
+        except Exception as e:
+            self.logger.warning(f"Error while closing browser: {e}")
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1 and len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    @staticmethod
+    def _origin(url):
+        parsed = urlparse(url or "")
+        if parsed.scheme in ("http", "https") and parsed.netloc:
+            return f"{parsed.scheme}://{parsed.netloc}"
+        return None
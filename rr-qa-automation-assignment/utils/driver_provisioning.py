@@ -0,0 +1,180 @@
+"""
+ChromeDriver provisioning with a per-machine cache
+
+The installed Chrome version is detected once and remembered together with
+the binary's mtime, so later runs only stat the binary. A matching
+chromedriver is located (or downloaded from Chrome for Testing at most once)
+and recorded in a cache file keyed by Chrome version and platform. A file
+lock keeps parallel xdist workers from resolving or downloading at the same
+time.
+"""
+import functools
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import stat
+import subprocess
+import zipfile
+from contextlib import contextmanager
+import requests
+from config.config import Config
+from utils.logger import Logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, a duplicate download is harmless
+    fcntl = None
+
+VERSION_PATTERN = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+LATEST_RELEASE_URL = "https://googlechromelabs.github.io/chrome-for-testing/LATEST_RELEASE_{major}"
+DOWNLOAD_URL = "https://storage.googleapis.com/chrome-for-testing-public/{version}/{platform}/chromedriver-{platform}.zip"
+
+CHROME_CANDIDATES = [
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
+]
+
+DRIVER_CANDIDATES = [
+    "chromedriver",
+    "/usr/local/bin/chromedriver",
+    "/opt/homebrew/bin/chromedriver",
+    os.path.expanduser("~/chromedriver")
+]
+
+def platform_key():
+    """Chrome for Testing platform name for this machine"""
+    system, machine = platform.system(), platform.machine().lower()
+    if system == "Darwin":
+        return "mac-arm64" if machine == "arm64" else "mac-x64"
+    if system == "Windows":
+        return "win64" if machine.endswith("64") else "win32"
+    return "linux64"
+
+def _which(candidate):
+    if os.path.isabs(candidate):
+        return candidate if os.path.exists(candidate) and os.access(candidate, os.X_OK) else None
+    return shutil.which(candidate)
+
+def _binary_version(path):
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=15).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(1) if match else None
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+@contextmanager
+def _cache_lock():
+    os.makedirs(Config.DRIVER_CACHE_DIR, exist_ok=True)
+    with open(os.path.join(Config.DRIVER_CACHE_DIR, ".lock"), "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def _load_cache():
+    path = os.path.join(Config.DRIVER_CACHE_DIR, "driver_cache.json")
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"browser": {}, "drivers": {}}
+
+def _save_cache(cache):
+    path = os.path.join(Config.DRIVER_CACHE_DIR, "driver_cache.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(cache, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+def _chrome_version(cache):
+    """Installed Chrome version, re-running the binary only if it changed on disk"""
+    browser = cache.get("browser", {})
+    path = browser.get("path")
+    if path and os.path.exists(path) and os.path.getmtime(path) == browser.get("mtime"):
+        return browser["version"]
+
+    for candidate in CHROME_CANDIDATES:
+        path = _which(candidate)
+        version = _binary_version(path) if path else None
+        if version:
+            cache["browser"] = {"path": path, "mtime": os.path.getmtime(path), "version": version}
+            return version
+    return None
+
+def _download_driver(chrome_version, platform_name):
+    """Fetch the chromedriver matching Chrome's major version into the cache"""
+    major = _major(chrome_version)
+    response = requests.get(LATEST_RELEASE_URL.format(major=major), timeout=30)
+    response.raise_for_status()
+    driver_version = response.text.strip()
+
+    print(f"📥 Downloading ChromeDriver {driver_version} for {platform_name}...")
+    response = requests.get(DOWNLOAD_URL.format(version=driver_version, platform=platform_name), timeout=120)
+    response.raise_for_status()
+
+    target_dir = os.path.join(Config.DRIVER_CACHE_DIR, "chromedriver", driver_version)
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        archive.extractall(target_dir)
+
+    executable = "chromedriver.exe" if platform_name.startswith("win") else "chromedriver"
+    driver_path = os.path.join(target_dir, f"chromedriver-{platform_name}", executable)
+    os.chmod(driver_path, os.stat(driver_path).st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+    print(f"✅ ChromeDriver downloaded to: {driver_path}")
+    return driver_path
+
+@functools.lru_cache(maxsize=None)
+def resolve_chromedriver():
+    """Path to a chromedriver matching the installed Chrome, or "safari" as a Mac fallback"""
+    logger = Logger.get_logger("driver")
+
+    with _cache_lock():
+        cache = _load_cache()
+        stored = json.dumps(cache, sort_keys=True)
+        chrome_version = _chrome_version(cache)
+        platform_name = platform_key()
+        key = f"{chrome_version}-{platform_name}"
+
+        cached = cache.setdefault("drivers", {}).get(key)
+        if cached and os.access(cached, os.X_OK):
+            # Only a re-detected Chrome (new path or mtime) changes the entry on a hit
+            if json.dumps(cache, sort_keys=True) != stored:
+                _save_cache(cache)
+            return cached
+
+        driver_path = None
+        for candidate in DRIVER_CANDIDATES:
+            path = _which(candidate)
+            if path and (chrome_version is None or _major(_binary_version(path)) == _major(chrome_version)):
+                driver_path = path
+                break
+
+        if driver_path is None and chrome_version:
+            try:
+                driver_path = _download_driver(chrome_version, platform_name)
+            except Exception as e:
+                print(f"❌ Failed to download ChromeDriver: {e}")
+
+        if driver_path is None:
+            # Fallback to Safari if on Mac
+            if Config.IS_MAC_ARM:
+                print("🔄 Trying Safari as fallback...")
+                return "safari"
+            raise RuntimeError(f"No chromedriver available for Chrome {chrome_version} on {platform_name}")
+
+        if chrome_version:
+            cache["drivers"][key] = driver_path
+            _save_cache(cache)
+
+    logger.info(f"Resolved chromedriver {driver_path} for Chrome {chrome_version}")
+    return driver_path
@@ -0,0 +1,92 @@
+"""
+History-aware xdist scheduling
+
+Per-test wall-clock durations are saved after every run. On the next run
+with ``-n N --dist loadgroup`` the tests are bin-packed onto the N workers
+longest-processing-time first, and each bin becomes one xdist_group so a
+worker receives a balanced share of the slow browser tests.
+"""
+import heapq
+import json
+import os
+import pytest
+from config.config import Config
+
+class DurationScheduler:
+    """pytest plugin that records durations and assigns LPT xdist groups"""
+
+    # Weight of the newest run when smoothing recorded durations
+    SMOOTHING = 0.5
+
+    def __init__(self, config):
+        self.config = config
+        self.path = Config.DURATION_HISTORY_FILE
+        self.history = self._load()
+        self.current = {}
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _base_nodeid(nodeid):
+        # loadgroup appends "@<group>" to node ids
+        return nodeid.split("@")[0]
+
+    def estimate(self, nodeid):
+        """Expected duration of a test, defaulting to the median of known tests"""
+        if nodeid in self.history:
+            return self.history[nodeid]
+        if self.history:
+            known = sorted(self.history.values())
+            return known[len(known) // 2]
+        return Config.DEFAULT_TEST_DURATION
+
+    def assign_bins(self, nodeids, workers):
+        """Longest-processing-time-first bin packing; returns {nodeid: bin}"""
+        bins = [(0.0, index) for index in range(workers)]
+        heapq.heapify(bins)
+        assignment = {}
+        for nodeid in sorted(nodeids, key=self.estimate, reverse=True):
+            load, index = heapq.heappop(bins)
+            assignment[nodeid] = index
+            heapq.heappush(bins, (load + self.estimate(nodeid), index))
+        return assignment
+
+    # Runs after -m/-k and impact deselection, so only the tests that will run are packed
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        # Only workers collect under xdist; the controller never sees items
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput is None or config.getoption("dist", None) != "loadgroup":
+            return
+
+        assignment = self.assign_bins([item.nodeid for item in items], workerinput["workercount"])
+        for item in items:
+            if item.get_closest_marker("xdist_group") is None:
+                item.add_marker(pytest.mark.xdist_group(name=f"lpt_{assignment[item.nodeid]}"))
+
+    def pytest_runtest_logreport(self, report):
+        if hasattr(self.config, "workerinput"):
+            return
+        nodeid = self._base_nodeid(report.nodeid)
+        self.current[nodeid] = self.current.get(nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.current:
+            return
+
+        for nodeid, duration in self.current.items():
+            previous = self.history.get(nodeid)
+            if previous is None:
+                self.history[nodeid] = duration
+            else:
+                self.history[nodeid] = self.SMOOTHING * duration + (1 - self.SMOOTHING) * previous
+
+        with open(self.path, "w") as f:
+            json.dump(self.history, f, indent=4, sort_keys=True)
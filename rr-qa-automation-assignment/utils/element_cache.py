@@ -0,0 +1,62 @@
+"""
+Per-page cache of located elements
+
+Repeated interactions with the same control (search input, pagination
+buttons) reuse the element handle instead of locating it again. Handles are
+dropped when an interaction hits StaleElementReferenceException, and after
+every WaitEngine wait: the wait script already runs in the page, so it also
+reports which cached handles are still attached and still match their CSS
+selector, at no extra round trip. A navigation detaches every handle, so
+the first wait after it clears the cache.
+"""
+from selenium.webdriver.common.by import By
+
+class ElementCache:
+    """Element handles keyed by locator, with hit/miss counters"""
+
+    # Counters summed over every cache in this process
+    totals = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def __init__(self):
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, locator):
+        element = self._elements.get(tuple(locator))
+        if element is None:
+            self.misses += 1
+            ElementCache.totals["misses"] += 1
+        else:
+            self.hits += 1
+            ElementCache.totals["hits"] += 1
+        return element
+
+    def put(self, locator, element):
+        self._elements[tuple(locator)] = element
+
+    def invalidate(self, locator=None):
+        """Drop one handle, or every handle when no locator is given"""
+        if locator is None:
+            dropped = len(self._elements)
+            self._elements = {}
+        else:
+            dropped = 1 if self._elements.pop(tuple(locator), None) is not None else 0
+        ElementCache.totals["invalidations"] += dropped
+
+    def watched(self):
+        """(locators, [[element, css selector or None], ...]) for the wait script to check"""
+        locators = list(self._elements)
+        return locators, [
+            [self._elements[locator], locator[1] if locator[0] == By.CSS_SELECTOR else None]
+            for locator in locators
+        ]
+
+    def retain(self, locators, live):
+        """Keep only the handles the page reported as still attached and matching"""
+        for locator, alive in zip(locators, live):
+            if not alive:
+                self.invalidate(locator)
+
+    def __len__(self):
+        return len(self._elements)
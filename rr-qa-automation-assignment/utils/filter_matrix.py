@@ -0,0 +1,198 @@
+"""
+Combinatorial filter matrix on one page load
+
+Type x genre x year range x rating combinations are reduced to a pairwise
+covering set (every pair of values of any two filters appears in at least
+one combination), then ordered greedily so neighbouring combinations differ
+in as few, and as cheap, filters as possible. The runner applies only the
+filters that change between neighbours, so a single page load serves the
+whole matrix; reloads that happen anyway are counted.
+
+Year and genre are checked against every card. The cards show neither
+rating nor type, so for those a change is checked to have had an effect:
+applying a different rating or type that leaves the grid exactly as it was
+is reported as ineffective. Invalid year ranges cannot be selected in the
+UI, so they stay out of the matrix (see test_invalid_year_range).
+"""
+import itertools
+import json
+import os
+from selenium.common.exceptions import TimeoutException
+from config.config import Config
+from utils.filter_validator import CardColumns, analyze
+from utils.helper import generate_test_data
+from utils.logger import Logger
+
+DIMENSIONS = ("type", "genre", "years", "rating")
+
+# Filters the cards carry no data for; only their effect on the grid can be checked
+EFFECT_ONLY = ("type", "rating")
+
+# Set once per document, so a missing marker means the page was reloaded
+LOAD_MARKER_JS = """
+const seen = window.__filterMatrixLoaded === true;
+window.__filterMatrixLoaded = true;
+return seen;
+"""
+
+def default_dimensions():
+    """Filter values to combine, with the selectable year ranges from generate_test_data"""
+    test_data = generate_test_data()
+    return {
+        "type": Config.FILTER_MATRIX_TYPES,
+        "genre": Config.FILTER_MATRIX_GENRES,
+        "years": test_data["years"]["valid"],
+        "rating": test_data["ratings"]
+    }
+
+def pairwise(dimensions):
+    """Greedy all-pairs reduction; returns a list of {dimension: value} rows"""
+    names = list(dimensions)
+    values = [list(dimensions[name]) for name in names]
+    uncovered = {
+        (a, i, b, j)
+        for a, b in itertools.combinations(range(len(names)), 2)
+        for i in range(len(values[a]))
+        for j in range(len(values[b]))
+    }
+
+    rows = []
+    while uncovered:
+        # Seed the row with the first uncovered pair, then fill the other
+        # dimensions with whichever value covers the most new pairs
+        a, i, b, j = min(uncovered)
+        row = {a: i, b: j}
+        for dim in range(len(names)):
+            if dim not in row:
+                row[dim] = max(range(len(values[dim])), key=lambda v: _new_pairs(uncovered, row, dim, v))
+        for x, y in itertools.combinations(sorted(row), 2):
+            uncovered.discard((x, row[x], y, row[y]))
+        rows.append({names[dim]: values[dim][index] for dim, index in row.items()})
+    return rows
+
+def _new_pairs(uncovered, row, dim, value):
+    """How many uncovered pairs ``row`` would cover with ``dim`` set to ``value``"""
+    count = 0
+    for other, index in row.items():
+        pair = (other, index, dim, value) if other < dim else (dim, value, other, index)
+        count += pair in uncovered
+    return count
+
+def transition_cost(previous, row):
+    """UI cost of going from one combination to the next"""
+    if previous is None:
+        return sum(Config.FILTER_TRANSITION_COSTS[name] for name in row)
+    return sum(Config.FILTER_TRANSITION_COSTS[name] for name in row if row[name] != previous.get(name))
+
+def order_by_transitions(rows, start=None):
+    """Nearest-neighbour ordering that keeps consecutive combinations similar"""
+    remaining = list(rows)
+    ordered, current = [], start
+    while remaining:
+        nearest = min(remaining, key=lambda row: transition_cost(current, row))
+        remaining.remove(nearest)
+        ordered.append(nearest)
+        current = nearest
+    return ordered
+
+class FilterMatrixRunner:
+    """Runs filter combinations in sequence on one loaded page"""
+
+    def __init__(self, discover_page, filter_panel):
+        self.discover_page = discover_page
+        self.filter_panel = filter_panel
+        self.store = CardColumns()
+        self.state = {}
+        self.results = []
+        self.transitions = 0
+        self.page_loads = 0
+        self.logger = Logger.get_logger("pages")
+
+    def plan(self, dimensions=None):
+        """Pairwise-reduced combinations in low-transition order"""
+        dimensions = dimensions or default_dimensions()
+        full = 1
+        for values in dimensions.values():
+            full *= len(values)
+        rows = order_by_transitions(pairwise(dimensions))
+        self.logger.info(f"Filter matrix: {len(rows)} pairwise combinations instead of {full}")
+        return rows
+
+    def run(self, rows=None):
+        rows = rows if rows is not None else self.plan()
+        self._count_page_load()
+        previous_titles = None
+        for index, row in enumerate(rows):
+            applied = self._apply(row)
+            try:
+                self.discover_page.wait_for("settled")
+            except TimeoutException:
+                self.logger.warning(f"Results did not settle for {row}")
+            self._count_page_load()
+
+            cards = self.discover_page.get_cards()
+            titles = [card["title"] for card in cards]
+            self.store.append(cards, page=1, combination=index)
+            self.results.append({
+                "combination": row,
+                "applied": applied,
+                "effective": dict(self.state),
+                "cards": len(cards),
+                "ineffective": [
+                    name for name in EFFECT_ONLY
+                    if applied.get(name) and titles and titles == previous_titles
+                ]
+            })
+            previous_titles = titles
+        return self.report(rows)
+
+    def _count_page_load(self):
+        if not self.discover_page.driver.execute_script(LOAD_MARKER_JS):
+            self.page_loads += 1
+
+    def _apply(self, row):
+        """Change only the filters that differ from the current state; returns what was applied"""
+        applied = {}
+        for name in DIMENSIONS:
+            if name not in row or self.state.get(name) == row[name]:
+                continue
+            value = row[name]
+            ok = self.filter_panel.apply_filters({name: value})[name]
+            applied[name] = bool(ok)
+            self.transitions += 1
+            # A failed change leaves the UI state unknown, so retry it next time
+            if ok:
+                self.state[name] = value
+            else:
+                self.state.pop(name, None)
+        return applied
+
+    def report(self, rows):
+        # Judge the cards against the filters actually in effect, not the ones requested
+        combinations = [
+            {
+                "year_from": result["effective"]["years"][0] if "years" in result["effective"] else None,
+                "year_to": result["effective"]["years"][1] if "years" in result["effective"] else None,
+                "genre": result["effective"].get("genre")
+            }
+            for result in self.results
+        ]
+        analysis = analyze(self.store.columns(), combinations)
+        for result, stats in zip(self.results, analysis):
+            result.update({
+                "out_of_range_rate": stats["out_of_range_rate"],
+                "wrong_genre_rate": stats["wrong_genre_rate"]
+            })
+        return {
+            "combinations": len(rows),
+            "transitions": self.transitions,
+            "page_loads": self.page_loads,
+            "results": self.results
+        }
+
+    def save_report(self, report):
+        os.makedirs(Config.REPORT_DIR, exist_ok=True)
+        filename = os.path.join(Config.REPORT_DIR, f"filter_matrix_{Config.get_timestamp()}.json")
+        with open(filename, "w") as f:
+            json.dump(report, f, indent=4, default=list)
+        return filename
@@ -0,0 +1,195 @@
+"""
+Columnar validation of year and genre filters
+
+Card records from many filter combinations and pages are packed into numpy
+columns (year, genre id, page, combination) instead of lists of dicts, so
+tens of thousands of cards stay compact. Out-of-range rates, distributions
+and per-page anomalies are then computed with vectorized operations.
+"""
+import json
+import os
+import numpy as np
+from selenium.common.exceptions import TimeoutException
+from config.config import Config
+from utils.logger import Logger
+
+# TMDB genre ids for the names shown on the cards (movie and TV lists)
+GENRE_IDS = {
+    "Action": 28,
+    "Adventure": 12,
+    "Animation": 16,
+    "Comedy": 35,
+    "Crime": 80,
+    "Documentary": 99,
+    "Drama": 18,
+    "Family": 10751,
+    "Fantasy": 14,
+    "History": 36,
+    "Horror": 27,
+    "Music": 10402,
+    "Mystery": 9648,
+    "Romance": 10749,
+    "Science Fiction": 878,
+    "TV Movie": 10770,
+    "Thriller": 53,
+    "War": 10752,
+    "Western": 37,
+    "Action & Adventure": 10759,
+    "Kids": 10762,
+    "News": 10763,
+    "Reality": 10764,
+    "Sci-Fi & Fantasy": 10765,
+    "Soap": 10766,
+    "Talk": 10767,
+    "War & Politics": 10768
+}
+GENRE_NAMES = {genre_id: name for name, genre_id in GENRE_IDS.items()}
+MISSING = -1
+
+def genre_id(name):
+    return GENRE_IDS.get((name or "").strip(), MISSING)
+
+class CardColumns:
+    """Append-only columnar store of card records"""
+
+    COLUMNS = {"year": np.int16, "genre": np.int32, "page": np.int16, "combination": np.int16}
+
+    def __init__(self):
+        self._chunks = {name: [] for name in self.COLUMNS}
+        self._frozen = None
+
+    def append(self, cards, page, combination):
+        """Add one page of cards as a chunk per column"""
+        if not cards:
+            return
+        self._chunks["year"].append(np.array(
+            [card["year"] if card["year"] is not None else MISSING for card in cards], dtype=np.int16))
+        self._chunks["genre"].append(np.array([genre_id(card["genre"]) for card in cards], dtype=np.int32))
+        self._chunks["page"].append(np.full(len(cards), page, dtype=np.int16))
+        self._chunks["combination"].append(np.full(len(cards), combination, dtype=np.int16))
+        self._frozen = None
+
+    def columns(self):
+        """Return the columns as contiguous arrays"""
+        if self._frozen is None:
+            self._frozen = {
+                name: np.concatenate(chunks) if chunks else np.empty(0, dtype=self.COLUMNS[name])
+                for name, chunks in self._chunks.items()
+            }
+        return self._frozen
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self._chunks["year"])
+
+def analyze(columns, combinations):
+    """Per-combination out-of-range rates, distributions and anomalous pages"""
+    results = []
+    for index, combination in enumerate(combinations):
+        mask = columns["combination"] == index
+        years = columns["year"][mask]
+        genres = columns["genre"][mask]
+        pages = columns["page"][mask]
+        total = int(mask.sum())
+        has_year = years != MISSING
+
+        out_of_range = np.zeros(total, dtype=bool)
+        year_from, year_to = combination.get("year_from"), combination.get("year_to")
+        if year_from is not None and year_to is not None:
+            out_of_range = has_year & ((years < min(year_from, year_to)) | (years > max(year_from, year_to)))
+
+        wrong_genre = np.zeros(total, dtype=bool)
+        if combination.get("genre"):
+            wrong_genre = (genres != genre_id(combination["genre"])) & (genres != MISSING)
+
+        # Pages whose out-of-range rate is far above this combination's average
+        anomalies = []
+        if total:
+            unique_pages, inverse = np.unique(pages, return_inverse=True)
+            page_totals = np.bincount(inverse)
+            page_rates = np.bincount(inverse, weights=out_of_range) / page_totals
+            spread = page_rates.std()
+            if spread > 0:
+                z_scores = (page_rates - page_rates.mean()) / spread
+                anomalies = [
+                    {"page": int(page), "out_of_range_rate": float(rate), "z_score": float(z)}
+                    for page, rate, z in zip(unique_pages, page_rates, z_scores)
+                    if z >= Config.VALIDATION_ANOMALY_Z
+                ]
+
+        decades, decade_counts = np.unique((years[has_year] // 10) * 10, return_counts=True)
+        genre_values, genre_counts = np.unique(genres, return_counts=True)
+        results.append({
+            "combination": combination,
+            "cards": total,
+            "pages": int(np.unique(pages).size),
+            "missing_year_rate": float((~has_year).mean()) if total else 0.0,
+            "out_of_range": int(out_of_range.sum()),
+            "out_of_range_rate": float(out_of_range.mean()) if total else 0.0,
+            "wrong_genre": int(wrong_genre.sum()),
+            "wrong_genre_rate": float(wrong_genre.mean()) if total else 0.0,
+            "year_min": int(years[has_year].min()) if has_year.any() else None,
+            "year_max": int(years[has_year].max()) if has_year.any() else None,
+            "decades": {str(int(d)): int(c) for d, c in zip(decades, decade_counts)},
+            "genres": {GENRE_NAMES.get(int(g), "unknown"): int(c) for g, c in zip(genre_values, genre_counts)},
+            "anomalous_pages": anomalies
+        })
+    return results
+
+class FilterValidator:
+    """Collects cards across filter combinations and pages, then analyzes them"""
+
+    def __init__(self, discover_page, filter_panel):
+        self.discover_page = discover_page
+        self.filter_panel = filter_panel
+        self.store = CardColumns()
+        self.combinations = []
+        self.logger = Logger.get_logger("pages")
+
+    def collect(self, combinations, pages=None):
+        """Apply each combination ({year_from, year_to, genre}) and read ``pages`` pages of results"""
+        pages = pages or Config.VALIDATION_PAGES
+        for combination in combinations:
+            index = len(self.combinations)
+            self.combinations.append(dict(combination))
+            self._apply(combination)
+
+            for page in range(1, pages + 1):
+                self.store.append(self.discover_page.get_cards(), page, index)
+                if page < pages and not self.discover_page.click_next_page():
+                    break
+
+        self.logger.info(f"Collected {len(self.store)} cards for {len(self.combinations)} filter combinations")
+        return self
+
+    def _apply(self, combination):
+        # Start every combination from a clean first page
+        self.discover_page.driver.get(Config.BASE_URL)
+        self.discover_page.wait_for("page_ready")
+        if combination.get("genre"):
+            self.filter_panel.select_genre(combination["genre"])
+        if combination.get("year_from") is not None:
+            self.filter_panel.set_year_range(combination["year_from"], combination["year_to"])
+        try:
+            self.discover_page.wait_for("settled")
+        except TimeoutException:
+            self.logger.warning(f"Results did not settle after applying {combination}")
+
+    def report(self):
+        """Analysis of everything collected so far"""
+        results = analyze(self.store.columns(), self.combinations)
+        total = len(self.store)
+        out_of_range = sum(result["out_of_range"] for result in results)
+        return {
+            "cards": total,
+            "combinations": results,
+            "out_of_range": out_of_range,
+            "out_of_range_rate": out_of_range / total if total else 0.0
+        }
+
+    def save_report(self, report=None):
+        report = report or self.report()
+        os.makedirs(Config.REPORT_DIR, exist_ok=True)
+        filename = os.path.join(Config.REPORT_DIR, f"filter_validation_{Config.get_timestamp()}.json")
+        with open(filename, "w") as f:
+            json.dump(report, f, indent=4)
+        return filename
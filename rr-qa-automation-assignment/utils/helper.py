@@ -2,20 +2,18 @@
 Helper utilities for test automation
 """
 import json
-import time
 import random
-from datetime import datetime
-from config.config import Config
+from selenium.common.exceptions import TimeoutException
+from utils.wait_engine import WaitEngine
+from utils.screenshot_service import ScreenshotService
 
 def wait_for_page_load(driver, timeout=10):
     """Wait for page to fully load"""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        state = driver.execute_script("return document.readyState")
-        if state == "complete":
-            return True
-        time.sleep(0.5)
-    return False
+    try:
+        WaitEngine(driver).until("document_ready", timeout=timeout)
+        return True
+    except TimeoutException:
+        return False
 
 def generate_test_data():
     """Generate test data for different test scenarios"""
@@ -31,25 +29,7 @@ def generate_test_data():
 
 def take_full_page_screenshot(driver, name):
     """Take screenshot of entire page"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{Config.SCREENSHOT_DIR}/full_{name}_{timestamp}.png"
-    
-    # Store original size
-    original_size = driver.get_window_size()
-    
-    # Get total height of the page
-    total_height = driver.execute_script("return document.body.scrollHeight")
-    
-    # Set window size to capture full page
-    driver.set_window_size(1920, total_height)
-    
-    # Take screenshot
-    driver.save_screenshot(filename)
-    
-    # Restore original size
-    driver.set_window_size(original_size['width'], original_size['height'])
-    
-    return filename
+    return ScreenshotService.get().capture(driver, f"full_{name}", full_page=True)
 
 def extract_movie_info(element):
     """Extract movie information from a movie card element"""
@@ -0,0 +1,378 @@
+"""
+Test impact map for page-object changes
+
+While tests run with RECORD_IMPACT_MAP=1, a profile hook records which
+page-object methods (code in pages/) and which registered locators each test
+touches, as symbols like
+``pages/discover_page.py::DiscoverPage.get_cards``. The map in
+Config.IMPACT_MAP_FILE is updated incrementally: every recording run
+rewrites only the entries of the tests it ran. Recording is opt-in because
+the hook fires on every Python call and would skew test timings.
+
+``--changed-since <git-ref>`` maps the lines changed since that ref to the
+enclosing methods and class attributes with ``ast`` (old and new side of the
+diff, so deleted and renamed members count too) and keeps only the tests
+that touched them. A changed class member also selects the methods and
+tests that reference it by name, which covers plain locator tuples read
+directly from a test. Tests missing from the map, tests in
+changed test files and any change outside pages/ and tests/ (conftest, utils,
+config, requirements) fall back to the safe choice of running them.
+"""
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import pytest
+from config.config import Config
+from utils.logger import Logger
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(PROJECT_DIR, "pages") + os.sep
+
+HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+def relative_path(filename):
+    return os.path.relpath(filename, PROJECT_DIR).replace(os.sep, "/")
+
+class ImpactRecorder:
+    """Page-object symbols touched by the test currently running"""
+
+    active = False
+    _symbols = set()
+    _code_symbols = {}  # code object -> symbol, or None outside pages/
+
+    @classmethod
+    def start_test(cls):
+        cls._symbols = set()
+        cls.active = True
+        sys.setprofile(cls._profile)
+        threading.setprofile(cls._profile)
+
+    @classmethod
+    def stop_test(cls):
+        sys.setprofile(None)
+        threading.setprofile(None)
+        cls.active = False
+        return sorted(cls._symbols)
+
+    @classmethod
+    def _profile(cls, frame, event, arg):
+        if event != "call":
+            return
+        code = frame.f_code
+        try:
+            symbol = cls._code_symbols[code]
+        except KeyError:
+            symbol = cls._code_symbols[code] = cls._symbol_for(code)
+        if symbol is not None:
+            cls._symbols.add(symbol)
+
+    @staticmethod
+    def _symbol_for(code):
+        if not code.co_filename.startswith(PAGES_DIR) or code.co_name == "<module>":
+            return None
+        # Nested functions and lambdas count as their enclosing method
+        qualname = getattr(code, "co_qualname", code.co_name).split(".<locals>")[0]
+        return f"{relative_path(code.co_filename)}::{qualname}"
+
+    @classmethod
+    def locator_used(cls, module_name, name):
+        """Called when a ``Locator`` class attribute is read"""
+        if cls.active:
+            module = sys.modules.get(module_name)
+            if module is not None and getattr(module, "__file__", None):
+                cls._symbols.add(f"{relative_path(module.__file__)}::{name}")
+
+    @classmethod
+    def watch_locators(cls):
+        """Record locator reads, including the ones made directly from tests"""
+        from utils.locator_registry import Locator
+
+        get = Locator.__get__
+        if getattr(get, "_qa_impact", False):
+            return
+
+        def recorded_get(self, instance, owner):
+            cls.locator_used(self.module, self.name)
+            return get(self, instance, owner)
+
+        recorded_get._qa_impact = True
+        Locator.__get__ = recorded_get
+
+def _first_line(node):
+    return min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+
+def _attribute_names(node):
+    return {child.attr for child in ast.walk(node) if isinstance(child, ast.Attribute)}
+
+def symbol_index(source):
+    """[(first line, last line, symbol, attribute names used)] for a page-object module
+
+    Symbols are ``func``, ``Class.member`` and ``Class.*`` for class-level
+    lines that belong to no member (class statement, docstring).
+    """
+    entries = []
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            entries.append((_first_line(node), node.end_lineno, node.name, _attribute_names(node)))
+        elif isinstance(node, ast.ClassDef):
+            entries.append((_first_line(node), node.end_lineno, f"{node.name}.*", set()))
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    names = [member.name]
+                elif isinstance(member, ast.Assign):
+                    names = [target.id for target in member.targets if isinstance(target, ast.Name)]
+                elif isinstance(member, ast.AnnAssign) and isinstance(member.target, ast.Name):
+                    names = [member.target.id]
+                else:
+                    continue
+                for name in names:
+                    entries.append((_first_line(member), member.end_lineno, f"{node.name}.{name}",
+                                    _attribute_names(member)))
+    return entries
+
+def symbols_for_lines(source, lines):
+    """Innermost symbol around each changed line; ``*`` for module-level lines"""
+    entries = symbol_index(source)
+    symbols = set()
+    for line in lines:
+        enclosing = [entry for entry in entries if entry[0] <= line <= entry[1]]
+        if enclosing:
+            symbols.add(min(enclosing, key=lambda entry: entry[1] - entry[0])[2])
+        else:
+            symbols.add("*")
+    return symbols
+
+def git_diff(ref):
+    """{path: {"old_path", "old": lines, "new": lines}} for changes since ``ref``, working tree included"""
+    output = subprocess.run(
+        ["git", "diff", "--relative", "--no-prefix", "--no-color", "--no-ext-diff", "--unified=0", ref],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+
+    files, current, old_path = {}, None, None
+    for line in output.splitlines():
+        if line.startswith("diff --git"):
+            current = None
+        elif line.startswith("--- "):
+            old_path = None if line[4:] == "/dev/null" else line[4:]
+        elif line.startswith("+++ "):
+            new_path = None if line[4:] == "/dev/null" else line[4:]
+            current = files.setdefault(new_path or old_path, {"old_path": old_path, "old": set(), "new": set()})
+        elif current is not None:
+            match = HUNK.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                old_start, new_start = int(old_start), int(new_start)
+                current["old"].update(range(old_start, old_start + int(1 if old_count is None else old_count)))
+                current["new"].update(range(new_start, new_start + int(1 if new_count is None else new_count)))
+    return files
+
+def _old_source(ref, path):
+    result = subprocess.run(["git", "show", f"{ref}:./{path}"], cwd=PROJECT_DIR, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else ""
+
+def _new_source(path):
+    try:
+        with open(os.path.join(PROJECT_DIR, path)) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def changed_symbols(ref):
+    """(changed page-object symbols, changed test files, reason to run everything or None)"""
+    symbols, test_files = set(), set()
+    for path, change in git_diff(ref).items():
+        if path.startswith("tests/") and os.path.basename(path).startswith("test_"):
+            test_files.update(p for p in (path, change["old_path"]) if p)
+        elif path.startswith("pages/") and path.endswith(".py"):
+            for side_path, source, lines in (
+                (change["old_path"], _old_source(ref, change["old_path"]) if change["old_path"] else "", change["old"]),
+                (path, _new_source(path), change["new"])
+            ):
+                if not side_path or not lines:
+                    continue
+                try:
+                    found = symbols_for_lines(source, lines)
+                except SyntaxError:
+                    found = {"*"}
+                symbols.update(f"{side_path}::{symbol}" for symbol in found)
+        elif (path.endswith(".py") and not path.startswith("benchmarks/")) or path == "requirements.txt":
+            return symbols, test_files, f"{path} changed"
+    return symbols, test_files, None
+
+def _page_sources():
+    pages_dir = os.path.join(PROJECT_DIR, "pages")
+    for filename in sorted(os.listdir(pages_dir)):
+        if filename.endswith(".py"):
+            path = f"pages/{filename}"
+            yield path, _new_source(path)
+
+def _test_functions(source):
+    """(test id prefix, attribute names used) for every test function in a test module"""
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef):
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    yield f"{node.name}::{member.name}", _attribute_names(member)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield node.name, _attribute_names(node)
+
+def expand_attributes(symbols):
+    """Add the page-object methods that use a changed class member by name, and the tests that do
+
+    Returns (symbols, test id prefixes).
+    """
+    attributes = {symbol.rsplit(".", 1)[1] for symbol in symbols if "." in symbol.split("::", 1)[1]}
+    attributes.discard("*")
+    if not attributes:
+        return symbols, set()
+
+    expanded = set(symbols)
+    for path, source in _page_sources():
+        try:
+            entries = symbol_index(source)
+        except SyntaxError:
+            continue
+        expanded.update(f"{path}::{symbol}" for _, _, symbol, used in entries if used & attributes)
+
+    tests = set()
+    tests_dir = os.path.join(PROJECT_DIR, "tests")
+    for filename in sorted(os.listdir(tests_dir)):
+        if filename.startswith("test_") and filename.endswith(".py"):
+            path = f"tests/{filename}"
+            try:
+                functions = list(_test_functions(_new_source(path)))
+            except SyntaxError:
+                continue
+            tests.update(f"{path}::{name}" for name, used in functions if used & attributes)
+    return expanded, tests
+
+def matches(recorded, changed):
+    """Whether a recorded symbol is covered by a changed symbol (``*`` and ``Class.*`` are wildcards)"""
+    path, name = recorded.split("::", 1)
+    changed_path, changed_name = changed.split("::", 1)
+    if path != changed_path:
+        return False
+    if changed_name == "*" or changed_name == name:
+        return True
+    return changed_name.endswith(".*") and (name == changed_name[:-2] or name.startswith(changed_name[:-1]))
+
+class ImpactMap:
+    """Recorded symbols per test node id, persisted in Config.IMPACT_MAP_FILE"""
+
+    def __init__(self, path=None):
+        self.path = path or Config.IMPACT_MAP_FILE
+        self.tests = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("tests", {})
+        except (OSError, ValueError):
+            return {}
+
+    def update(self, results):
+        """Replace the entries of the tests that ran; drop tests whose file is gone"""
+        self.tests.update(results)
+        self.tests = {
+            nodeid: symbols for nodeid, symbols in self.tests.items()
+            if os.path.exists(os.path.join(PROJECT_DIR, nodeid.split("::")[0]))
+        }
+
+    def save(self):
+        with open(self.path + ".tmp", "w") as f:
+            json.dump({"tests": self.tests}, f, indent=4, sort_keys=True)
+        os.replace(self.path + ".tmp", self.path)
+
+    def select(self, nodeids, ref):
+        """(selected node ids, explanation) for the changes since ``ref``"""
+        if not self.tests:
+            return list(nodeids), f"no impact map in {self.path} yet, running everything"
+
+        symbols, test_files, run_all = changed_symbols(ref)
+        if run_all:
+            return list(nodeids), f"{run_all}, running everything"
+        symbols, referencing_tests = expand_attributes(symbols)
+
+        selected = []
+        for nodeid in nodeids:
+            base = nodeid.split("[")[0]
+            recorded = self.tests.get(nodeid)
+            if (recorded is None
+                    or nodeid.split("::")[0] in test_files
+                    or base in referencing_tests
+                    or any(matches(symbol, changed) for symbol in recorded for changed in symbols)):
+                selected.append(nodeid)
+        return selected, f"{len(symbols)} page-object symbols changed since {ref}"
+
+class ImpactMapPlugin:
+    """pytest plugin that records the impact map and applies --changed-since"""
+
+    def __init__(self, config):
+        self.config = config
+        self.results = {}
+        self.selection = None
+        self.record = Config.RECORD_IMPACT_MAP
+        if self.record:
+            ImpactRecorder.watch_locators()
+
+    # Runs before the duration scheduler groups the items
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        ref = config.getoption("--changed-since")
+        if not ref:
+            return
+
+        try:
+            selected, reason = ImpactMap().select([item.nodeid for item in items], ref)
+        except (subprocess.CalledProcessError, OSError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            raise pytest.UsageError(f"--changed-since {ref}: {stderr.strip() or e}")
+
+        keep = set(selected)
+        deselected = [item for item in items if item.nodeid not in keep]
+        items[:] = [item for item in items if item.nodeid in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        self.selection = (len(items), len(items) + len(deselected), reason)
+        Logger.get_logger().info(f"Impact selection: {len(items)}/{self.selection[1]} tests ({reason})")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        if self.record:
+            ImpactRecorder.start_test()
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        rep = outcome.get_result()
+        if rep.when == "teardown" and ImpactRecorder.active:
+            # user_properties travel from xdist workers to the controller
+            rep.user_properties.append(("impact_symbols", ImpactRecorder.stop_test()))
+
+    def pytest_runtest_logreport(self, report):
+        if hasattr(self.config, "workerinput") or report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            # Skipped tests touch nothing, so they would look unaffected by every change
+            if key == "impact_symbols" and value:
+                self.results[report.nodeid.split("@")[0]] = value
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.results:
+            return
+        impact_map = ImpactMap()
+        impact_map.update(self.results)
+        impact_map.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.selection is None:
+            return
+        selected, total, reason = self.selection
+        terminalreporter.write_sep("-", "impact selection")
+        terminalreporter.write_line(f"{selected} of {total} tests selected: {reason}")
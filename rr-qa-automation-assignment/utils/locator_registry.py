@@ -0,0 +1,207 @@
+"""
+Locator registry with calibrated candidate selectors
+
+Page objects declare each logical element as a ``Locator`` with one or more
+candidate selectors; the first candidate is the proven default. A
+calibration run (``python -m utils.locator_registry calibrate``, or
+CALIBRATE_LOCATORS=1 during a test run) times every candidate against the
+live DOM and keeps the fastest one that finds the same node(s) as the
+default, preferring an ID over CSS over XPath when they are about as fast.
+The choices are cached in Config.LOCATOR_CACHE_FILE and picked up by later
+runs. Single-element locators that match more than one node are reported.
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from selenium.webdriver.common.by import By
+from config.config import Config
+from utils.logger import Logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, a concurrent calibration may lose entries
+    fcntl = None
+
+# Lower is preferred when candidates are about equally fast
+STRATEGY_PREFERENCE = {By.ID: 0, By.CSS_SELECTOR: 1, By.CLASS_NAME: 1, By.XPATH: 2}
+
+class Locator:
+    """Page-object class attribute that resolves to the registry's choice
+
+    Reading the attribute yields a plain ``(By, value)`` tuple, so it works
+    anywhere a Selenium locator does.
+    """
+
+    def __init__(self, *candidates, multiple=False):
+        self.candidates = [tuple(candidate) for candidate in candidates]
+        self.multiple = multiple
+        self.name = None
+        self.module = None
+
+    def __set_name__(self, owner, name):
+        self.name = f"{owner.__name__}.{name}"
+        self.module = owner.__module__
+        LocatorRegistry.register(self.name, self.candidates, self.multiple)
+
+    def __get__(self, instance, owner):
+        return LocatorRegistry.resolve(self.name)
+
+class LocatorRegistry:
+    """Candidate selectors per logical element and the calibrated choice for each"""
+
+    _entries = {}
+    _cache = None
+    _attempted = set()  # Names calibrated (or found absent) by this process
+
+    @classmethod
+    def register(cls, name, candidates, multiple=False):
+        cls._entries[name] = {"candidates": candidates, "multiple": multiple}
+
+    @classmethod
+    def candidates(cls, name):
+        return list(cls._entries[name]["candidates"])
+
+    @classmethod
+    def resolve(cls, name):
+        """The cached choice if it is still a registered candidate, else the default"""
+        candidates = cls._entries[name]["candidates"]
+        chosen = cls._load_cache().get(name)
+        if chosen and tuple(chosen["locator"]) in candidates:
+            return tuple(chosen["locator"])
+        return candidates[0]
+
+    @classmethod
+    def calibrate_pending(cls, driver):
+        """Calibrate, once per process, the locators that have no cached choice yet"""
+        cache = cls._load_cache()
+        pending = [name for name in cls._entries if name not in cache and name not in cls._attempted]
+        if pending:
+            cls.calibrate(driver, pending)
+
+    @classmethod
+    def calibrate(cls, driver, names=None, iterations=None):
+        """Time every candidate on the current page and cache the best one per element"""
+        logger = Logger.get_logger("pages")
+        iterations = iterations or Config.LOCATOR_CALIBRATION_ITERATIONS
+        cache = cls._load_cache()
+
+        # Absent candidates must fail fast instead of waiting for the implicit wait
+        driver.implicitly_wait(0)
+        try:
+            for name in names or list(cls._entries):
+                entry = cls._entries[name]
+                cls._attempted.add(name)
+                result = cls._calibrate_one(driver, name, entry, iterations, logger)
+                if result:
+                    cache[name] = result
+        finally:
+            driver.implicitly_wait(Config.implicit_wait())
+
+        return cls._save_cache(cache)
+
+    @classmethod
+    def _calibrate_one(cls, driver, name, entry, iterations, logger):
+        default = entry["candidates"][0]
+        reference = [element.id for element in driver.find_elements(*default)]
+        if not reference:
+            logger.info(f"Locator {name} not present on this page, skipping calibration")
+            return None
+
+        if not entry["multiple"]:
+            if len(reference) > 1:
+                logger.warning(f"Locator {name} {default} matches {len(reference)} nodes; find_element uses the first")
+            reference = reference[:1]
+
+        timings = {}
+        for candidate in entry["candidates"]:
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                found = driver.find_elements(*candidate)
+                samples.append(time.perf_counter() - start)
+            found = [element.id for element in found]
+
+            if found != reference:
+                if not entry["multiple"] and len(found) > 1 and found[0] == reference[0]:
+                    logger.warning(f"Locator {name} candidate {candidate} matches {len(found)} nodes")
+                else:
+                    logger.info(f"Locator {name} candidate {candidate} finds different nodes, rejected")
+                continue
+            timings[candidate] = statistics.median(samples)
+
+        if not timings:
+            return None
+
+        # Near-ties go to the cheaper strategy: ID, then CSS, then XPath
+        fastest = min(timings.values())
+        eligible = [c for c, seconds in timings.items() if seconds <= fastest * (1 + Config.LOCATOR_TIE_MARGIN)]
+        chosen = min(eligible, key=lambda c: (STRATEGY_PREFERENCE.get(c[0], 3), timings[c]))
+
+        logger.info(f"Locator {name}: using {chosen} ({timings[chosen] * 1000:.1f} ms)")
+        return {
+            "locator": list(chosen),
+            "timings_ms": {f"{by}={value}": seconds * 1000 for (by, value), seconds in timings.items()}
+        }
+
+    @classmethod
+    def _load_cache(cls):
+        if cls._cache is None:
+            try:
+                with open(Config.LOCATOR_CACHE_FILE) as f:
+                    cls._cache = json.load(f)
+            except (OSError, ValueError):
+                cls._cache = {}
+        return cls._cache
+
+    @classmethod
+    def _save_cache(cls, cache):
+        """Merge ``cache`` into the file under a lock; xdist workers may calibrate at the same time"""
+        path = os.path.abspath(Config.LOCATOR_CACHE_FILE)
+        with open(path + ".lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with open(path) as f:
+                    merged = json.load(f)
+            except (OSError, ValueError):
+                merged = {}
+            merged.update(cache)
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".locator_cache.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(merged, f, indent=4, sort_keys=True)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        cls._cache = merged
+        return merged
+
+def calibrate_site():
+    """Load the site once and calibrate every registered locator found on it"""
+    # Imported here so the page objects register their locators first
+    from pages.discover_page import DiscoverPage
+    from pages.filter_panel import FilterPanel  # noqa: F401
+    from utils.driver_factory import create_driver
+
+    driver = create_driver()
+    try:
+        driver.get(Config.BASE_URL)
+        DiscoverPage(driver).wait_for("page_ready")
+        cache = LocatorRegistry.calibrate(driver)
+    finally:
+        driver.quit()
+
+    print(f"✅ Calibrated {len(cache)} locators into {Config.LOCATOR_CACHE_FILE}")
+    return cache
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "calibrate":
+        calibrate_site()
+    else:
+        print("Usage: python -m utils.locator_registry calibrate")
+        sys.exit(1)
@@ -1,29 +1,181 @@
+import atexit
+import copy
+import glob
+import heapq
+import json
 import logging
+import os
+import queue
+import re
 import sys
+import tempfile
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from config.config import Config
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": Logger.worker_id(),
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry)
+
+class FormattedQueueHandler(QueueHandler):
+    """QueueHandler that hands the listener the traceback as text
+
+    QueueHandler.prepare merges the traceback into the message and drops
+    exc_info, so formatters on the listener could not tell them apart. Here
+    the message is only interpolated and the traceback travels in exc_text.
+    """
+    _traceback_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._traceback_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
 
 class Logger:
+    """Singleton logger whose handlers run on a background queue listener
+
+    Callers only enqueue records; console and file I/O happen on the
+    listener thread. Under xdist each worker writes its own file, and
+    merge_worker_logs() folds them into the run's log in time order.
+    """
+    ROOT = "QA_Automation"
+
     _logger = None
-    
+    _listener = None
+
+    # Text records start with the asctime; anything else continues the previous record
+    _RECORD_START = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ")
+
     @staticmethod
-    def get_logger(name="QA_Automation"):
+    def get_logger(name=ROOT):
         if Logger._logger is None:
-            Logger._logger = logging.getLogger(name)
-            Logger._logger.setLevel(logging.INFO)
-            
-            # Create handlers
-            console_handler = logging.StreamHandler(sys.stdout)
-            file_handler = logging.FileHandler(f'logs/test_run_{datetime.now().strftime("%Y%m%d")}.log')
-            
-            # Create formatters
+            Logger._setup()
+
+        if name == Logger.ROOT:
+            return Logger._logger
+
+        # Subsystem loggers propagate into the queue; only their level differs
+        subsystem = logging.getLogger(f"{Logger.ROOT}.{name}")
+        subsystem.setLevel(Config.LOG_LEVELS.get(name, Config.LOG_LEVEL))
+        return subsystem
+
+    @staticmethod
+    def worker_id():
+        return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+    @staticmethod
+    def log_file(worker=None):
+        date = datetime.now().strftime("%Y%m%d")
+        worker = worker or os.environ.get("PYTEST_XDIST_WORKER")
+        suffix = f"_{worker}" if worker else ""
+        extension = "jsonl" if Config.LOG_FORMAT == "json" else "log"
+        return os.path.join(Config.LOG_DIR, f"test_run_{date}{suffix}.{extension}")
+
+    @staticmethod
+    def _setup():
+        Logger._logger = logging.getLogger(Logger.ROOT)
+        Logger._logger.setLevel(Config.LOG_LEVEL)
+        os.makedirs(Config.LOG_DIR, exist_ok=True)
+
+        # Create handlers
+        console_handler = logging.StreamHandler(sys.stdout)
+        file_handler = logging.FileHandler(Logger.log_file())
+
+        # Create formatters
+        if Config.LOG_FORMAT == "json":
+            formatter = JsonFormatter()
+        else:
             formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            
-            # Set formatters
-            console_handler.setFormatter(formatter)
-            file_handler.setFormatter(formatter)
-            
-            # Add handlers
-            Logger._logger.addHandler(console_handler)
-            Logger._logger.addHandler(file_handler)
-        
-        return Logger._logger
\ No newline at end of file
+
+        # Set formatters
+        console_handler.setFormatter(formatter)
+        file_handler.setFormatter(formatter)
+
+        # Only the queue handler runs on the caller's thread
+        log_queue = queue.SimpleQueue()
+        Logger._logger.addHandler(FormattedQueueHandler(log_queue))
+        Logger._listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        Logger._listener.start()
+        atexit.register(Logger.shutdown)
+
+    @staticmethod
+    def shutdown():
+        """Drain the queue and close the handlers; the next get_logger() sets them up again"""
+        if Logger._listener is not None:
+            Logger._listener.stop()
+            for handler in Logger._listener.handlers:
+                handler.close()
+            Logger._listener = None
+        if Logger._logger is not None:
+            for handler in list(Logger._logger.handlers):
+                Logger._logger.removeHandler(handler)
+            Logger._logger = None
+
+    @staticmethod
+    def merge_worker_logs():
+        """Merge per-worker log files and the run's own records into the run's log, ordered by timestamp
+
+        Stops this process's listener first so the run's log is complete and
+        no longer written while it is replaced.
+        """
+        main_file = Logger.log_file(worker="")
+        base, extension = os.path.splitext(main_file)
+        worker_files = sorted(glob.glob(f"{base}_gw*{extension}"))
+        if not worker_files:
+            return None
+
+        Logger.shutdown()
+        sources = ([main_file] if os.path.exists(main_file) else []) + worker_files
+        streams = [Logger._records(path) for path in sources]
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(main_file), prefix=".test_run.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as out:
+                for _, record in heapq.merge(*streams, key=lambda item: item[0]):
+                    out.write(record)
+            os.replace(tmp_path, main_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        for path in worker_files:
+            os.remove(path)
+        return main_file
+
+    @staticmethod
+    def _records(path):
+        """Yield (timestamp, full record text) pairs from one log file"""
+        timestamp, lines = "", []  # Lines before the first record sort first
+        with open(path) as f:
+            for line in f:
+                if Config.LOG_FORMAT == "json":
+                    try:
+                        yield json.loads(line)["time"], line
+                    except (ValueError, KeyError):
+                        continue
+                elif Logger._RECORD_START.match(line):
+                    if lines:
+                        yield timestamp, "".join(lines)
+                    # Match the ISO format JSON records use so both sort the same way
+                    timestamp, lines = line[:23].replace(" ", "T").replace(",", "."), [line]
+                else:
+                    lines.append(line)
+        if lines:
+            yield timestamp, "".join(lines)
@@ -0,0 +1,32 @@
+"""
+CDP network profiles: resource blocking and throttling per test
+"""
+from config.config import Config
+from utils.logger import Logger
+
+def apply_network_profile(driver, name=None):
+    """Apply a profile from Config.NETWORK_PROFILES to the current tab"""
+    name = name or Config.DEFAULT_NETWORK_PROFILE
+    if name not in Config.NETWORK_PROFILES:
+        raise ValueError(f"Unknown network profile: {name}")
+    profile = Config.NETWORK_PROFILES[name]
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": profile.get("blocked_urls", [])})
+
+        throttle = profile.get("throttle")
+        if throttle:
+            driver.execute_cdp_cmd('Network.emulateNetworkConditions', {
+                "offline": False,
+                "latency": throttle["latency_ms"],
+                "downloadThroughput": throttle["download_kbps"] * 1024 / 8,
+                "uploadThroughput": throttle["upload_kbps"] * 1024 / 8
+            })
+    except AttributeError:
+        # Non-Chromium drivers cannot block or throttle; run unshaped
+        Logger.get_logger("driver").warning(f"Network profile '{name}' needs a Chromium driver, ignoring")
+        return None
+
+    Logger.get_logger("driver").info(f"Applied network profile: {name}")
+    return name
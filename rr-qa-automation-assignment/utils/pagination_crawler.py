@@ -0,0 +1,227 @@
+"""
+Parallel crawl of every page of Discover results
+
+The page range is split into disjoint slices, one per worker. Each worker
+drives its own browser (or, with DRIVER_BACKEND=contexts, its own isolated
+context of one shared browser): it jumps to the start of its slice through the
+visible pagination links, then walks the slice with Next, extracting all
+cards of a page in one round trip. Records are streamed to a JSONL file as
+pages are read, and the summary (duplicates across pages, empty pages and
+where pagination broke) is built from that file. Every worker stops at the
+shared deadline, so the crawl finishes within the time budget.
+
+    python -m utils.pagination_crawler [workers] [max_pages]
+"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config.config import Config
+from utils.logger import Logger
+
+class CrawlStream:
+    """Thread-safe JSONL writer shared by the crawl workers"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records):
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def split_range(first, last, workers):
+    """Disjoint, contiguous page slices of nearly equal size"""
+    total = last - first + 1
+    workers = max(1, min(workers, total))
+    size, extra = divmod(total, workers)
+    slices, start = [], first
+    for index in range(workers):
+        end = start + size - 1 + (1 if index < extra else 0)
+        slices.append((start, end))
+        start = end + 1
+    return slices
+
+class PaginationCrawler:
+    """Crawls pages ``1..last`` with ``workers`` browsers in parallel"""
+
+    def __init__(self, workers=None, max_pages=None, time_budget=None, driver_factory=None):
+        self.workers = workers or Config.CRAWL_WORKERS
+        self.max_pages = max_pages or Config.CRAWL_MAX_PAGES
+        self.time_budget = time_budget or Config.CRAWL_TIME_BUDGET
+        self.driver_factory = driver_factory
+        self.deadline = None
+        self.logger = Logger.get_logger("pages")
+        self.stream_path = os.path.join(Config.REPORT_DIR, f"crawl_{Config.get_timestamp()}.jsonl")
+
+    def run(self):
+        """Crawl, then return the summary built from the streamed records"""
+        start = time.perf_counter()
+        self.deadline = time.monotonic() + self.time_budget
+        stream = CrawlStream(self.stream_path)
+
+        # With the contexts backend every worker is a context of one shared browser
+        contexts = None
+        if self.driver_factory is None and Config.DRIVER_BACKEND == "contexts":
+            from utils.browser_contexts import BrowserContextPool
+            contexts = BrowserContextPool()
+            self.driver_factory = contexts.acquire
+
+        try:
+            last_page = self._discover_last_page()
+            if self.max_pages:
+                last_page = min(last_page, self.max_pages)
+            slices = split_range(1, last_page, self.workers)
+            self.logger.info(f"Crawling pages 1-{last_page} with {len(slices)} workers")
+
+            with ThreadPoolExecutor(max_workers=len(slices), thread_name_prefix="crawl") as executor:
+                outcomes = list(executor.map(lambda s: self._crawl_slice(s[0], s[1], stream), slices))
+        finally:
+            stream.close()
+            if contexts is not None:
+                contexts.close_all()
+                self.driver_factory = None
+
+        summary = self.summarize(last_page, outcomes)
+        summary["elapsed_seconds"] = time.perf_counter() - start
+        summary_path = os.path.splitext(self.stream_path)[0] + "_summary.json"
+        with open(summary_path, "w") as f:
+            json.dump(summary, f, indent=4)
+        summary["summary_file"] = summary_path
+        return summary
+
+    def _open_page(self):
+        # Imported here so the summary helpers work without a browser stack
+        from pages.discover_page import DiscoverPage
+        from utils.driver_factory import create_driver
+        from utils.network_profiles import apply_network_profile
+
+        driver = (self.driver_factory or create_driver)()
+        apply_network_profile(driver, "functional")
+        driver.get(Config.BASE_URL)
+        page = DiscoverPage(driver)
+        page.wait_for("page_ready")
+        return driver, page
+
+    def _discover_last_page(self):
+        driver, page = self._open_page()
+        try:
+            pages = page.get_available_pages()
+            return max(pages) if pages else 1
+        finally:
+            driver.quit()
+
+    def _goto(self, page, target):
+        """Jump towards ``target`` through the visible page links; returns the page reached"""
+        current = page.get_current_page_number()
+        while current != target and time.monotonic() < self.deadline:
+            visible = page.get_available_pages()
+            if not visible:
+                break
+            closest = min(visible, key=lambda number: abs(number - target))
+            if abs(closest - target) >= abs(current - target) or not page.go_to_page(closest):
+                break  # No visible link gets closer
+            current = page.get_current_page_number()
+        return current
+
+    def _crawl_slice(self, first, last, stream):
+        outcome = {"slice": [first, last], "pages_read": 0, "break_page": None, "stopped_by_budget": False}
+        try:
+            driver, page = self._open_page()
+        except Exception as e:
+            outcome["error"] = f"Could not start browser: {e}"
+            return outcome
+
+        try:
+            current = self._goto(page, first)
+            if current != first and time.monotonic() >= self.deadline:
+                outcome["stopped_by_budget"] = True
+                return outcome
+            if current != first:
+                outcome["break_page"] = first
+                outcome["error"] = f"Could not reach page {first}, stuck at page {current}"
+                return outcome
+
+            while True:
+                cards = page.get_cards()
+                stream.write([{
+                    "page": current,
+                    "position": index,
+                    "title": card["title"],
+                    "details": card["details"],
+                    "poster": card["poster"]
+                } for index, card in enumerate(cards)] or [{"page": current, "position": None}])
+                outcome["pages_read"] += 1
+
+                if current >= last:
+                    break
+                if time.monotonic() >= self.deadline:
+                    outcome["stopped_by_budget"] = True
+                    break
+
+                page.click_next_page()
+                reached = page.get_current_page_number()
+                if reached != current + 1:
+                    outcome["break_page"] = current + 1
+                    outcome["error"] = f"Next from page {current} led to page {reached}"
+                    break
+                current = reached
+        except Exception as e:
+            outcome["error"] = str(e)
+        finally:
+            driver.quit()
+
+        return outcome
+
+    def read_stream(self):
+        with open(self.stream_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def summarize(self, last_page, outcomes):
+        """Duplicates, empty pages, unread pages and pagination breaks from the stream"""
+        seen = {}
+        pages = {}
+        for record in self.read_stream():
+            pages.setdefault(record["page"], 0)
+            if record["position"] is None:
+                continue
+            pages[record["page"]] += 1
+            key = f"{record['title']}|{record['details']}|{record['poster']}"
+            seen.setdefault(key, set()).add(record["page"])
+
+        duplicates = {key: sorted(found) for key, found in seen.items() if len(found) > 1}
+        breaks = sorted(outcome["break_page"] for outcome in outcomes if outcome["break_page"])
+        return {
+            "results_stream": self.stream_path,
+            "last_page": last_page,
+            "pages_read": len(pages),
+            "cards_read": sum(pages.values()),
+            "empty_pages": sorted(number for number, count in pages.items() if count == 0),
+            "unread_pages": [number for number in range(1, last_page + 1) if number not in pages],
+            "duplicates": duplicates,
+            "break_page": breaks[0] if breaks else None,
+            "budget_exhausted": any(outcome["stopped_by_budget"] for outcome in outcomes),
+            "workers": outcomes
+        }
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    max_pages = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    result = PaginationCrawler(workers=workers, max_pages=max_pages).run()
+    print(f"✅ Read {result['pages_read']}/{result['last_page']} pages in {result['elapsed_seconds']:.0f}s")
+    print(f"Empty pages: {len(result['empty_pages'])}, duplicated movies: {len(result['duplicates'])}, "
+          f"pagination break: {result['break_page']}")
+    print(f"📊 Summary: {result['summary_file']}")
@@ -0,0 +1,148 @@
+"""
+Per-test phase timing
+
+Splits every test's wall-clock time into phases: driver checkout, initial
+navigation, waits, page-object WebDriver commands and the remaining test
+body. Only the repo's own page-object and wait methods are instrumented;
+library code (including time.sleep) is left alone and counts toward the
+phase it runs in. Nested phases are timed exclusively (a wait inside the setup
+fixture counts as "wait", not "navigation"), so the phases of a test add
+up to its duration. The timings are attached to each test's report and
+ranked by TestReport.slowest_tests.
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+import pytest
+
+# Fixtures whose setup time is attributed to a named phase
+FIXTURE_PHASES = {
+    "driver": "driver",
+    "setup": "navigation"
+}
+
+class PhaseTimer:
+    """Exclusive per-phase time accounting for the test currently running"""
+
+    stage = None  # pytest stage: setup, call or teardown
+    _stack = []
+    _totals = {}
+    _instrumented = {}
+
+    @classmethod
+    def start_test(cls):
+        cls._stack, cls._totals, cls._instrumented = [], {}, {}
+
+    @classmethod
+    def instrumented_time(cls, stage):
+        return cls._instrumented.get(stage, 0.0)
+
+    @classmethod
+    def totals(cls):
+        return dict(cls._totals)
+
+    @classmethod
+    def record(cls, name, seconds):
+        """Add uninstrumented time to a phase"""
+        cls._totals[name] = cls._totals.get(name, 0.0) + seconds
+
+    @classmethod
+    def _credit(cls, name, seconds):
+        cls._totals[name] = cls._totals.get(name, 0.0) + seconds
+        cls._instrumented[cls.stage] = cls._instrumented.get(cls.stage, 0.0) + seconds
+
+    @classmethod
+    @contextmanager
+    def phase(cls, name):
+        # Background threads (screenshots, replay server) are not part of the test's time
+        if cls.stage is None or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+
+        now = time.perf_counter()
+        if cls._stack:
+            parent = cls._stack[-1]
+            cls._credit(parent[0], now - parent[1])
+        cls._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            frame = cls._stack.pop()
+            cls._credit(frame[0], now - frame[1])
+            if cls._stack:
+                cls._stack[-1][1] = now
+
+def timed(name, func):
+    """Wrap ``func`` so its execution time is credited to phase ``name``"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with PhaseTimer.phase(name):
+            return func(*args, **kwargs)
+    wrapper.__phase_timed__ = True
+    return wrapper
+
+def instrument(cls, method_names, name):
+    for method_name in method_names:
+        method = cls.__dict__.get(method_name)
+        if method is not None and not getattr(method, "__phase_timed__", False):
+            setattr(cls, method_name, timed(name, method))
+
+class PhaseTimingPlugin:
+    """pytest plugin that times the phases of each test and attaches them to its report"""
+
+    def __init__(self, config):
+        self.config = config
+        self._instrument()
+
+    @staticmethod
+    def _instrument():
+        from pages.base_page import BasePage
+        from pages.discover_page import DiscoverPage
+        from utils.wait_engine import WaitEngine
+
+        instrument(BasePage, ["find_element", "find_elements", "click", "send_keys",
+                              "get_text", "is_displayed", "take_screenshot"], "webdriver")
+        instrument(DiscoverPage, ["get_cards"], "webdriver")
+        instrument(WaitEngine, ["until"], "wait")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        PhaseTimer.start_test()
+        PhaseTimer.stage = "setup"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        PhaseTimer.stage = "call"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        PhaseTimer.stage = "teardown"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        name = FIXTURE_PHASES.get(fixturedef.argname)
+        if name is None:
+            yield
+            return
+        with PhaseTimer.phase(name):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        rep = outcome.get_result()
+
+        # Whatever the instrumentation did not explain is setup overhead, test body or teardown
+        remainder = max(0.0, rep.duration - PhaseTimer.instrumented_time(rep.when))
+        label = {"setup": "setup_other", "call": "test_body", "teardown": "teardown"}[rep.when]
+        PhaseTimer.record(label, remainder)
+
+        if rep.when == "teardown":
+            PhaseTimer.stage = None
+            # user_properties travel from xdist workers to the controller
+            rep.user_properties.append(("phase_timings", PhaseTimer.totals()))
@@ -1,32 +1,60 @@
 """
 Report generation utilities
 """
+import heapq
 import json
 import os
 from datetime import datetime
 from config.config import Config
 
+try:
+    import fcntl
+except ImportError:  # Windows: O_APPEND writes alone keep lines intact
+    fcntl = None
+
 class TestReport:
-    """Test report generator"""
+    """Test report generator
+    
+    With ``stream_path`` every result is appended to a JSONL file as soon as
+    it is added and only counters plus failure references stay in memory.
+    Several processes (e.g. xdist workers) may append to the same stream;
+    finalize() builds the summary from the file.
+    """
     
-    def __init__(self, test_suite_name="QA Automation Test Suite"):
+    def __init__(self, test_suite_name="QA Automation Test Suite", stream_path=None):
         self.suite_name = test_suite_name
         self.start_time = datetime.now()
+        self.stream_path = stream_path
         self.tests = []
         self.failed_tests = []
         self.passed_tests = []
         self.skipped_tests = []
+        self.counts = {"PASSED": 0, "FAILED": 0, "SKIPPED": 0}
+        self.failure_refs = []
+        self.slowest = []  # Min-heap of (duration, name, phases), at most SLOW_TEST_COUNT long
         
-    def add_test_result(self, test_name, status, error_message=None, screenshot=None):
+    def add_test_result(self, test_name, status, error_message=None, screenshot=None, duration=None, phases=None):
         """Add test result to report"""
         test_result = {
             "name": test_name,
             "status": status,
             "timestamp": datetime.now().isoformat(),
             "error": error_message,
-            "screenshot": screenshot
+            "screenshot": screenshot,
+            "duration": duration,
+            "phases": phases
         }
         
+        if duration is not None:
+            self._track_slow(test_name, duration, phases)
+        
+        if self.stream_path:
+            offset = self._append(test_result)
+            self.counts[status] = self.counts.get(status, 0) + 1
+            if status == "FAILED":
+                self.failure_refs.append({"name": test_name, "offset": offset})
+            return
+        
         self.tests.append(test_result)
         
         if status == "PASSED":
@@ -36,30 +64,125 @@ class TestReport:
         elif status == "SKIPPED":
             self.skipped_tests.append(test_result)
     
-    def generate_summary(self):
-        """Generate test summary"""
-        total = len(self.tests)
-        passed = len(self.passed_tests)
-        failed = len(self.failed_tests)
-        skipped = len(self.skipped_tests)
+    def _append(self, test_result):
+        """Append one JSONL record in a single write; returns its byte offset"""
+        line = (json.dumps(test_result) + "\n").encode("utf-8")
+        os.makedirs(os.path.dirname(self.stream_path) or ".", exist_ok=True)
         
-        summary = {
+        fd = os.open(self.stream_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, line)
+            return os.lseek(fd, 0, os.SEEK_CUR) - len(line)
+        finally:
+            os.close(fd)  # Also releases the lock
+    
+    def _track_slow(self, test_name, duration, phases):
+        entry = (duration, test_name, phases or {})
+        if len(self.slowest) < Config.SLOW_TEST_COUNT:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+    
+    def slowest_tests(self):
+        """Slowest tests first, with their phase breakdown
+        
+        When streaming, the stream is re-read so tests recorded by other
+        processes are ranked too.
+        """
+        if self.stream_path:
+            self.slowest = []
+            for record in self.read_stream():
+                if record.get("duration") is not None:
+                    self._track_slow(record["name"], record["duration"], record.get("phases"))
+        
+        return [
+            {"name": name, "duration": duration, "phases": phases}
+            for duration, name, phases in sorted(self.slowest, key=lambda entry: entry[0], reverse=True)
+        ]
+    
+    def read_stream(self):
+        """Iterate over the records in the stream, skipping a torn last line"""
+        if not self.stream_path or not os.path.exists(self.stream_path):
+            return
+        with open(self.stream_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    
+    def _summary(self, total, passed, failed, skipped, failed_names, start_time, end_time):
+        return {
             "test_suite": self.suite_name,
-            "start_time": self.start_time.isoformat(),
-            "end_time": datetime.now().isoformat(),
-            "duration": str(datetime.now() - self.start_time),
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "duration": str(end_time - start_time),
             "total_tests": total,
             "passed": passed,
             "failed": failed,
             "skipped": skipped,
             "pass_rate": (passed / total * 100) if total > 0 else 0,
-            "failed_tests": [test["name"] for test in self.failed_tests]
+            "failed_tests": failed_names
         }
+    
+    def generate_summary(self):
+        """Generate test summary"""
+        if self.stream_path:
+            return self._stream_summary()
+        
+        return self._summary(
+            len(self.tests),
+            len(self.passed_tests),
+            len(self.failed_tests),
+            len(self.skipped_tests),
+            [test["name"] for test in self.failed_tests],
+            self.start_time,
+            datetime.now()
+        )
+    
+    def _stream_summary(self):
+        """Summary built from the whole stream, including other writers' results"""
+        counts = {"PASSED": 0, "FAILED": 0, "SKIPPED": 0}
+        failed_names = []
+        first = last = None
+        
+        for record in self.read_stream():
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            if record["status"] == "FAILED":
+                failed_names.append(record["name"])
+            timestamp = datetime.fromisoformat(record["timestamp"])
+            first = timestamp if first is None else min(first, timestamp)
+            last = timestamp if last is None else max(last, timestamp)
         
+        summary = self._summary(
+            sum(counts.values()),
+            counts["PASSED"],
+            counts["FAILED"],
+            counts["SKIPPED"],
+            failed_names,
+            min(first, self.start_time) if first else self.start_time,
+            last or datetime.now()
+        )
+        summary["results_stream"] = self.stream_path
         return summary
     
+    def finalize(self):
+        """Build the summary from the whole stream (all writers) and save it next to it"""
+        summary = self._stream_summary()
+        filename = os.path.splitext(self.stream_path)[0] + "_summary.json"
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename, 'w') as f:
+            json.dump(summary, f, indent=4)
+        
+        return filename
+    
     def generate_json_report(self):
         """Generate JSON report"""
+        if self.stream_path:
+            return self.finalize()
+        
         report = {
             "summary": self.generate_summary(),
             "test_details": self.tests
@@ -99,4 +222,15 @@ class TestReport:
             for test in summary['failed_tests']:
                 print(f"  - {test}")
         
+        slowest = self.slowest_tests()
+        if slowest:
+            print("\n" + "-" * 60)
+            print("SLOWEST TESTS:")
+            for rank, test in enumerate(slowest, 1):
+                print(f"  {rank:>2}. {test['duration']:7.2f}s  {test['name']}")
+                breakdown = sorted(test['phases'].items(), key=lambda item: item[1], reverse=True)
+                phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in breakdown if seconds >= 0.01)
+                if phases:
+                    print(f"      {phases}")
+        
         print("=" * 60)
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Asynchronous screenshot capture
+
+The browser encodes the image (PNG, JPEG or WebP) through CDP
+``Page.captureScreenshot``; decoding, hashing and writing to disk happen on
+a background thread pool so the calling test only pays for the capture.
+Identical images are hard-linked instead of written twice, and once this
+process has written more than the configured limit the oldest of its own
+screenshots are pruned. Other files in the directory (visual diff images,
+screenshots of earlier runs) are left alone.
+"""
+import base64
+import hashlib
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.config import Config
+from utils.logger import Logger
+
+class ScreenshotService:
+    _instance = None
+
+    @staticmethod
+    def get():
+        if ScreenshotService._instance is None:
+            ScreenshotService._instance = ScreenshotService()
+        return ScreenshotService._instance
+
+    def __init__(self):
+        self.logger = Logger.get_logger("screenshots")
+        self._executor = ThreadPoolExecutor(max_workers=Config.SCREENSHOT_WORKERS, thread_name_prefix="screenshot")
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._written = []  # Files this service wrote or linked, oldest first
+
+    def capture(self, driver, name, full_page=False):
+        """Grab a screenshot now and queue it for writing; returns the target filename"""
+        image_format = Config.SCREENSHOT_FORMAT
+        params = {"format": image_format}
+        if image_format != "png":
+            params["quality"] = Config.SCREENSHOT_QUALITY
+
+        try:
+            if full_page:
+                # Capture beyond the viewport instead of resizing the window
+                metrics = driver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+                content = metrics.get("cssContentSize") or metrics["contentSize"]
+                params["clip"] = {"x": 0, "y": 0, "width": content["width"], "height": content["height"], "scale": 1}
+                params["captureBeyondViewport"] = True
+            data = driver.execute_cdp_cmd('Page.captureScreenshot', params)["data"]
+        except AttributeError:
+            # Non-Chromium drivers only offer a viewport PNG
+            image_format = "png"
+            data = driver.get_screenshot_as_base64()
+
+        extension = "jpg" if image_format == "jpeg" else image_format
+        filename = os.path.join(Config.SCREENSHOT_DIR, f"{name}_{Config.get_timestamp()}.{extension}")
+        self._executor.submit(self._write, data, filename)
+        return filename
+
+    def flush(self):
+        """Wait for every queued screenshot to reach the disk"""
+        self._executor.shutdown(wait=True)
+        self._executor = ThreadPoolExecutor(max_workers=Config.SCREENSHOT_WORKERS, thread_name_prefix="screenshot")
+
+    def _write(self, data, filename):
+        try:
+            raw = base64.b64decode(data)
+            digest = hashlib.sha1(raw).hexdigest()
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+            with self._lock:
+                existing = self._hashes.get(digest)
+                if existing and os.path.exists(existing):
+                    self._link(existing, filename)
+                else:
+                    with open(filename, "wb") as f:
+                        f.write(raw)
+                    self._hashes[digest] = filename
+                if filename in self._written:
+                    self._written.remove(filename)
+                self._written.append(filename)
+                self._prune()
+
+            self.logger.info(f"Screenshot saved: {filename}")
+        except Exception as e:
+            self.logger.warning(f"Failed to save screenshot {filename}: {e}")
+
+    @staticmethod
+    def _link(existing, filename):
+        if os.path.abspath(existing) == os.path.abspath(filename):
+            return
+        try:
+            if os.path.exists(filename):
+                os.remove(filename)
+            os.link(existing, filename)
+            # A link keeps the original's mtime; date it to now like a fresh write
+            os.utime(filename)
+        except OSError:
+            shutil.copyfile(existing, filename)
+
+    def _prune(self):
+        """Delete the oldest screenshots this service wrote beyond SCREENSHOT_MAX_FILES"""
+        self._written = [path for path in self._written if os.path.exists(path)]
+        excess = len(self._written) - Config.SCREENSHOT_MAX_FILES
+        if excess <= 0:
+            return
+
+        for path in self._written[:excess]:
+            os.remove(path)
+        self._written = self._written[excess:]
+        self._hashes = {digest: path for digest, path in self._hashes.items() if os.path.exists(path)}
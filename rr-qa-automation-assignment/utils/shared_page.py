@@ -0,0 +1,171 @@
+"""
+One loaded page per worker, shared by the tests that use ``setup``
+
+Loading the SPA bundle is the most expensive part of most tests, so the
+page is loaded once per network profile and kept open. After every test the
+app state is compared with a fingerprint taken right after the load (URL,
+selected results page, search text, selected filter values and the titles
+in the grid). A test that changed it is rolled back in the app itself:
+``history`` navigation back to the start URL, clearing the search box and
+clicking page 1. Only if the fingerprint still differs is the page
+reloaded. Filter selections are not rolled back in the app, so tests that
+change filters always end with a reload.
+
+The browser is handed back to the pool and replaced after
+Config.POOL_MAX_USES checkouts, like any pooled browser.
+
+Tests marked ``@pytest.mark.readonly`` promise not to change the page; one
+that does is failed, so undeclared mutations are caught.
+"""
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from config.config import Config
+from utils.logger import Logger
+from utils.network_profiles import apply_network_profile
+from utils.wait_engine import WaitEngine
+
+FINGERPRINT_JS = """
+const titleSel = arguments[0], searchSel = arguments[1];
+const selected = document.querySelector('#react-paginate li.selected a');
+const search = document.querySelector(searchSel);
+return {
+    url: location.href,
+    page: selected ? selected.innerText.trim() : null,
+    search: search ? search.value : null,
+    filters: Array.from(document.querySelectorAll("[class*='singleValue'], [class*='multiValue']"))
+        .map(function (el) { return el.innerText.trim(); }),
+    titles: Array.from(document.querySelectorAll(titleSel))
+        .map(function (el) { return el.innerText.trim(); })
+};
+"""
+
+# In-app rollback: route back to the start URL and clear the (React-controlled) search box
+RESTORE_JS = """
+const target = arguments[0], searchSel = arguments[1], searchValue = arguments[2];
+if (location.href !== target) {
+    history.pushState(null, '', target);
+    window.dispatchEvent(new PopStateEvent('popstate', { state: null }));
+}
+const search = document.querySelector(searchSel);
+if (search && searchValue !== null && search.value !== searchValue) {
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    setter.call(search, searchValue);
+    search.dispatchEvent(new Event('input', { bubbles: true }));
+}
+window.scrollTo(0, 0);
+"""
+
+class SharedPage:
+    """A pooled browser kept on the loaded start page between tests"""
+
+    # Counters summed over every shared page in this process
+    totals = {"checkouts": 0, "in_app_restores": 0, "loads": 0, "mutations": 0}
+
+    def __init__(self, driver_pool, network_profile=None):
+        self.driver_pool = driver_pool
+        self.network_profile = network_profile
+        self.driver = None
+        self.baseline = None
+        self.uses = 0
+        self.logger = Logger.get_logger("driver")
+
+    def checkout(self):
+        """The shared driver, on the start page; loads it on first use"""
+        if self.driver is not None and self.uses >= Config.POOL_MAX_USES:
+            self.logger.info(f"Shared page reached {self.uses} checkouts, replacing its browser")
+            self.close(retire=True)
+        if self.driver is None:
+            self.driver = self.driver_pool.acquire()
+            apply_network_profile(self.driver, self.network_profile)
+            self._load()
+        self.uses += 1
+        SharedPage.totals["checkouts"] += 1
+        return self.driver
+
+    def checkin(self, test_name, readonly=False):
+        """Bring the page back to the start state; returns what the test changed"""
+        try:
+            changed = self.changes()
+        except WebDriverException as e:
+            self.logger.warning(f"Shared page unusable after {test_name}, replacing it: {e}")
+            self.close()
+            return []
+
+        if not changed:
+            return []
+
+        if readonly:
+            SharedPage.totals["mutations"] += 1
+            self.logger.warning(f"{test_name} is marked readonly but changed {changed}")
+        self.restore(changed)
+        return changed
+
+    def fingerprint(self):
+        from pages.discover_page import DiscoverPage
+
+        return self.driver.execute_script(FINGERPRINT_JS, DiscoverPage.MOVIE_TITLES[1], DiscoverPage.SEARCH_INPUT[1])
+
+    def changes(self):
+        """Names of the fingerprint fields that differ from the start state"""
+        current = self.fingerprint()
+        return sorted(key for key, value in self.baseline.items() if current.get(key) != value)
+
+    def restore(self, changed=None):
+        """Roll back in the app; reload only if that does not reach the start state"""
+        from pages.discover_page import DiscoverPage
+
+        if changed and "filters" in changed:
+            self._load()
+            return
+
+        try:
+            self.driver.execute_script(
+                RESTORE_JS, self.baseline["url"], DiscoverPage.SEARCH_INPUT[1], self.baseline["search"]
+            )
+            page = DiscoverPage(self.driver)
+            page.wait_for("settled")
+            if self.baseline["page"] and page.get_current_page_number() != int(self.baseline["page"]):
+                page.go_to_page(int(self.baseline["page"]))
+            if not self.changes():
+                SharedPage.totals["in_app_restores"] += 1
+                return
+        except (TimeoutException, WebDriverException, ValueError) as e:
+            self.logger.info(f"In-app restore failed: {e}")
+
+        self.logger.info("In-app restore did not reach the start state, reloading")
+        self._load()
+
+    def _load(self):
+        self.driver.get(Config.BASE_URL)
+        try:
+            WaitEngine(self.driver).until("page_ready")
+        except TimeoutException:
+            self.logger.warning("Movie grid did not render after loading the shared page")
+        SharedPage.totals["loads"] += 1
+        self.baseline = self.fingerprint()
+
+    def close(self, retire=False):
+        if self.driver is not None:
+            if retire:
+                self.driver_pool.retire(self.driver)
+            else:
+                self.driver_pool.release(self.driver)
+        self.driver = None
+        self.baseline = None
+        self.uses = 0
+
+class SharedPages:
+    """Shared pages of one worker, one per network profile"""
+
+    def __init__(self, driver_pool):
+        self.driver_pool = driver_pool
+        self._pages = {}
+
+    def get(self, network_profile=None):
+        if network_profile not in self._pages:
+            self._pages[network_profile] = SharedPage(self.driver_pool, network_profile)
+        return self._pages[network_profile]
+
+    def close(self):
+        for page in self._pages.values():
+            page.close()
+        self._pages = {}
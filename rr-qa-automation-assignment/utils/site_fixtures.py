@@ -0,0 +1,226 @@
+"""
+Record/replay stand-in for the TMDB Discover site
+
+Recording drives a real browser through the live site with performance
+logging enabled and stores every response from the site host and the TMDB
+API in an on-disk fixture store. Replay serves those responses from a local
+threaded HTTP server; a small script registered on every tab rewrites the
+SPA's TMDB API calls to the local server.
+
+    python -m utils.site_fixtures record     # capture fixtures from the live site
+    SITE_MODE=replay python run_tests.py     # run the suite against the fixtures
+"""
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl, urlencode
+from config.config import Config
+from utils.logger import Logger
+
+TMDB_API_HOST = "api.themoviedb.org"
+TMDB_PREFIX = "/__tmdb__"
+
+# Sends the SPA's TMDB API traffic to the replay server instead of the internet
+API_REWRITE_JS = """
+(function () {
+    const apiOrigin = 'https://%s';
+    const local = window.location.origin + '%s';
+    const rewrite = function (url) {
+        return (typeof url === 'string' && url.indexOf(apiOrigin) === 0) ? local + url.slice(apiOrigin.length) : url;
+    };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (input, init) {
+            if (input instanceof Request) { input = new Request(rewrite(input.url), input); }
+            return originalFetch.call(this, rewrite(input), init);
+        };
+    }
+    const originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        arguments[1] = rewrite(url);
+        return originalOpen.apply(this, arguments);
+    };
+})();
+""" % (TMDB_API_HOST, TMDB_PREFIX)
+
+def fixture_key(method, host, path, query):
+    """Canonical store key; the API key is dropped so fixtures never contain it"""
+    params = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k != "api_key")
+    scope = "tmdb" if host == TMDB_API_HOST else "site"
+    key = f"{method.upper()} {scope}{path or '/'}"
+    return f"{key}?{urlencode(params)}" if params else key
+
+class FixtureStore:
+    """Recorded responses on disk: an index.json plus one body file per response"""
+
+    def __init__(self, root=None):
+        self.root = root or Config.FIXTURE_DIR
+        self.index_path = os.path.join(self.root, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def get(self, key):
+        """Return (status, content_type, body) for a key, or None if not recorded"""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        with open(os.path.join(self.root, entry["body"]), "rb") as f:
+            return entry["status"], entry["content_type"], f.read()
+
+    def put(self, key, status, content_type, body):
+        os.makedirs(self.root, exist_ok=True)
+        body_name = hashlib.sha1(key.encode()).hexdigest()
+        with open(os.path.join(self.root, body_name), "wb") as f:
+            f.write(body)
+        self.index[key] = {"status": status, "content_type": content_type, "body": body_name}
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path, "w") as f:
+            json.dump(self.index, f, indent=4, sort_keys=True)
+
+    def __len__(self):
+        return len(self.index)
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    store = None
+    latency = 0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+        parsed = urlparse(self.path)
+        if parsed.path.startswith(TMDB_PREFIX):
+            key = fixture_key("GET", TMDB_API_HOST, parsed.path[len(TMDB_PREFIX):], parsed.query)
+        else:
+            key = fixture_key("GET", None, parsed.path, parsed.query)
+
+        recorded = self.store.get(key)
+        if recorded is None:
+            Logger.get_logger("replay").warning(f"No fixture recorded for {key}")
+            status, content_type, body = 404, "text/plain", b"Not recorded"
+        else:
+            status, content_type, body = recorded
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep request logging out of the test output
+
+class SiteReplayServer:
+    """Serves a FixtureStore on a local port from a background thread"""
+
+    def __init__(self, store=None, latency_profile=None):
+        profile = latency_profile or Config.REPLAY_LATENCY_PROFILE
+        handler = type("ReplayHandler", (_ReplayHandler,), {
+            "store": store or FixtureStore(),
+            "latency": Config.REPLAY_LATENCY_PROFILES[profile]
+        })
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread.start()
+        Logger.get_logger("replay").info(f"Replay server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def install_api_rewrite(driver):
+    """Register the TMDB API rewrite for every document loaded in the current tab"""
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {"source": API_REWRITE_JS})
+
+def drain_responses(driver, store, site_host):
+    """Store every site/TMDB response reported in the browser's performance log"""
+    recorded = 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message["method"] != "Network.responseReceived":
+            continue
+
+        response = message["params"]["response"]
+        url = urlparse(response["url"])
+        if url.hostname not in (site_host, TMDB_API_HOST):
+            continue
+
+        try:
+            result = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": message["params"]["requestId"]})
+        except Exception:
+            continue  # Redirects and preflights have no body
+
+        body = result["body"].encode() if not result["base64Encoded"] else base64.b64decode(result["body"])
+        content_type = response.get("mimeType") or "application/octet-stream"
+        store.put(fixture_key("GET", url.hostname, url.path, url.query), response["status"], content_type, body)
+        recorded += 1
+    return recorded
+
+def record_site(pages=3):
+    """Browse the live site and capture everything the suite touches"""
+    # Imported here so replay-only runs never need a browser stack
+    from pages.discover_page import DiscoverPage
+    from utils.driver_factory import create_driver
+    from utils.helper import generate_test_data, wait_for_page_load
+
+    store = FixtureStore()
+    site_host = urlparse(Config.BASE_URL).hostname
+    driver = create_driver(capabilities={"goog:loggingPrefs": {"performance": "ALL"}})
+
+    try:
+        driver.get(Config.BASE_URL)
+        discover_page = DiscoverPage(driver)
+        discover_page.wait_for("page_ready")
+        drain_responses(driver, store, site_host)
+
+        for _ in range(pages):
+            discover_page.click_next_page()
+            drain_responses(driver, store, site_host)
+
+        for navigate in (discover_page.navigate_to_popular, discover_page.navigate_to_trend,
+                         discover_page.navigate_to_new, discover_page.navigate_to_top_rated):
+            navigate()
+            discover_page.wait_for("settled")
+            drain_responses(driver, store, site_host)
+
+        for term in generate_test_data()["search_terms"]:
+            discover_page.search_movie(term)
+            discover_page.wait_for("settled", quiet_ms=500)
+            drain_responses(driver, store, site_host)
+
+        # Direct URL access is a documented issue; keep whatever the host returns
+        driver.get(f"{Config.BASE_URL}popular")
+        wait_for_page_load(driver)
+        drain_responses(driver, store, site_host)
+    finally:
+        driver.quit()
+
+    store.save()
+    print(f"✅ Recorded {len(store)} responses to {store.root}")
+    return store
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        record_site()
+    else:
+        print("Usage: python -m utils.site_fixtures record")
+        sys.exit(1)
@@ -0,0 +1,203 @@
+"""
+Visual baselines for named views
+
+Each view (home grid, a pagination page, a filtered state) is stored as a
+64-bit perceptual hash plus a small grayscale reference image and the
+position of its regions of interest (grid, pagination, search box). Text and
+images are hidden while capturing, so the capture shows layout (boxes,
+spacing, alignment) rather than movie content that changes from day to day.
+
+A new capture whose hash equals the stored one passes without a pixel
+diff. Otherwise regions that moved are reported, and pixels are diffed with
+numpy inside each region only; a region fails when too many of its pixels
+changed. A highlighted diff image is written next to the screenshots.
+
+UPDATE_VISUAL_BASELINES=1 rewrites the references instead of comparing. A
+view without a stored reference gets one, and its check reports that nothing
+was compared rather than a pass.
+"""
+import base64
+import io
+import json
+import os
+import numpy as np
+from PIL import Image
+from config.config import Config
+from utils.logger import Logger
+
+# Hide content, keep layout; transitions off so the capture is stable
+MASK_CONTENT_CSS = (
+    "* { color: transparent !important; text-shadow: none !important; caret-color: transparent !important;"
+    " transition: none !important; animation: none !important; }"
+    " img, video, svg, canvas { visibility: hidden !important; }"
+)
+
+# Region rects as fractions of the document: the union of every node matching the region's selector
+CAPTURE_JS = """
+const css = arguments[0], selectors = arguments[1];
+if (css && !document.getElementById('__qa_visual_mask')) {
+    const style = document.createElement('style');
+    style.id = '__qa_visual_mask';
+    style.textContent = css;
+    document.head.appendChild(style);
+}
+const width = Math.max(document.documentElement.scrollWidth, window.innerWidth);
+const height = Math.max(document.documentElement.scrollHeight, window.innerHeight);
+const regions = {};
+Object.keys(selectors).forEach(function (name) {
+    const nodes = Array.from(document.querySelectorAll(selectors[name]));
+    if (!nodes.length) { return; }
+    let left = Infinity, top = Infinity, right = -Infinity, bottom = -Infinity;
+    nodes.forEach(function (node) {
+        const rect = node.getBoundingClientRect();
+        left = Math.min(left, rect.left + window.scrollX);
+        top = Math.min(top, rect.top + window.scrollY);
+        right = Math.max(right, rect.right + window.scrollX);
+        bottom = Math.max(bottom, rect.bottom + window.scrollY);
+    });
+    regions[name] = [left / width, top / height, (right - left) / width, (bottom - top) / height];
+});
+return { regions: regions, width: width, height: height };
+"""
+
+UNMASK_JS = "const style = document.getElementById('__qa_visual_mask'); if (style) { style.remove(); }"
+
+def _dct_matrix(size):
+    k = np.arange(size)[:, None]
+    i = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+_DCT_32 = _dct_matrix(32)
+
+def perceptual_hash(image):
+    """64-bit DCT hash of an image, as 16 hex digits"""
+    pixels = np.asarray(image.convert("L").resize((32, 32), Image.BILINEAR), dtype=np.float64)
+    low = (_DCT_32 @ pixels @ _DCT_32.T)[:8, :8].flatten()
+    bits = low > np.median(low[1:])  # The DC term only reflects overall brightness
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+def hash_distance(first, second):
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
+
+def downscale(image):
+    """Grayscale reference at Config.VISUAL_REFERENCE_WIDTH, keeping the aspect ratio"""
+    width = Config.VISUAL_REFERENCE_WIDTH
+    height = max(1, round(image.height * width / image.width))
+    return image.convert("L").resize((width, height), Image.BILINEAR)
+
+def region_changes(reference, current, regions):
+    """Fraction of changed pixels inside each region, computed on the whole image at once"""
+    reference_pixels = np.asarray(reference, dtype=np.int16)
+    current_pixels = np.asarray(current.resize(reference.size, Image.BILINEAR), dtype=np.int16)
+    changed = np.abs(reference_pixels - current_pixels) > Config.VISUAL_PIXEL_TOLERANCE
+
+    height, width = changed.shape
+    fractions = {}
+    for name, (x, y, w, h) in regions.items():
+        left, top = int(x * width), int(y * height)
+        right, bottom = max(left + 1, int(round((x + w) * width))), max(top + 1, int(round((y + h) * height)))
+        patch = changed[top:bottom, left:right]
+        fractions[name] = float(patch.mean()) if patch.size else 0.0
+    return fractions, changed
+
+def moved_regions(reference_regions, current_regions):
+    """Regions that disappeared or whose box shifted by more than Config.VISUAL_REGION_SHIFT"""
+    moved = []
+    for name, box in reference_regions.items():
+        current = current_regions.get(name)
+        if current is None or max(abs(a - b) for a, b in zip(box, current)) > Config.VISUAL_REGION_SHIFT:
+            moved.append(name)
+    return moved
+
+class VisualBaseline:
+    """Stored references per view, compared against new captures"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or Config.VISUAL_BASELINE_DIR
+        self.logger = Logger.get_logger("screenshots")
+
+    def capture(self, driver, regions=None):
+        """(full-page image, region fractions) with content masked"""
+        selectors = regions or Config.VISUAL_REGIONS
+        css = MASK_CONTENT_CSS if Config.VISUAL_MASK_CONTENT else None
+        try:
+            layout = driver.execute_script(CAPTURE_JS, css, selectors)
+            try:
+                data = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                    "format": "png",
+                    "captureBeyondViewport": True,
+                    "clip": {"x": 0, "y": 0, "width": layout["width"], "height": layout["height"], "scale": 1}
+                })["data"]
+            except AttributeError:
+                # Non-Chromium drivers only offer the viewport; regions then refer to it
+                data = driver.get_screenshot_as_base64()
+        finally:
+            driver.execute_script(UNMASK_JS)
+        return Image.open(io.BytesIO(base64.b64decode(data))), layout["regions"]
+
+    def check(self, driver, name, regions=None):
+        image, boxes = self.capture(driver, regions)
+        return self.compare(name, image, boxes)
+
+    def compare(self, name, image, regions):
+        """Compare a capture with the stored view; creates the baseline when there is none
+
+        ``passed`` is None when a baseline was created instead of compared.
+        """
+        current = downscale(image)
+        current_hash = perceptual_hash(current)
+        stored = self._load(name)
+
+        if stored is None or Config.UPDATE_VISUAL_BASELINES:
+            # Nothing was compared, so this is neither a pass nor a failure
+            self.save(name, current, current_hash, regions)
+            return {"name": name, "status": "baseline_created", "passed": None}
+
+        reference, meta = stored
+        distance = hash_distance(current_hash, meta["hash"])
+        if distance <= Config.VISUAL_HASH_DISTANCE and current.size == reference.size:
+            return {"name": name, "status": "hash_match", "passed": True, "hash_distance": distance}
+
+        moved = moved_regions(meta["regions"], regions)
+        fractions, changed = region_changes(reference, current, meta["regions"])
+        failed = sorted(set(moved) | {region for region, fraction in fractions.items()
+                                      if fraction > Config.VISUAL_REGION_THRESHOLD})
+        result = {
+            "name": name,
+            "status": "changed" if failed else "match",
+            "passed": not failed,
+            "hash_distance": distance,
+            "size": [list(reference.size), list(current.size)],
+            "regions": fractions,
+            "moved": moved,
+            "failed_regions": failed
+        }
+        if failed:
+            result["diff_image"] = self._save_diff(name, reference, changed)
+            self.logger.warning(f"Visual change in {name}: {failed}")
+        return result
+
+    def save(self, name, reference, image_hash, regions):
+        os.makedirs(self.directory, exist_ok=True)
+        reference.save(os.path.join(self.directory, f"{name}.png"), optimize=True)
+        with open(os.path.join(self.directory, f"{name}.json"), "w") as f:
+            json.dump({"hash": image_hash, "size": list(reference.size), "regions": regions}, f, indent=4)
+        self.logger.info(f"Visual baseline saved: {name}")
+
+    def _load(self, name):
+        try:
+            with open(os.path.join(self.directory, f"{name}.json")) as f:
+                meta = json.load(f)
+            return Image.open(os.path.join(self.directory, f"{name}.png")).convert("L"), meta
+        except (OSError, ValueError):
+            return None
+
+    def _save_diff(self, name, reference, changed):
+        highlighted = np.stack([np.asarray(reference)] * 3, axis=-1)
+        highlighted[changed] = [255, 0, 0]
+        filename = os.path.join(Config.SCREENSHOT_DIR, f"visual_diff_{name}_{Config.get_timestamp()}.png")
+        os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
+        Image.fromarray(highlighted).save(filename)
+        return filename
@@ -0,0 +1,237 @@
+"""
+Event-driven waits for named page readiness conditions
+
+Instead of sleeping for a fixed time, each wait runs a single async script
+in the browser. A MutationObserver (plus a small fetch/XHR tracker for
+network activity) re-evaluates the condition whenever the page changes and
+resolves the promise as soon as it holds and the DOM has been quiet for a
+short settle window.
+"""
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from config.config import Config
+from utils.logger import Logger
+
+_UNSET = object()
+
+# Installed on every new document so in-flight requests can be counted
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__qaPending !== undefined) { return; }
+    window.__qaPending = 0;
+    const notify = function (delta) {
+        window.__qaPending = Math.max(0, window.__qaPending + delta);
+        window.dispatchEvent(new Event('qa:network'));
+    };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function () {
+            notify(1);
+            return originalFetch.apply(this, arguments).finally(function () { notify(-1); });
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        notify(1);
+        this.addEventListener('loadend', function () { notify(-1); }, { once: true });
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+SNAPSHOT_JS = """
+const selectors = arguments[0];
+const cards = Array.from(document.querySelectorAll(selectors.cards));
+const selected = document.querySelector(selectors.selected_page);
+return {
+    grid_rerendered: cards.length + '|' + cards.map(function (c) { return c.textContent; }).join('|'),
+    page_changed: selected ? selected.textContent.trim() : null
+};
+"""
+
+WAIT_JS = NETWORK_TRACKER_JS + """
+const condition = arguments[0], selectors = arguments[1], before = arguments[2];
+const quietMs = arguments[3], timeoutMs = arguments[4], done = arguments[arguments.length - 1];
+const watched = Array.isArray(arguments[5]) ? arguments[5] : [];
+
+const cardCount = function () { return document.querySelectorAll(selectors.cards).length; };
+const signature = function () {
+    const cards = Array.from(document.querySelectorAll(selectors.cards));
+    return cards.length + '|' + cards.map(function (c) { return c.textContent; }).join('|');
+};
+const selectedPage = function () {
+    const selected = document.querySelector(selectors.selected_page);
+    return selected ? selected.textContent.trim() : null;
+};
+const networkIdle = function () { return (window.__qaPending || 0) === 0; };
+
+const checks = {
+    document_ready: function () { return document.readyState === 'complete'; },
+    page_ready: function () { return document.readyState === 'complete' && cardCount() > 0; },
+    grid_rerendered: function () { return cardCount() > 0 && signature() !== before; },
+    page_changed: function () { return selectedPage() !== null && selectedPage() !== before; },
+    network_idle: networkIdle,
+    settled: function () { return document.readyState === 'complete' && networkIdle(); }
+};
+const check = checks[condition];
+if (!check) { done({ met: false, error: 'Unknown wait condition: ' + condition }); return; }
+
+// Which cached element handles are still attached and still match their selector
+const liveHandles = function () {
+    return watched.map(function (entry) {
+        const el = entry[0], css = entry[1];
+        return Boolean(el && el.isConnected && (!css || el.matches(css)));
+    });
+};
+
+let quietTimer = null, finished = false;
+const observer = new MutationObserver(function () { evaluate(); });
+const finish = function (met) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(limitTimer);
+    window.removeEventListener('qa:network', evaluate);
+    window.removeEventListener('load', evaluate);
+    done({ met: met, live: liveHandles() });
+};
+const evaluate = function () {
+    clearTimeout(quietTimer);
+    if (check()) {
+        quietTimer = setTimeout(function () { if (check()) { finish(true); } }, quietMs);
+    }
+};
+const limitTimer = setTimeout(function () { finish(check()); }, timeoutMs);
+
+observer.observe(document, { childList: true, subtree: true, characterData: true, attributes: true });
+window.addEventListener('qa:network', evaluate);
+window.addEventListener('load', evaluate);
+evaluate();
+"""
+
+def install_network_tracker(driver):
+    """Register the fetch/XHR tracker for every document loaded in the current tab"""
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {"source": NETWORK_TRACKER_JS})
+    except Exception:
+        # Non-Chromium drivers: every wait script injects it into the current document
+        pass
+
+class WaitEngine:
+    """Named readiness conditions resolved by in-page events"""
+
+    CONDITIONS = ("document_ready", "page_ready", "grid_rerendered", "page_changed", "network_idle", "settled")
+
+    SELECTORS = {
+        "cards": "p.text-blue-500.font-bold.py-1",
+        "selected_page": "#react-paginate li.selected a"
+    }
+
+    # Per-condition totals of every wait in this process (see stats)
+    _summary = {}
+
+    # Script timeout last set per WebDriver session. It is a session-wide setting, and several
+    # engines (and the context drivers of utils.browser_contexts) share one session
+    _script_timeouts = {}
+
+    def __init__(self, driver, timeout=None, element_cache=None):
+        self.driver = driver
+        self.timeout = timeout or Config.EXPLICIT_WAIT
+        self.element_cache = element_cache
+        self.logger = Logger.get_logger("waits")
+
+    def snapshot(self):
+        """Capture the state that change-based conditions compare against"""
+        return self.driver.execute_script(SNAPSHOT_JS, self.SELECTORS)
+
+    def until(self, condition, timeout=None, quiet_ms=None, before=_UNSET):
+        """Block until ``condition`` holds and the DOM is quiet; return seconds waited"""
+        if condition not in self.CONDITIONS:
+            raise ValueError(f"Unknown wait condition: {condition}")
+
+        timeout = timeout or self.timeout
+        quiet_ms = Config.WAIT_QUIET_MS if quiet_ms is None else quiet_ms
+        if condition in ("grid_rerendered", "page_changed") and before is _UNSET:
+            before = self.snapshot()[condition]
+
+        if before is _UNSET:
+            before = None
+        self._set_script_timeout(timeout + 5)
+
+        start = time.perf_counter()
+        result = self._run_wait(condition, before, quiet_ms, timeout)
+        elapsed = time.perf_counter() - start
+        met = bool(result and result.get("met"))
+        WaitEngine.record(condition, elapsed, met)
+
+        if not met:
+            error = (result or {}).get("error") or f"Condition '{condition}' not met within {timeout}s"
+            self.logger.warning(error)
+            raise TimeoutException(error)
+
+        self.logger.debug(f"Wait '{condition}' satisfied in {elapsed:.3f}s")
+        return elapsed
+
+    def _run_wait(self, condition, before, quiet_ms, timeout):
+        # Drivers sharing one browser session (utils.browser_contexts) wait in slices
+        # so the other contexts can run commands in between
+        wait_slice = getattr(self.driver, "wait_slice", None)
+        if not wait_slice:
+            return self._wait_once(condition, before, quiet_ms, timeout)
+
+        deadline = time.perf_counter() + timeout
+        step = max(wait_slice, quiet_ms / 1000 * 2)
+        while True:
+            remaining = deadline - time.perf_counter()
+            result = self._wait_once(condition, before, quiet_ms, max(0.0, min(step, remaining)))
+            if (result or {}).get("met") or (result or {}).get("error") or remaining <= step:
+                return result
+
+    def _wait_once(self, condition, before, quiet_ms, timeout):
+        cache = self.element_cache
+        locators, watched = cache.watched() if cache else ([], [])
+        try:
+            result = self.driver.execute_async_script(
+                WAIT_JS, condition, self.SELECTORS, before, quiet_ms, int(timeout * 1000), watched
+            )
+        except StaleElementReferenceException:
+            if not watched:
+                raise
+            # A cached handle is from a previous document: the page navigated
+            cache.invalidate()
+            return self._wait_once(condition, before, quiet_ms, timeout)
+
+        if cache and result:
+            cache.retain(locators, result.get("live") or [])
+        return result
+
+    @contextmanager
+    def expect(self, condition, timeout=None, quiet_ms=None):
+        """Snapshot before the wrapped action, then wait for ``condition`` after it"""
+        before = self.snapshot().get(condition)
+        yield
+        self.until(condition, timeout=timeout, quiet_ms=quiet_ms, before=before)
+
+    @classmethod
+    def record(cls, condition, elapsed, met):
+        """Add one wait to the per-condition totals"""
+        entry = cls._summary.setdefault(condition, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "timeouts": 0})
+        entry["count"] += 1
+        entry["total_seconds"] += elapsed
+        entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+        if not met:
+            entry["timeouts"] += 1
+
+    @classmethod
+    def stats(cls):
+        """Totals of the recorded waits per condition"""
+        return {condition: dict(entry) for condition, entry in cls._summary.items()}
+
+    def _set_script_timeout(self, seconds):
+        # Avoid an extra round trip when the session already has this timeout
+        session = self.driver.session_id
+        if WaitEngine._script_timeouts.get(session) != seconds:
+            self.driver.set_script_timeout(seconds)
+            WaitEngine._script_timeouts[session] = seconds